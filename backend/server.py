@@ -1,34 +1,53 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, WebSocket, WebSocketDisconnect, Query
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, WebSocket, WebSocketDisconnect, Query, Response
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from starlette.websockets import WebSocketState
 from motor.motor_asyncio import AsyncIOMotorClient
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+import orjson
 import os
+import time
+import asyncio
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, TypeAdapter, field_validator
 from typing import List, Optional, Union
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timezone, timedelta
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 import re
-import pandas as pd
-import io
+import base64
+import binascii
+import hashlib
+import hmac
 import pyotp
-import secrets
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=int(os.environ.get("MONGO_MAX_POOL_SIZE", "50")),
+    minPoolSize=int(os.environ.get("MONGO_MIN_POOL_SIZE", "10")),
+    serverSelectionTimeoutMS=int(os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", "2000")),
+    waitQueueTimeoutMS=int(os.environ.get("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000")),
+    # Return stored dates as aware UTC datetimes so every response carries an explicit offset
+    tz_aware=True,
+)
 db = client[os.environ['DB_NAME']]
 
 # Security
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 security = HTTPBearer()
 SECRET_KEY = os.environ.get("SECRET_KEY")
 if not SECRET_KEY:
@@ -43,17 +62,46 @@ SMTP_USER = os.environ.get("SMTP_USER", "")
 SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD", "")
 FROM_EMAIL = os.environ.get("FROM_EMAIL", SMTP_USER)
 
-async def send_email(to_email: str, subject: str, body: str):
-    """Send an email using SMTP"""
+# A single SMTP session is reused across sends instead of reconnecting every time
+_smtp_client = None
+_smtp_lock = asyncio.Lock()
+
+
+async def _get_smtp_client():
+    """Return a connected and authenticated SMTP client, reconnecting if the session dropped"""
+    global _smtp_client
+    import aiosmtplib
+    
+    if _smtp_client is not None and _smtp_client.is_connected:
+        try:
+            await _smtp_client.noop()
+            return _smtp_client
+        except aiosmtplib.SMTPException:
+            _smtp_client.close()
+    
+    _smtp_client = aiosmtplib.SMTP(hostname=SMTP_HOST, port=SMTP_PORT, start_tls=True)
+    await _smtp_client.connect()
+    await _smtp_client.login(SMTP_USER, SMTP_PASSWORD)
+    return _smtp_client
+
+
+async def close_smtp_client():
+    """Close the shared SMTP session (called on shutdown)"""
+    global _smtp_client
+    if _smtp_client is not None and _smtp_client.is_connected:
+        try:
+            await _smtp_client.quit()
+        except Exception:
+            _smtp_client.close()
+    _smtp_client = None
+
+
+async def _send_email_now(to_email: str, subject: str, body: str):
+    """Send an email over the shared SMTP session"""
     import aiosmtplib
     from email.mime.text import MIMEText
     from email.mime.multipart import MIMEMultipart
     
-    # Check if SMTP is configured
-    if not SMTP_USER or not SMTP_PASSWORD or not FROM_EMAIL:
-        logger.warning("SMTP not configured, skipping email send")
-        return
-    
     msg = MIMEMultipart()
     msg["From"] = FROM_EMAIL
     msg["To"] = to_email
@@ -61,21 +109,131 @@ async def send_email(to_email: str, subject: str, body: str):
     msg.attach(MIMEText(body, "plain"))
     
     try:
-        await aiosmtplib.send(
-            message=msg,
-            hostname=SMTP_HOST,
-            port=SMTP_PORT,
-            username=SMTP_USER,
-            password=SMTP_PASSWORD,
-            start_tls=True
-        )
+        async with _smtp_lock:
+            smtp = await _get_smtp_client()
+            try:
+                await smtp.send_message(msg)
+            except aiosmtplib.SMTPServerDisconnected:
+                # Server dropped us between the health check and the send, retry once
+                smtp = await _get_smtp_client()
+                await smtp.send_message(msg)
     except Exception as e:
         logger.error(f"Failed to send email: {e}")
         # Don't raise - just log the error
         pass
 
+
+# Seconds a queue worker gets at shutdown to finish what is already queued before it is cancelled
+WORKER_DRAIN_TIMEOUT = float(os.environ.get("WORKER_DRAIN_TIMEOUT", "10"))
+
+# Outgoing emails are queued and sent by a single worker so handlers never wait on SMTP
+email_queue = asyncio.Queue()
+_email_worker_task = None
+
+
+async def _email_worker():
+    """Drain the email queue, reusing the SMTP session across messages"""
+    while True:
+        to_email, subject, body = await email_queue.get()
+        try:
+            await _send_email_now(to_email, subject, body)
+        finally:
+            email_queue.task_done()
+
+
+def start_email_worker():
+    global _email_worker_task
+    if _email_worker_task is None or _email_worker_task.done():
+        _email_worker_task = asyncio.create_task(_email_worker())
+
+
+async def stop_email_worker():
+    """Send the emails already queued (up to WORKER_DRAIN_TIMEOUT), then stop the worker"""
+    global _email_worker_task
+    if _email_worker_task is not None:
+        try:
+            await asyncio.wait_for(email_queue.join(), timeout=WORKER_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Stopping email worker with %d emails still queued", email_queue.qsize())
+        _email_worker_task.cancel()
+        try:
+            await _email_worker_task
+        except asyncio.CancelledError:
+            pass
+        _email_worker_task = None
+
+
+async def send_email(to_email: str, subject: str, body: str):
+    """Queue an email for sending"""
+    # Check if SMTP is configured
+    if not SMTP_USER or not SMTP_PASSWORD or not FROM_EMAIL:
+        logger.warning("SMTP not configured, skipping email send")
+        return
+    
+    await email_queue.put((to_email, subject, body))
+
+# Keep strong references to background tasks so they aren't garbage collected mid-flight
+_bg_tasks = set()
+
+
+def _log_bg_task_error(task):
+    if not task.cancelled() and task.exception():
+        logger.error("Background task failed: %s", task.exception())
+
+
+def fire_and_forget(coro):
+    """Run a coroutine in the background without blocking the response (notifications, etc.)"""
+    task = asyncio.create_task(coro)
+    _bg_tasks.add(task)
+    task.add_done_callback(_bg_tasks.discard)
+    task.add_done_callback(_log_bg_task_error)
+    return task
+
+# Notification fan-out is queued and processed by a background worker so requests only pay for the enqueue
+notification_queue = asyncio.Queue()
+_notification_worker_task = None
+
+
+async def _notification_worker():
+    """Run queued notification jobs one after another"""
+    while True:
+        func, args, kwargs = await notification_queue.get()
+        try:
+            await func(*args, **kwargs)
+        except Exception as e:
+            logger.error("Notification job %s failed: %s", func.__name__, e)
+        finally:
+            notification_queue.task_done()
+
+
+def queue_notification(func, *args, **kwargs):
+    """Queue a notification coroutine function to be run by the notification worker"""
+    notification_queue.put_nowait((func, args, kwargs))
+
+
+def start_notification_worker():
+    global _notification_worker_task
+    if _notification_worker_task is None or _notification_worker_task.done():
+        _notification_worker_task = asyncio.create_task(_notification_worker())
+
+
+async def stop_notification_worker():
+    """Run the jobs already queued (up to WORKER_DRAIN_TIMEOUT), then stop the worker"""
+    global _notification_worker_task
+    if _notification_worker_task is not None:
+        try:
+            await asyncio.wait_for(notification_queue.join(), timeout=WORKER_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Stopping notification worker with %d jobs still queued", notification_queue.qsize())
+        _notification_worker_task.cancel()
+        try:
+            await _notification_worker_task
+        except asyncio.CancelledError:
+            pass
+        _notification_worker_task = None
+
 # Create the main app
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # ==================== MODELS ====================
@@ -112,7 +270,7 @@ class User(BaseModel):
 
 class ChatMessage(BaseModel):
     """Chat message model for real-time messaging"""
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", frozen=True)
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     conversation_id: str  # ID of the conversation
     sender_id: str  # ID of the sender
@@ -128,7 +286,7 @@ class ChatMessage(BaseModel):
 
 class Conversation(BaseModel):
     """Conversation model representing a chat between two users"""
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", frozen=True)
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     participant_ids: List[str]  # List of user IDs in this conversation
     last_message: Optional[str] = None  # Preview of last message
@@ -227,7 +385,7 @@ class DepartmentUpdate(BaseModel):
 
 class NOCSchedule(BaseModel):
     """Model for NOC schedule entries"""
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", frozen=True)
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     noc_user_id: str  # Reference to the NOC user
     noc_user_name: str  # Cached name for display
@@ -262,7 +420,7 @@ class NOCScheduleBulkCreate(BaseModel):
 
 class NOCMonthlyNote(BaseModel):
     """Model for monthly notes"""
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", frozen=True)
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     year: int
     month: int
@@ -314,6 +472,13 @@ class UserResponse(BaseModel):
     two_factor_method: Optional[str] = None  # "totp" or "email"
     can_view_my_enterprises: Optional[bool] = True  # AM specific permission
 
+def user_response_from_db(doc: dict) -> UserResponse:
+    """Build a UserResponse from a trusted users document without re-validating it"""
+    return UserResponse.model_construct(**doc)
+
+# Projection that reads only the UserResponse fields from users documents
+USER_RESPONSE_PROJECTION = {"_id": 0, **{name: 1 for name in UserResponse.model_fields}}
+
 class UserUpdate(BaseModel):
     """Model for updating user - only allows updating certain fields"""
     username: Optional[str] = None  # Admin can change username
@@ -349,8 +514,8 @@ class TwoFactorResponse(BaseModel):
     message: str
 
 class TicketModificationNotification(BaseModel):
-    """Model for ticket modification notifications"""
-    model_config = ConfigDict(extra="ignore")
+    """Stored shape of ticket modification notifications (inserted as plain dicts)"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     ticket_id: str
     ticket_number: str
@@ -415,26 +580,76 @@ async def create_ticket_modification_notification(
     modified_by_username: str
 ):
     """Create a notification when a ticket is modified by someone other than the assignee"""
-    notification = TicketModificationNotification(
-        ticket_id=ticket_id,
-        ticket_number=ticket_number,
-        ticket_type=ticket_type,
-        assigned_to=assigned_to,
-        modified_by=modified_by,
-        modified_by_username=modified_by_username,
-        message=f"Ticket {ticket_number} was modified by {modified_by_username}"
-    )
-    doc = notification.model_dump()
+    doc = {
+        "id": str(uuid.uuid4()),
+        "ticket_id": ticket_id,
+        "ticket_number": ticket_number,
+        "ticket_type": ticket_type,
+        "assigned_to": assigned_to,
+        "modified_by": modified_by,
+        "modified_by_username": modified_by_username,
+        "message": f"Ticket {ticket_number} was modified by {modified_by_username}",
+        "created_at": datetime.now(timezone.utc),
+        "read": False,
+    }
     # Add event_type for filtering
     doc['event_type'] = 'ticket_modification'
     # Add notification title for proper display
     doc['notification_title'] = 'Ticket Modified'
     # Add additional fields from ticket if available
     # We'll need to fetch the ticket to get these fields
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.ticket_notifications.insert_one(doc)
 
 
+def prune_expired(cache: dict, now: float):
+    """Drop the entries of an {key: (expires, value)} cache that have expired, so it can't grow without bound"""
+    for key in [k for k, (expires, _) in cache.items() if expires <= now]:
+        del cache[key]
+
+
+USER_BRIEF_CACHE_TTL = 60  # seconds
+_user_brief_cache = {}
+
+
+async def get_user_brief(user_id):
+    """Return a user's id, username and name, cached for USER_BRIEF_CACHE_TTL seconds"""
+    now = time.monotonic()
+    cached = _user_brief_cache.get(user_id)
+    if cached and cached[0] > now:
+        return cached[1]
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, "id": 1, "username": 1, "name": 1})
+    prune_expired(_user_brief_cache, now)
+    _user_brief_cache[user_id] = (now + USER_BRIEF_CACHE_TTL, user)
+    return user
+
+
+def invalidate_user_brief(user_id):
+    """Drop a cached user so renamed or deleted users are picked up immediately"""
+    _user_brief_cache.pop(user_id, None)
+
+
+# AM notification preference and message template for each ticket event
+TICKET_EVENT_PREFERENCES = {
+    "created": "notify_on_ticket_created",
+    "assigned": "notify_on_ticket_assigned",
+    "awaiting_vendor": "notify_on_ticket_awaiting_vendor",
+    "awaiting_client": "notify_on_ticket_awaiting_client",
+    "awaiting_am": "notify_on_ticket_awaiting_am",
+    "resolved": "notify_on_ticket_resolved",
+    "unresolved": "notify_on_ticket_unresolved",
+}
+
+TICKET_EVENT_MESSAGES = {
+    "created": "New ticket {tn} for {cn} - Waiting for NOC assignment",
+    "assigned": "Ticket {tn} for {cn} has been assigned to {noc}",
+    "awaiting_vendor": "Ticket {tn} for {cn} is awaiting vendor response",
+    "awaiting_client": "Ticket {tn} for {cn} is awaiting client response",
+    "awaiting_am": "Ticket {tn} for {cn} requires your attention",
+    "resolved": "Ticket {tn} for {cn} has been resolved by {noc}",
+    "unresolved": "Ticket {tn} for {cn} has become unresolved",
+}
+
+
 async def notify_ams_about_ticket(ticket, event_type, ticket_type="sms", created_by=None):
     """Notify AMs about ticket events based on their notification preferences"""
     customer_id = ticket.get("customer_id")
@@ -452,8 +667,16 @@ async def notify_ams_about_ticket(ticket, event_type, ticket_type="sms", created
     if created_by and am_id == created_by:
         return
     
-    # Get AM's notification preferences and type
-    am_user = await db.users.find_one({"id": am_id}, {"_id": 0})
+    # Check if AM wants to be notified for this event type
+    preference_key = TICKET_EVENT_PREFERENCES.get(event_type)
+    if not preference_key:
+        return
+    
+    # Get AM's notification preference and type
+    am_user = await db.users.find_one(
+        {"id": am_id},
+        {"_id": 0, "id": 1, "am_type": 1, "department_id": 1, preference_key: 1}
+    )
     if not am_user:
         return
     
@@ -462,7 +685,7 @@ async def notify_ams_about_ticket(ticket, event_type, ticket_type="sms", created
     am_type = am_user.get("am_type")
     dept_type = None
     if am_user.get("department_id"):
-        dept = await db.departments.find_one({"id": am_user["department_id"]}, {"_id": 0})
+        dept = await db.departments.find_one({"id": am_user["department_id"]}, {"_id": 0, "department_type": 1})
         if dept:
             dept_type = dept.get("department_type")
     
@@ -470,21 +693,6 @@ async def notify_ams_about_ticket(ticket, event_type, ticket_type="sms", created
         # AM type doesn't match ticket type, skip notification
         return
     
-    # Check if AM wants to be notified for this event type
-    preference_map = {
-        "created": "notify_on_ticket_created",
-        "assigned": "notify_on_ticket_assigned",
-        "awaiting_vendor": "notify_on_ticket_awaiting_vendor",
-        "awaiting_client": "notify_on_ticket_awaiting_client",
-        "awaiting_am": "notify_on_ticket_awaiting_am",
-        "resolved": "notify_on_ticket_resolved",
-        "unresolved": "notify_on_ticket_unresolved",
-    }
-    
-    preference_key = preference_map.get(event_type)
-    if not preference_key:
-        return
-    
     # Check if AM has this preference enabled (default to True if not set)
     if not am_user.get(preference_key, True):
         return
@@ -499,20 +707,10 @@ async def notify_ams_about_ticket(ticket, event_type, ticket_type="sms", created
     assigned_to = ticket.get("assigned_to")
     noc_name = ""
     if assigned_to and event_type != "created":
-        noc_user = await db.users.find_one({"id": assigned_to}, {"_id": 0, "username": 1, "name": 1})
+        noc_user = await get_user_brief(assigned_to)
         if noc_user:
             noc_name = noc_user.get("name") or noc_user.get("username") or "NOC"
     
-    message_map = {
-        "created": f"New ticket {ticket_number} for {customer_name} - Waiting for NOC assignment",
-        "assigned": f"Ticket {ticket_number} for {customer_name} has been assigned to {noc_name}",
-        "awaiting_vendor": f"Ticket {ticket_number} for {customer_name} is awaiting vendor response",
-        "awaiting_client": f"Ticket {ticket_number} for {customer_name} is awaiting client response",
-        "awaiting_am": f"Ticket {ticket_number} for {customer_name} requires your attention",
-        "resolved": f"Ticket {ticket_number} for {customer_name} has been resolved by {noc_name}",
-        "unresolved": f"Ticket {ticket_number} for {customer_name} has become unresolved",
-    }
-    
     doc = {
         "id": notification_id,
         "ticket_id": ticket.get("id"),
@@ -522,7 +720,7 @@ async def notify_ams_about_ticket(ticket, event_type, ticket_type="sms", created
         "assigned_noc": noc_name,
         "modified_by": None,
         "modified_by_username": None,
-        "message": message_map.get(event_type, f"Ticket {ticket_number} updated"),
+        "message": TICKET_EVENT_MESSAGES[event_type].format(tn=ticket_number, cn=customer_name, noc=noc_name),
         "event_type": event_type,
         "customer_trunk": ticket.get("customer_trunk", ""),
         "destination": ticket.get("destination", ""),
@@ -532,44 +730,78 @@ async def notify_ams_about_ticket(ticket, event_type, ticket_type="sms", created
         "read": False,
         "created_at": datetime.now(timezone.utc)
     }
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.ticket_notifications.insert_one(doc)
 
 
 # ==================== NOC NOTIFICATIONS ====================
 
+NOC_DEPT_CACHE_TTL = 300  # seconds
+_noc_dept_cache = {"id": None, "expires": 0.0}
+
+
+# The cache is per process: invalidate_department_caches only clears the worker that made the change, so other
+# workers may keep applying a department's old permissions for up to DEPT_CACHE_TTL seconds. That lag is accepted.
+DEPT_CACHE_TTL = 30  # seconds
+_dept_cache = {}
+
+
+async def get_department_cached(dept_id):
+    """Return a department document by id, cached for DEPT_CACHE_TTL seconds"""
+    now = time.monotonic()
+    cached = _dept_cache.get(dept_id)
+    if cached and cached[0] > now:
+        dept = cached[1]
+    else:
+        dept = await db.departments.find_one({"id": dept_id}, {"_id": 0})
+        prune_expired(_dept_cache, now)
+        _dept_cache[dept_id] = (now + DEPT_CACHE_TTL, dept)
+    # Hand out a copy so a caller changing the dict (e.g. current_user["department"]) can't alter the cached entry
+    return dict(dept) if dept else dept
+
+
+def invalidate_department_caches():
+    """Drop cached department lookups after departments are created, changed or removed"""
+    _noc_dept_cache["expires"] = 0.0
+    _dept_cache.clear()
+
+
+async def get_noc_dept_id():
+    """Return the NOC department id, cached for NOC_DEPT_CACHE_TTL seconds"""
+    now = time.monotonic()
+    if _noc_dept_cache["expires"] < now:
+        noc_dept = await db.departments.find_one({"name": "NOC"}, {"_id": 0, "id": 1})
+        _noc_dept_cache.update(id=(noc_dept or {}).get("id"), expires=now + NOC_DEPT_CACHE_TTL)
+    return _noc_dept_cache["id"]
+
 
 async def notify_noc_about_am_action(ticket, action_text, action_created_by, ticket_type="sms"):
     """Notify ALL NOC users when an AM adds an action to any ticket (AM Comment notification)"""
     # Get NOC department to find users with that department_id
-    noc_dept = await db.departments.find_one({"name": "NOC"}, {"_id": 0, "id": 1})
+    noc_dept_id = await get_noc_dept_id()
     
-    if not noc_dept:
-        return
-    
-    noc_dept_id = noc_dept.get("id")
-    # Get all NOC users using department_id
-    noc_users = await db.users.find(
-        {"department_id": noc_dept_id},
-        {"_id": 0, "id": 1, "username": 1, "name": 1, "notify_on_am_action": 1}
-    ).to_list(100)
-    
-    if not noc_users:
+    if not noc_dept_id:
         return
     
     # Get AM name
-    am_user = await db.users.find_one({"id": action_created_by}, {"_id": 0, "username": 1, "name": 1})
+    am_user = await get_user_brief(action_created_by)
     am_name = (am_user.get("name") or am_user.get("username") or "AM") if am_user else "AM"
     
     ticket_number = ticket.get("ticket_number", "")
     customer_name = ticket.get("customer", "")
     
+    # All NOC copies of this event share the same timestamp
+    now = datetime.now(timezone.utc)
+    
+    # Get all NOC users using department_id, streamed straight into notification docs
+    # Users who opted out of AM action notifications are filtered server-side
+    noc_users = db.users.find(
+        {"department_id": noc_dept_id, "notify_on_am_action": {"$ne": False}},
+        {"_id": 0, "id": 1}
+    ).limit(100).batch_size(100)
+    
     # Create notification for each NOC user
-    for noc_user in noc_users:
-        # Check if NOC wants to be notified for AM actions (default True)
-        if not noc_user.get("notify_on_am_action", True):
-            continue
-        
+    docs = []
+    async for noc_user in noc_users:
         noc_id = noc_user.get("id")
         if not noc_id:
             continue
@@ -594,10 +826,13 @@ async def notify_noc_about_am_action(ticket, action_text, action_created_by, tic
             "status": ticket.get("status", ""),
             "priority": ticket.get("priority", ""),
             "read": False,
-            "created_at": datetime.now(timezone.utc)
+            "created_at": now
         }
-        doc['created_at'] = doc['created_at'].isoformat()
-        await db.ticket_notifications.insert_one(doc)
+        docs.append(doc)
+    
+    # Write all NOC notifications in a single round-trip
+    if docs:
+        await db.ticket_notifications.insert_many(docs, ordered=False)
 
 
 async def notify_noc_about_noc_modification(ticket, modified_by_user, modified_by_username, changes, ticket_type="sms"):
@@ -605,7 +840,8 @@ async def notify_noc_about_noc_modification(ticket, modified_by_user, modified_b
     # Get the NOC assigned to this ticket (use assigned_to field)
     assigned_noc_id = ticket.get("assigned_to")
     
-    if not assigned_noc_id:
+    # Don't notify if the modifier is the same as the assigned NOC
+    if not assigned_noc_id or modified_by_user == assigned_noc_id:
         return
     
     # Get the assigned NOC user's notification preference
@@ -621,10 +857,6 @@ async def notify_noc_about_noc_modification(ticket, modified_by_user, modified_b
     if not assigned_noc.get("notify_on_noc_ticket_modification", True):
         return
     
-    # Don't notify if the modifier is the same as the assigned NOC
-    if modified_by_user == assigned_noc_id:
-        return
-    
     ticket_number = ticket.get("ticket_number", "")
     customer_name = ticket.get("customer", "")
     
@@ -659,15 +891,14 @@ async def notify_noc_about_noc_modification(ticket, modified_by_user, modified_b
         "read": False,
         "created_at": datetime.now(timezone.utc)
     }
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.ticket_notifications.insert_one(doc)
 
 
 # ==================== ALERT NOTIFICATIONS ====================
 
 class AlertNotification(BaseModel):
-    """Model for alert notifications"""
-    model_config = ConfigDict(extra="ignore")
+    """Stored shape of alert notifications (inserted as plain dicts)"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
     
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     alert_id: str
@@ -689,7 +920,7 @@ class AlertNotification(BaseModel):
     read: bool = False
 
 
-async def create_alert_notification(
+def build_alert_notification_doc(
     alert_id: str,
     alert_ticket_number: str,
     customer: str,
@@ -704,27 +935,32 @@ async def create_alert_notification(
     issue_type: Optional[str] = None,
     status: Optional[str] = None,
     priority: Optional[str] = None
-):
+) -> dict:
+    """Build an alert notification document without inserting it"""
+    return {
+        "id": str(uuid.uuid4()),
+        "alert_id": alert_id,
+        "alert_ticket_number": alert_ticket_number,
+        "customer": customer,
+        "customer_id": customer_id,
+        "ticket_type": ticket_type,
+        "notification_type": notification_type,
+        "message": message,
+        "created_by": created_by,
+        "assigned_to": assigned_to,
+        "vendor_trunk": vendor_trunk,
+        "destination": destination,
+        "issue_type": issue_type,
+        "status": status,
+        "priority": priority,
+        "created_at": datetime.now(timezone.utc),
+        "read": False,
+    }
+
+
+async def create_alert_notification(**kwargs):
     """Create a notification for an alert event"""
-    notification = AlertNotification(
-        alert_id=alert_id,
-        alert_ticket_number=alert_ticket_number,
-        customer=customer,
-        customer_id=customer_id,
-        ticket_type=ticket_type,
-        notification_type=notification_type,
-        message=message,
-        created_by=created_by,
-        assigned_to=assigned_to,
-        vendor_trunk=vendor_trunk,
-        destination=destination,
-        issue_type=issue_type,
-        status=status,
-        priority=priority
-    )
-    doc = notification.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    await db.alert_notifications.insert_one(doc)
+    await db.alert_notifications.insert_one(build_alert_notification_doc(**kwargs))
 
 
 async def notify_users_about_alert(
@@ -734,9 +970,13 @@ async def notify_users_about_alert(
     customer_id: str,
     ticket_type: str,
     notification_type: str,
-    created_by: str
+    created_by: str,
+    creator_user: Optional[dict] = None
 ):
-    """Notify AMs and ALL NOC users about an alert event based on their preferences"""
+    """Notify AMs and ALL NOC users about an alert event based on their preferences.
+    
+    Callers that already resolved the acting user (current_user) should pass it as creator_user.
+    """
     # Get the alert to include more details
     alert = await db.alerts.find_one(
         {"id": alert_id}, 
@@ -753,7 +993,7 @@ async def notify_users_about_alert(
     # Get the assigned NOC user info
     noc_name = "NOC"
     if alert and alert.get("assigned_to"):
-        noc_user = await db.users.find_one({"id": alert["assigned_to"]}, {"_id": 0, "username": 1, "name": 1})
+        noc_user = await get_user_brief(alert["assigned_to"])
         if noc_user:
             noc_name = noc_user.get("name") or noc_user.get("username") or "NOC"
     
@@ -767,6 +1007,23 @@ async def notify_users_about_alert(
     
     message = messages.get(notification_type, f"Alert {alert_ticket_number} updated for {customer}")
     
+    # Fields shared by every notification for this event
+    common = dict(
+        alert_id=alert_id,
+        alert_ticket_number=alert_ticket_number,
+        customer=customer,
+        customer_id=customer_id,
+        ticket_type=ticket_type,
+        notification_type=notification_type,
+        created_by=created_by,
+        vendor_trunk=vendor_trunk,
+        destination=destination,
+        issue_type=issue_type,
+        status=status,
+        priority=priority
+    )
+    docs = []
+    
     # Get the client/enterprise to find assigned AM
     client = await db.clients.find_one({"id": customer_id}, {"_id": 0, "assigned_am_id": 1})
     
@@ -778,88 +1035,62 @@ async def notify_users_about_alert(
         if created_by and am_id == created_by:
             pass  # Skip AM notification but still notify NOC
         else:
-            # Get AM's notification preferences
-            am_user = await db.users.find_one({"id": am_id}, {"_id": 0})
+            # Get only the AM preference for this event type
+            preference_key = f"notify_on_alert_{notification_type}"
+            am_user = await db.users.find_one({"id": am_id}, {"_id": 0, "id": 1, preference_key: 1})
             if am_user:
                 # Check if AM wants to be notified for this event type
-                preference_key = f"notify_on_alert_{notification_type}"
                 if am_user.get(preference_key, True):
-                    await create_alert_notification(
-                        alert_id=alert_id,
-                        alert_ticket_number=alert_ticket_number,
-                        customer=customer,
-                        customer_id=customer_id,
-                        ticket_type=ticket_type,
-                        notification_type=notification_type,
-                        message=message,
-                        created_by=created_by,
-                        assigned_to=am_id,
-                        vendor_trunk=vendor_trunk,
-                        destination=destination,
-                        issue_type=issue_type,
-                        status=status,
-                        priority=priority
-                    )
+                    docs.append(build_alert_notification_doc(**common, message=message, assigned_to=am_id))
     
     # Notify ALL NOC users about the alert event (for commented, alt_vendor, created, and resolved types)
     if notification_type in ["commented", "alt_vendor", "created", "resolved"]:
         # Get NOC department to find users with that department_id
-        noc_dept = await db.departments.find_one({"name": "NOC"}, {"_id": 0, "id": 1})
+        noc_dept_id = await get_noc_dept_id()
+        if not noc_dept_id:
+            logger.warning("NOC department not found, cannot send notifications")
         
-        if not noc_dept:
-            print("NOC department not found, cannot send notifications")
-        else:
-            noc_dept_id = noc_dept.get("id")
-            # Get all NOC users using department_id
-            noc_users = await db.users.find(
-                {"department_id": noc_dept_id},
-                {"_id": 0, "id": 1, "username": 1, "name": 1}
-            ).to_list(100)
+        # Get all NOC users using department_id, excluding the creator of the event
+        noc_users = None
+        if noc_dept_id:
+            noc_query = {"department_id": noc_dept_id}
+            if created_by:
+                noc_query["id"] = {"$ne": created_by}
+            noc_users = db.users.find(noc_query, {"_id": 0, "id": 1}).limit(100).batch_size(100)
         
-        # Get creator info
-        creator_user = await db.users.find_one({"id": created_by}, {"_id": 0, "username": 1, "name": 1})
+        # Get creator info (only looked up when the caller didn't pass it)
+        if creator_user is None and created_by:
+            creator_user = await db.users.find_one(
+                {"id": created_by},
+                {"_id": 0, "id": 1, "username": 1, "name": 1, "department_id": 1}
+            )
         creator_name = (creator_user.get("name") or creator_user.get("username") or "User") if creator_user else "User"
         
         # Get user role to include in message
-        dept = await get_user_department(current_user if (current_user := await db.users.find_one({"id": created_by})) else {})
+        dept = await get_user_department(creator_user) if creator_user else None
         user_role = get_user_role_from_department(dept) if dept else ""
         creator_role = f" ({user_role})" if user_role else ""
         
-        # Create notification for each NOC user
-        for noc_user in noc_users:
-            noc_id = noc_user.get("id")
-            if not noc_id:
-                continue
-            
-            # Don't notify the NOC user who created the alert
-            if created_by and noc_id == created_by:
-                continue
-            
-            # Build NOC-specific message
-            noc_message = f"{creator_name}{creator_role} added comment to alert {alert_ticket_number} for {customer}"
-            if notification_type == "alt_vendor":
-                noc_message = f"{creator_name}{creator_role} submitted alternative vendor trunk for alert {alert_ticket_number} ({customer})"
-            elif notification_type == "created":
-                noc_message = f"New alert {alert_ticket_number} created for {customer}"
-            elif notification_type == "resolved":
-                noc_message = f"Alert {alert_ticket_number} for {customer} has been resolved"
-            
-            await create_alert_notification(
-                alert_id=alert_id,
-                alert_ticket_number=alert_ticket_number,
-                customer=customer,
-                customer_id=customer_id,
-                ticket_type=ticket_type,
-                notification_type=notification_type,
-                message=noc_message,
-                created_by=created_by,
-                assigned_to=noc_id,
-                vendor_trunk=vendor_trunk,
-                destination=destination,
-                issue_type=issue_type,
-                status=status,
-                priority=priority
-            )
+        # Build NOC-specific message
+        noc_message = f"{creator_name}{creator_role} added comment to alert {alert_ticket_number} for {customer}"
+        if notification_type == "alt_vendor":
+            noc_message = f"{creator_name}{creator_role} submitted alternative vendor trunk for alert {alert_ticket_number} ({customer})"
+        elif notification_type == "created":
+            noc_message = f"New alert {alert_ticket_number} created for {customer}"
+        elif notification_type == "resolved":
+            noc_message = f"Alert {alert_ticket_number} for {customer} has been resolved"
+        
+        # Create notification for each NOC user as the cursor streams in
+        if noc_users is not None:
+            docs.extend([
+                build_alert_notification_doc(**common, message=noc_message, assigned_to=noc_user["id"])
+                async for noc_user in noc_users
+                if noc_user.get("id")
+            ])
+    
+    # Write the AM and NOC notifications in a single round-trip
+    if docs:
+        await db.alert_notifications.insert_many(docs, ordered=False)
 
 
 class Token(BaseModel):
@@ -945,6 +1176,11 @@ class SMSTicket(BaseModel):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     actions: List[dict] = Field(default_factory=list)
 
+    @field_validator("opened_via", mode="before")
+    @classmethod
+    def _normalize_opened_via(cls, value):
+        return normalize_opened_via(value)
+
 
 class TicketAction(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -1041,6 +1277,11 @@ class VoiceTicket(BaseModel):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     actions: List[dict] = Field(default_factory=list)  # Array of action objects
 
+    @field_validator("opened_via", mode="before")
+    @classmethod
+    def _normalize_opened_via(cls, value):
+        return normalize_opened_via(value)
+
 class VoiceTicketCreate(BaseModel):
     priority: str
     volume: str
@@ -1100,11 +1341,42 @@ class DashboardStats(BaseModel):
 
 # ==================== AUTH HELPERS ====================
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+# bcrypt is CPU bound, run it on its own thread pool so it neither stalls the event loop
+# nor competes with the default executor used for other blocking work
+_bcrypt_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+
+async def verify_password(plain_password, hashed_password):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_pool, pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash(password):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_pool, pwd_context.hash, password)
+
+TOTP_INTERVAL = 30  # seconds, matching Google Authenticator
+TOTP_DIGITS = 6
+
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+def verify_totp(secret: str, code, window: int = 1) -> bool:
+    """Check a TOTP code against the current step and `window` steps either side, in constant time"""
+    # Accept what pyotp accepted (ints, surrounding spaces) but only ever compare ASCII digits
+    code = str(code).strip()
+    if len(code) != TOTP_DIGITS or not (code.isascii() and code.isdigit()):
+        return False
+    code = code.encode()
+    try:
+        key = base64.b32decode(secret.upper() + "=" * (-len(secret) % 8), casefold=True)
+    except (binascii.Error, ValueError):
+        return False
+    counter = int(time.time()) // TOTP_INTERVAL
+    valid = False
+    for step in range(counter - window, counter + window + 1):
+        digest = hmac.new(key, step.to_bytes(8, "big"), hashlib.sha1).digest()
+        offset = digest[-1] & 0x0F
+        value = (int.from_bytes(digest[offset:offset + 4], "big") & 0x7FFFFFFF) % 10 ** TOTP_DIGITS
+        # Keep checking every step so timing doesn't reveal which one matched
+        valid |= hmac.compare_digest(f"{value:0{TOTP_DIGITS}d}".encode(), code)
+    return valid
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -1113,6 +1385,12 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+# Online status uses a 5 minute window, so last_active doesn't need to be written on every request
+LAST_ACTIVE_WRITE_INTERVAL = 30  # seconds
+_last_active_written = {}
+# last_active value written on logout so the user immediately shows as offline
+LOGGED_OUT_LAST_ACTIVE = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
         token = credentials.credentials
@@ -1123,30 +1401,30 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
     
-    user = await db.users.find_one({"id": user_id}, {"_id": 0})
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, "password_hash": 0, "two_factor_secret": 0})
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
     
-    # Update last_active timestamp
-    await db.users.update_one(
-        {"id": user_id},
-        {"$set": {"last_active": datetime.now(timezone.utc)}}
-    )
+    # Update last_active timestamp in the background, at most once per LAST_ACTIVE_WRITE_INTERVAL
+    now = time.monotonic()
+    if now - _last_active_written.get(user_id, 0.0) >= LAST_ACTIVE_WRITE_INTERVAL:
+        # Drop stale entries so the throttle map can't grow without bound
+        for key in [k for k, written in _last_active_written.items() if now - written >= LAST_ACTIVE_WRITE_INTERVAL]:
+            del _last_active_written[key]
+        _last_active_written[user_id] = now
+        # Skip users marked logged out, so a late background write can't bring them back online
+        fire_and_forget(db.users.update_one(
+            {"id": user_id, "last_active": {"$gt": LOGGED_OUT_LAST_ACTIVE}},
+            {"$set": {"last_active": datetime.now(timezone.utc)}}
+        ))
     
     # Attach department info to user for easy access
     if user.get("department_id"):
-        dept = await db.departments.find_one({"id": user["department_id"]}, {"_id": 0})
+        dept = await get_department_cached(user["department_id"])
         if dept:
             user["department"] = dept
             # Calculate role from department permissions
-            if dept.get("can_edit_users"):
-                user["role"] = "admin"
-            elif dept.get("can_create_tickets") and not dept.get("can_edit_enterprises"):
-                user["role"] = "am"
-            elif dept.get("can_edit_tickets"):
-                user["role"] = "noc"
-            else:
-                user["role"] = "unknown"
+            user["role"] = get_user_role_from_department(dept)
     
     return user
 
@@ -1156,7 +1434,7 @@ async def get_user_department(current_user: dict) -> Optional[dict]:
         return current_user["department"]
     
     if current_user.get("department_id"):
-        return await db.departments.find_one({"id": current_user["department_id"]}, {"_id": 0})
+        return await get_department_cached(current_user["department_id"])
     
     return None
 
@@ -1185,18 +1463,22 @@ def get_user_ticket_type(dept: Optional[dict]) -> str:
         return "all"
     return dept.get("department_type", "all")
 
+def get_current_user_role(current_user: dict) -> str:
+    """Effective role of the authenticated user, derived once per request in get_current_user"""
+    if not current_user.get("department"):
+        return "unknown"
+    return current_user["role"]
+
 async def get_current_admin(current_user: dict = Depends(get_current_user)):
     """Check if user is admin based on department permissions"""
-    dept = await get_user_department(current_user)
-    role = get_user_role_from_department(dept)
+    role = get_current_user_role(current_user)
     if role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
 
 async def get_current_admin_or_noc(current_user: dict = Depends(get_current_user)):
     """Allow both admin and NOC users to perform ticket operations based on department"""
-    dept = await get_user_department(current_user)
-    role = get_user_role_from_department(dept)
+    role = get_current_user_role(current_user)
     if role not in ["admin", "noc"]:
         raise HTTPException(status_code=403, detail="Admin or NOC access required")
     return current_user
@@ -1209,13 +1491,15 @@ def validate_ticket_status(status: str, assigned_to: Optional[str]):
             detail="Status cannot be 'Assigned' unless a NOC member is assigned"
         )
 
+_OPENED_VIA_SPLIT = re.compile(r"\s*,\s*")
+
 def normalize_opened_via(opened_via):
     """Convert opened_via to list format for backward compatibility."""
     if opened_via is None:
         return []
     if isinstance(opened_via, str):
         # Convert old string format to list
-        return [v.strip() for v in opened_via.split(",") if v.strip()]
+        return [v for v in _OPENED_VIA_SPLIT.split(opened_via.strip()) if v]
     return opened_via
 
 # ==================== AUTH ROUTES ====================
@@ -1229,11 +1513,10 @@ async def register(user_data: UserCreate, current_admin: dict = Depends(get_curr
     
     user_dict = user_data.model_dump()
     password = user_dict.pop("password")
-    user_dict["password_hash"] = get_password_hash(password)
+    user_dict["password_hash"] = await get_password_hash(password)
     
     user_obj = User(**user_dict)
     doc = user_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     
     await db.users.insert_one(doc)
     
@@ -1262,7 +1545,7 @@ async def login(login_data: UserLogin):
     ]}
     
     user = await db.users.find_one(query, {"_id": 0})
-    if not user or not verify_password(login_data.password, user["password_hash"]):
+    if not user or not await verify_password(login_data.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Check if user is active
@@ -1283,45 +1566,37 @@ async def login(login_data: UserLogin):
             )
     
     # No 2FA - complete login normally
-    # Update last_active on login
-    await db.users.update_one(
-        {"id": user["id"]},
-        {"$set": {"last_active": datetime.now(timezone.utc)}}
-    )
-    
-    # Create a session record to track online time
+    now = datetime.now(timezone.utc)
     session_id = str(uuid.uuid4())
-    await db.user_sessions.insert_one({
-        "id": session_id,
-        "user_id": user["id"],
-        "username": user["username"],
-        "login_time": datetime.now(timezone.utc),
-        "logout_time": None,
-        "created_at": datetime.now(timezone.utc)
-    })
     
-    # Create audit log for login
-    await create_audit_log(
-        user_id=user["id"],
-        username=user.get("username", "unknown"),
-        action="login",
-        entity_type="session",
-        entity_id=session_id,
-        entity_name=f"User logged in"
-    )
-    
-    # Store session_id in user document for reference
-    await db.users.update_one(
-        {"id": user["id"]},
-        {"$set": {"current_session_id": session_id}}
+    # These writes are independent, so run them concurrently:
+    # update last_active and store session_id in user document for reference,
+    # create a session record to track online time, and audit the login
+    await asyncio.gather(
+        db.users.update_one(
+            {"id": user["id"]},
+            {"$set": {"last_active": now, "current_session_id": session_id}}
+        ),
+        db.user_sessions.insert_one({
+            "id": session_id,
+            "user_id": user["id"],
+            "username": user["username"],
+            "login_time": now,
+            "logout_time": None,
+            "created_at": now
+        }),
+        create_audit_log(
+            user_id=user["id"],
+            username=user.get("username", "unknown"),
+            action="login",
+            entity_type="session",
+            entity_id=session_id,
+            entity_name=f"User logged in"
+        )
     )
     
-    # Convert ISO string timestamp back to datetime
-    if isinstance(user['created_at'], str):
-        user['created_at'] = datetime.fromisoformat(user['created_at'])
-    
     access_token = create_access_token(data={"sub": user["id"]})
-    user_response = UserResponse(**user)
+    user_response = user_response_from_db(user)
     
     return Token(access_token=access_token, token_type="bearer", user=user_response)
 
@@ -1329,43 +1604,51 @@ async def login(login_data: UserLogin):
 async def logout(current_user: dict = Depends(get_current_user)):
     """Logout - marks user as offline by setting last_active to a very old timestamp and closes session"""
     # Set last_active to a time far in the past so user immediately shows as offline
-    await db.users.update_one(
-        {"id": current_user["id"]},
-        {"$set": {"last_active": datetime(1970, 1, 1, tzinfo=timezone.utc)}}
-    )
+    user_update = {"$set": {"last_active": LOGGED_OUT_LAST_ACTIVE}}
+    _last_active_written.pop(current_user["id"], None)
     
-    # Close the current session record
     current_session_id = current_user.get("current_session_id")
     if current_session_id:
-        await db.user_sessions.find_one_and_update(
-            {"id": current_session_id},
-            {"$set": {"logout_time": datetime.now(timezone.utc)}}
-        )
-        # Create audit log for logout
-        await create_audit_log(
-            user_id=current_user.get("id"),
-            username=current_user.get("username", "unknown"),
-            action="logout",
-            entity_type="session",
-            entity_id=current_session_id,
-            entity_name=f"User logged out"
-        )
-        # Clear the current_session_id from user document
-        await db.users.update_one(
-            {"id": current_user["id"]},
-            {"$unset": {"current_session_id": ""}}
+        # Clear the current_session_id from user document in the same write
+        user_update["$unset"] = {"current_session_id": ""}
+        # Close the current session record and create audit log for logout alongside the user update
+        await asyncio.gather(
+            db.users.update_one({"id": current_user["id"]}, user_update),
+            db.user_sessions.update_one(
+                {"id": current_session_id},
+                {"$set": {"logout_time": datetime.now(timezone.utc)}}
+            ),
+            create_audit_log(
+                user_id=current_user.get("id"),
+                username=current_user.get("username", "unknown"),
+                action="logout",
+                entity_type="session",
+                entity_id=current_session_id,
+                entity_name=f"User logged out"
+            )
         )
+    else:
+        await db.users.update_one({"id": current_user["id"]}, user_update)
     
-    # Broadcast to all connected clients about user logout
-    await manager.broadcast_to_all({
+    # Broadcast to all connected clients about user logout without holding the response
+    fire_and_forget(manager.broadcast_to_all({
         "type": "user_logout",
         "data": {"user_id": current_user.get("id"), "username": current_user.get("username")},
         "user_id": current_user.get("id"),
         "username": current_user.get("username")
-    })
+    }))
     
     return {"message": "Logged out successfully"}
 
+async def _find_user_by_identifier(identifier: str):
+    """Find a user by username or email for the password reset flow, with only the fields its steps check"""
+    # Read fresh on every step so a changed or disabled 2FA secret takes effect immediately
+    return await db.users.find_one(
+        {"$or": [{"username": identifier}, {"email": identifier}]},
+        {"_id": 0, "id": 1, "two_factor_enabled": 1, "two_factor_method": 1, "two_factor_secret": 1}
+    )
+
+
 @api_router.post("/auth/password-reset/request")
 async def request_password_reset(reset_data: dict):
     """Request password reset - requires Google Authenticator verification"""
@@ -1374,12 +1657,7 @@ async def request_password_reset(reset_data: dict):
         raise HTTPException(status_code=400, detail="Identifier is required")
     
     # Find user by username or email
-    user = await db.users.find_one({
-        "$or": [
-            {"username": identifier},
-            {"email": identifier}
-        ]
-    })
+    user = await _find_user_by_identifier(identifier)
     
     if not user:
         # Don't reveal if user exists
@@ -1407,12 +1685,7 @@ async def verify_password_reset(verify_data: dict):
         raise HTTPException(status_code=400, detail="Identifier and code are required")
     
     # Find user
-    user = await db.users.find_one({
-        "$or": [
-            {"username": identifier},
-            {"email": identifier}
-        ]
-    })
+    user = await _find_user_by_identifier(identifier)
     
     if not user:
         raise HTTPException(status_code=400, detail="Invalid code")
@@ -1427,8 +1700,7 @@ async def verify_password_reset(verify_data: dict):
     if not secret:
         raise HTTPException(status_code=400, detail="2FA not properly configured")
     
-    totp = pyotp.TOTP(secret)
-    if not totp.verify(code, valid_window=1):
+    if not verify_totp(secret, code):
         raise HTTPException(status_code=400, detail="Invalid verification code")
     
     return {"message": "Code verified successfully"}
@@ -1444,12 +1716,7 @@ async def confirm_password_reset(reset_data: dict):
         raise HTTPException(status_code=400, detail="All fields are required")
     
     # Find user
-    user = await db.users.find_one({
-        "$or": [
-            {"username": identifier},
-            {"email": identifier}
-        ]
-    })
+    user = await _find_user_by_identifier(identifier)
     
     if not user:
         raise HTTPException(status_code=400, detail="Invalid request")
@@ -1464,14 +1731,11 @@ async def confirm_password_reset(reset_data: dict):
     if not secret:
         raise HTTPException(status_code=400, detail="2FA not properly configured")
     
-    totp = pyotp.TOTP(secret)
-    if not totp.verify(code, valid_window=1):
+    if not verify_totp(secret, code):
         raise HTTPException(status_code=400, detail="Invalid verification code")
     
     # Update password
-    from passlib.context import CryptContext
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-    password_hash = pwd_context.hash(new_password)
+    password_hash = await get_password_hash(new_password)
     
     await db.users.update_one(
         {"id": user["id"]},
@@ -1484,16 +1748,14 @@ async def confirm_password_reset(reset_data: dict):
 
 @api_router.get("/auth/me", response_model=UserResponse)
 async def get_me(current_user: dict = Depends(get_current_user)):
-    if isinstance(current_user['created_at'], str):
-        current_user['created_at'] = datetime.fromisoformat(current_user['created_at'])
-    return UserResponse(**current_user)
+    return user_response_from_db(current_user)
 
 # ==================== 2FA AUTHENTICATION ====================
 
 @api_router.post("/auth/2fa/setup")
 async def setup_2fa(setup_data: TwoFactorSetup, current_user: dict = Depends(get_current_user)):
     """Setup 2FA for the current user"""
-    print(f"[DEBUG] setup_2fa called, current_user: {current_user.get('id')}, username: {current_user.get('username')}, method: {setup_data.method}")
+    logger.debug("setup_2fa user=%s method=%s", current_user.get("id"), setup_data.method)
     method = setup_data.method
     
     if method not in ["totp"]:
@@ -1502,7 +1764,6 @@ async def setup_2fa(setup_data: TwoFactorSetup, current_user: dict = Depends(get
     if method == "totp":
         # Generate TOTP secret
         secret = pyotp.random_base32()
-        print(f"[DEBUG] Generating TOTP secret for user {current_user['id']}: {secret}")
         
         # Save secret to user (pending verification) - clear any previous email settings
         await db.users.update_one(
@@ -1522,7 +1783,6 @@ async def setup_2fa(setup_data: TwoFactorSetup, current_user: dict = Depends(get
             name=current_user["username"],
             issuer_name="WiiTelecom"
         )
-        print(f"[DEBUG] Generated provisioning_uri: {provisioning_uri}")
         
         return {
             "secret": secret,
@@ -1533,10 +1793,11 @@ async def setup_2fa(setup_data: TwoFactorSetup, current_user: dict = Depends(get
 @api_router.post("/auth/2fa/verify")
 async def verify_2fa(verify_data: TwoFactorVerify, current_user: dict = Depends(get_current_user)):
     """Verify 2FA setup with a code"""
-    print(f"[DEBUG] verify_2fa called, current_user: {current_user.get('id')}, username: {current_user.get('username')}")
     user = await db.users.find_one({"id": current_user["id"]})
-    print(f"[DEBUG] User from DB: {user}")
-    print(f"[DEBUG] two_factor_pending: {user.get('two_factor_pending')}, two_factor_method: {user.get('two_factor_method')}")
+    logger.debug(
+        "verify_2fa user=%s pending=%s method=%s",
+        current_user.get("id"), user.get("two_factor_pending"), user.get("two_factor_method")
+    )
     
     if not user.get("two_factor_pending"):
         raise HTTPException(status_code=400, detail="No pending 2FA setup")
@@ -1546,35 +1807,27 @@ async def verify_2fa(verify_data: TwoFactorVerify, current_user: dict = Depends(
     if method == "totp":
         secret = user.get("two_factor_secret")
         if not secret:
-            print(f"[ERROR] No TOTP secret found for user {current_user['id']}")
+            logger.warning("No TOTP secret found for user %s", current_user["id"])
             raise HTTPException(status_code=400, detail="No TOTP secret found")
         
-        print(f"[DEBUG] User: {current_user['id']}, Secret from DB: {secret}")
-        print(f"[DEBUG] User entered code: {verify_data.code}")
-        
-        totp = pyotp.TOTP(secret)
-        print(f"[DEBUG] Current valid TOTP code: {totp.now()}")
-        
         # Allow for 1 window (30 seconds) of time drift
-        is_valid = totp.verify(verify_data.code, valid_window=1)
-        print(f"[DEBUG] TOTP verification result: {is_valid}")
+        is_valid = verify_totp(secret, verify_data.code, window=1)
+        logger.debug("verify_2fa user=%s totp_valid=%s", current_user["id"], is_valid)
         
         if not is_valid:
             raise HTTPException(status_code=400, detail="Invalid verification code")
     
-    # Enable 2FA (keep the secret for future authentication)
-    await db.users.update_one(
-        {"id": current_user["id"]},
-        {"$set": {
-            "two_factor_enabled": True,
-            "two_factor_method": method,
-            "two_factor_pending": False
-        }}
-    )
-    # Remove temporary code fields but keep the secret
+    # Enable 2FA (keep the secret for future authentication) and remove temporary code fields
     await db.users.update_one(
         {"id": current_user["id"]},
-        {"$unset": {"two_factor_code": "", "two_factor_code_expires": ""}}
+        {
+            "$set": {
+                "two_factor_enabled": True,
+                "two_factor_method": method,
+                "two_factor_pending": False
+            },
+            "$unset": {"two_factor_code": "", "two_factor_code_expires": ""}
+        }
     )
     
     return {"message": "2FA enabled successfully"}
@@ -1584,19 +1837,18 @@ async def disable_2fa(current_user: dict = Depends(get_current_user)):
     """Disable 2FA for the current user"""
     await db.users.update_one(
         {"id": current_user["id"]},
-        {"$set": {
-            "two_factor_enabled": False,
-            "two_factor_method": None
-        }}
-    )
-    await db.users.update_one(
-        {"id": current_user["id"]},
-        {"$unset": {
-            "two_factor_secret": "",
-            "two_factor_code": "",
-            "two_factor_code_expires": "",
-            "two_factor_pending": ""
-        }}
+        {
+            "$set": {
+                "two_factor_enabled": False,
+                "two_factor_method": None
+            },
+            "$unset": {
+                "two_factor_secret": "",
+                "two_factor_code": "",
+                "two_factor_code_expires": "",
+                "two_factor_pending": ""
+            }
+        }
     )
     
     return {"message": "2FA disabled successfully"}
@@ -1621,50 +1873,46 @@ async def verify_2fa_login(login_data: TwoFactorLogin):
         if not secret:
             raise HTTPException(status_code=400, detail="2FA not properly setup")
         
-        totp = pyotp.TOTP(secret)
-        if not totp.verify(login_data.code, valid_window=1):
+        if not verify_totp(secret, login_data.code, window=1):
             raise HTTPException(status_code=400, detail="Invalid 2FA code")
     
-    # Clear the 2FA code after successful verification
-    await db.users.update_one(
-        {"id": login_data.user_id},
-        {"$unset": {"two_factor_code": "", "two_factor_code_expires": ""}}
-    )
-    
     # Create session and return token
+    now = datetime.now(timezone.utc)
     session_id = str(uuid.uuid4())
-    await db.user_sessions.insert_one({
-        "id": session_id,
-        "user_id": user["id"],
-        "username": user["username"],
-        "login_time": datetime.now(timezone.utc),
-        "logout_time": None,
-        "created_at": datetime.now(timezone.utc)
-    })
-    
-    await db.users.update_one(
-        {"id": user["id"]},
-        {"$set": {
-            "last_active": datetime.now(timezone.utc),
-            "current_session_id": session_id
-        }}
-    )
     
-    # Create audit log for 2FA login
-    await create_audit_log(
-        user_id=user["id"],
-        username=user.get("username", "unknown"),
-        action="login",
-        entity_type="session",
-        entity_id=session_id,
-        entity_name=f"User logged in (2FA)"
+    # These writes are independent, so run them concurrently: create the session record,
+    # mark the user active and clear the 2FA code, and audit the 2FA login
+    await asyncio.gather(
+        db.user_sessions.insert_one({
+            "id": session_id,
+            "user_id": user["id"],
+            "username": user["username"],
+            "login_time": now,
+            "logout_time": None,
+            "created_at": now
+        }),
+        db.users.update_one(
+            {"id": user["id"]},
+            {
+                "$set": {
+                    "last_active": now,
+                    "current_session_id": session_id
+                },
+                "$unset": {"two_factor_code": "", "two_factor_code_expires": ""}
+            }
+        ),
+        create_audit_log(
+            user_id=user["id"],
+            username=user.get("username", "unknown"),
+            action="login",
+            entity_type="session",
+            entity_id=session_id,
+            entity_name=f"User logged in (2FA)"
+        )
     )
     
-    if isinstance(user.get('created_at'), str):
-        user['created_at'] = datetime.fromisoformat(user['created_at'])
-    
     access_token = create_access_token(data={"sub": user["id"]})
-    user_response = UserResponse(**user)
+    user_response = user_response_from_db(user)
     
     return Token(access_token=access_token, token_type="bearer", user=user_response)
 
@@ -1688,32 +1936,43 @@ class NotificationPreferencesUpdate(BaseModel):
     notify_on_noc_ticket_modification: Optional[bool] = None
 
 
+NOTIF_KEYS = (
+    "notify_on_ticket_created",
+    "notify_on_ticket_assigned",
+    "notify_on_ticket_awaiting_vendor",
+    "notify_on_ticket_awaiting_client",
+    "notify_on_ticket_awaiting_am",
+    "notify_on_ticket_resolved",
+    "notify_on_ticket_unresolved",
+    # Alert notifications
+    "notify_on_alert_created",
+    "notify_on_alert_commented",
+    "notify_on_alert_alt_vendor",
+    "notify_on_alert_resolved",
+    # NOC notifications
+    "notify_on_am_action",
+    "notify_on_noc_ticket_modification",
+)
+_NOTIF_DEFAULTS = dict.fromkeys(NOTIF_KEYS, True)
+
+
+def _notification_prefs(user: dict) -> dict:
+    """A user's notification preferences, defaulting anything unset to enabled"""
+    return {**_NOTIF_DEFAULTS, **{key: user[key] for key in _NOTIF_DEFAULTS if key in user}}
+
+
 @api_router.get("/users/me/notification-preferences")
 async def get_notification_preferences(current_user: dict = Depends(get_current_user)):
     """Get current user's notification preferences"""
-    return {
-        "notify_on_ticket_created": current_user.get("notify_on_ticket_created", True),
-        "notify_on_ticket_assigned": current_user.get("notify_on_ticket_assigned", True),
-        "notify_on_ticket_awaiting_vendor": current_user.get("notify_on_ticket_awaiting_vendor", True),
-        "notify_on_ticket_awaiting_client": current_user.get("notify_on_ticket_awaiting_client", True),
-        "notify_on_ticket_awaiting_am": current_user.get("notify_on_ticket_awaiting_am", True),
-        "notify_on_ticket_resolved": current_user.get("notify_on_ticket_resolved", True),
-        "notify_on_ticket_unresolved": current_user.get("notify_on_ticket_unresolved", True),
-        # Alert notifications
-        "notify_on_alert_created": current_user.get("notify_on_alert_created", True),
-        "notify_on_alert_commented": current_user.get("notify_on_alert_commented", True),
-        "notify_on_alert_alt_vendor": current_user.get("notify_on_alert_alt_vendor", True),
-        "notify_on_alert_resolved": current_user.get("notify_on_alert_resolved", True),
-        # NOC notifications
-        "notify_on_am_action": current_user.get("notify_on_am_action", True),
-        "notify_on_noc_ticket_modification": current_user.get("notify_on_noc_ticket_modification", True),
-    }
+    return _notification_prefs(current_user)
 
 
 @api_router.put("/users/me/notification-preferences")
 async def update_notification_preferences(prefs: NotificationPreferencesUpdate, current_user: dict = Depends(get_current_user)):
     """Update current user's notification preferences"""
-    update_dict = {k: v for k, v in prefs.model_dump().items() if v is not None}
+    update_dict = prefs.model_dump(exclude_none=True)
+    if not update_dict:
+        return {"message": "No changes"}
     
     await db.users.update_one(
         {"id": current_user["id"]},
@@ -1729,82 +1988,38 @@ async def update_notification_preferences(prefs: NotificationPreferencesUpdate,
 @api_router.get("/users/notification-preferences")
 async def get_all_users_notification_preferences(current_user: dict = Depends(get_current_user)):
     """Get all users' notification preferences - admin only"""
-    user_role = get_user_role_from_department(current_user.get("department"))
+    user_role = get_current_user_role(current_user)
     if user_role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can access this resource")
     
-    # Get all users with their departments
-    all_users_cursor = await db.users.find({}, {"password_hash": 0}).to_list(1000)
-    
-    # Separate AM and NOC users based on their actual department/role
-    am_users = []
-    noc_users = []
-    
-    for user in all_users_cursor:
-        # Get the user's department
-        dept = await get_user_department(user)
-        user_role = get_user_role_from_department(dept) if dept else "unknown"
-        
-        if user_role == "am":
-            am_users.append(user)
-        elif user_role == "noc":
-            noc_users.append(user)
-    
-    result = []
-    for user in am_users:
-        result.append({
-            "id": user.get("id"),
-            "username": user.get("username"),
-            "name": user.get("name"),
-            "am_type": user.get("am_type"),
-            "role": "am",
-            "notify_on_ticket_created": user.get("notify_on_ticket_created", True),
-            "notify_on_ticket_assigned": user.get("notify_on_ticket_assigned", True),
-            "notify_on_ticket_awaiting_vendor": user.get("notify_on_ticket_awaiting_vendor", True),
-            "notify_on_ticket_awaiting_client": user.get("notify_on_ticket_awaiting_client", True),
-            "notify_on_ticket_awaiting_am": user.get("notify_on_ticket_awaiting_am", True),
-            "notify_on_ticket_resolved": user.get("notify_on_ticket_resolved", True),
-            "notify_on_ticket_unresolved": user.get("notify_on_ticket_unresolved", True),
-            "notify_on_alert_created": user.get("notify_on_alert_created", True),
-            "notify_on_alert_commented": user.get("notify_on_alert_commented", True),
-            "notify_on_alert_alt_vendor": user.get("notify_on_alert_alt_vendor", True),
-            "notify_on_alert_resolved": user.get("notify_on_alert_resolved", True),
-            # NOC notifications
-            "notify_on_am_action": user.get("notify_on_am_action", True),
-            "notify_on_noc_ticket_modification": user.get("notify_on_noc_ticket_modification", True),
-        })
-    
-    # Add NOC users to result
-    for user in noc_users:
-        result.append({
-            "id": user.get("id"),
-            "username": user.get("username"),
-            "name": user.get("name"),
-            "am_type": None,
-            "role": "noc",
-            "notify_on_ticket_created": user.get("notify_on_ticket_created", True),
-            "notify_on_ticket_assigned": user.get("notify_on_ticket_assigned", True),
-            "notify_on_ticket_awaiting_vendor": user.get("notify_on_ticket_awaiting_vendor", True),
-            "notify_on_ticket_awaiting_client": user.get("notify_on_ticket_awaiting_client", True),
-            "notify_on_ticket_awaiting_am": user.get("notify_on_ticket_awaiting_am", True),
-            "notify_on_ticket_resolved": user.get("notify_on_ticket_resolved", True),
-            "notify_on_ticket_unresolved": user.get("notify_on_ticket_unresolved", True),
-            "notify_on_alert_created": user.get("notify_on_alert_created", True),
-            "notify_on_alert_commented": user.get("notify_on_alert_commented", True),
-            "notify_on_alert_alt_vendor": user.get("notify_on_alert_alt_vendor", True),
-            "notify_on_alert_resolved": user.get("notify_on_alert_resolved", True),
-            # NOC notifications
-            "notify_on_am_action": user.get("notify_on_am_action", True),
-            "notify_on_noc_ticket_modification": user.get("notify_on_noc_ticket_modification", True),
-        })
-    
-    return result
+    # Resolve which departments are AM and which are NOC from their permissions
+    departments = await db.departments.find({}, {"_id": 0}).to_list(None)
+    dept_roles = {dept["id"]: get_user_role_from_department(dept) for dept in departments}
+    am_dept_ids = [dept_id for dept_id, role in dept_roles.items() if role == "am"]
+    noc_dept_ids = [dept_id for dept_id, role in dept_roles.items() if role == "noc"]
+    
+    # Let Mongo filter and shape each AM/NOC user into the response entry
+    is_am = {"$in": ["$department_id", am_dept_ids]}
+    pipeline = [
+        {"$match": {"department_id": {"$in": am_dept_ids + noc_dept_ids}}},
+        {"$project": {
+            "_id": 0,
+            # Missing fields come back as null, as they did when entries were built in Python
+            "id": {"$ifNull": ["$id", None]},
+            "username": {"$ifNull": ["$username", None]},
+            "name": {"$ifNull": ["$name", None]},
+            "am_type": {"$cond": [is_am, {"$ifNull": ["$am_type", None]}, None]},
+            "role": {"$cond": [is_am, "am", "noc"]},
+            **{key: {"$ifNull": [f"${key}", True]} for key in NOTIF_KEYS},
+        }},
+    ]
+    return await db.users.aggregate(pipeline, batchSize=LIST_BATCH_SIZE).to_list(None)
 
 
 @api_router.put("/users/{user_id}/notification-preferences")
 async def update_user_notification_preferences(user_id: str, prefs: NotificationPreferencesUpdate, current_user: dict = Depends(get_current_user)):
     """Update a specific user's notification preferences - admin only"""
-    user_role = get_user_role_from_department(current_user.get("department"))
+    user_role = get_current_user_role(current_user)
     if user_role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can access this resource")
     
@@ -1813,7 +2028,9 @@ async def update_user_notification_preferences(user_id: str, prefs: Notification
     if not target_user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    update_dict = {k: v for k, v in prefs.model_dump().items() if v is not None}
+    update_dict = prefs.model_dump(exclude_none=True)
+    if not update_dict:
+        return {"message": "No changes"}
     
     await db.users.update_one(
         {"id": user_id},
@@ -1825,6 +2042,66 @@ async def update_user_notification_preferences(user_id: str, prefs: Notification
 
 # ==================== ALERT NOTIFICATION ENDPOINTS ====================
 
+def as_utc_datetime(value):
+    """Read a stored timestamp, a datetime or a legacy ISO string, as an aware UTC datetime"""
+    # Dates come back from Mongo aware, but legacy strings may have been written without an offset; those were UTC
+    if isinstance(value, str):
+        if not value:
+            return None
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if isinstance(value, datetime) and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+def to_utc_iso(value):
+    """Serialize a stored timestamp as a UTC ISO 8601 string with an explicit offset"""
+    # Legacy rows hold ISO strings, some written without an offset; those were UTC as well
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat()
+    return value
+
+
+# List endpoints page newest first on (created_at, id) so items sharing a timestamp are neither skipped nor repeated.
+# The next page's cursor is returned in these headers, which are only set when the page came back full.
+NEXT_BEFORE_HEADER = "X-Next-Before"
+NEXT_BEFORE_ID_HEADER = "X-Next-Before-Id"
+KEYSET_SORT = [("created_at", -1), ("id", -1)]
+
+
+def add_keyset_cursor(query: dict, before: Optional[str], before_id: Optional[str], stored_as_string: bool = False):
+    """Restrict query to the items that come after the (before, before_id) cursor in KEYSET_SORT order"""
+    if not before:
+        return
+    try:
+        cursor = datetime.fromisoformat(before)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="before must be an ISO timestamp")
+    if cursor.tzinfo is None:
+        cursor = cursor.replace(tzinfo=timezone.utc)
+    # Some collections still store created_at as UTC ISO strings, so compare against the same format
+    value = to_utc_iso(cursor) if stored_as_string else cursor
+    if before_id:
+        condition = {"$or": [{"created_at": {"$lt": value}}, {"created_at": value, "id": {"$lt": before_id}}]}
+    else:
+        condition = {"created_at": {"$lt": value}}
+    query.setdefault("$and", []).append(condition)
+
+
+def set_next_cursor(response: Response, items: list, limit: int):
+    """Expose the cursor for the page after items, if there may be one"""
+    if len(items) < limit or not items[-1].get("created_at"):
+        return
+    response.headers[NEXT_BEFORE_HEADER] = to_utc_iso(items[-1]["created_at"])
+    response.headers[NEXT_BEFORE_ID_HEADER] = str(items[-1].get("id", ""))
+
+
 @api_router.get("/users/me/alert-notifications")
 async def get_alert_notifications(current_user: dict = Depends(get_current_user)):
     """Get alert notifications for the current user based on role and department"""
@@ -1838,9 +2115,12 @@ async def get_alert_notifications(current_user: dict = Depends(get_current_user)
             {"_id": 0}
         ).sort("created_at", -1).limit(20).to_list(20)
         
+        for notification in notifications:
+            notification["created_at"] = to_utc_iso(notification.get("created_at"))
+        
         return notifications
     except Exception as e:
-        print(f"Error fetching alert notifications: {str(e)}")
+        logger.error("Error fetching alert notifications: %s", e)
         return []
 
 
@@ -1858,15 +2138,11 @@ async def get_request_notifications(current_user: dict = Depends(get_current_use
         
         # Convert datetime fields to ISO format strings for JSON serialization
         for notification in notifications:
-            if "created_at" in notification:
-                if hasattr(notification["created_at"], "isoformat"):
-                    notification["created_at"] = notification["created_at"].isoformat()
-                elif notification["created_at"] is not None:
-                    pass
+            notification["created_at"] = to_utc_iso(notification.get("created_at"))
         
         return notifications
     except Exception as e:
-        print(f"Error fetching request notifications: {str(e)}")
+        logger.error("Error fetching request notifications: %s", e)
         return []
 
 
@@ -1875,13 +2151,12 @@ async def mark_alert_notification_as_read(notification_id: str, current_user: di
     """Mark an alert notification as read"""
     current_user_id = current_user.get("id")
     
-    result = await db.alert_notifications.find_one_and_update(
+    result = await db.alert_notifications.update_one(
         {"id": notification_id, "assigned_to": current_user_id},
-        {"$set": {"read": True}},
-        return_document=True
+        {"$set": {"read": True}}
     )
     
-    if not result:
+    if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Notification not found")
     
     return {"message": "Notification marked as read"}
@@ -1890,8 +2165,10 @@ async def mark_alert_notification_as_read(notification_id: str, current_user: di
 @api_router.post("/users/me/alert-notifications/read-all")
 async def mark_all_alert_notifications_as_read(current_user: dict = Depends(get_current_user)):
     """Mark all alert notifications as read"""
+    current_user_id = current_user.get("id")
+    
     result = await db.alert_notifications.update_many(
-        {"read": False},
+        {"assigned_to": current_user_id, "read": False},
         {"$set": {"read": True}}
     )
     
@@ -1903,13 +2180,12 @@ async def mark_request_notification_as_read(notification_id: str, current_user:
     """Mark a request notification as read"""
     current_user_id = current_user.get("id")
     
-    result = await db.notifications.find_one_and_update(
+    result = await db.notifications.update_one(
         {"id": notification_id, "assigned_to": current_user_id},
-        {"$set": {"read": True}},
-        return_document=True
+        {"$set": {"read": True}}
     )
     
-    if not result:
+    if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Notification not found")
     
     return {"message": "Notification marked as read"}
@@ -1927,31 +2203,34 @@ async def mark_all_request_notifications_as_read(current_user: dict = Depends(ge
     
     return {"message": f"Marked {result.modified_count} notifications as read"}
 
+# List endpoints stream their cursor in batches of this size instead of capping results
+LIST_BATCH_SIZE = 500
+
+
+@lru_cache(maxsize=64)
+def list_adapter(model):
+    """Cached TypeAdapter for validating a list of DB rows into response models"""
+    return TypeAdapter(List[model])
+
 # ==================== USER ROUTES ====================
 
 @api_router.get("/users", response_model=List[UserResponse])
 async def get_users(current_user: dict = Depends(get_current_user)):
-    # Exclude password_hash at query level for efficiency
-    users = await db.users.find({}, {"_id": 0, "password_hash": 0}).to_list(1000)
-    for user in users:
-        if isinstance(user.get('created_at'), str):
-            user['created_at'] = datetime.fromisoformat(user['created_at'])
-    return [UserResponse(**user) for user in users]
+    # Project only the UserResponse fields; response_model validates them and fills in the defaults
+    return [user async for user in db.users.find({}, USER_RESPONSE_PROJECTION).batch_size(LIST_BATCH_SIZE)]
 
 @api_router.put("/users/{user_id}", response_model=UserResponse)
 async def update_user(user_id: str, user_data: UserUpdate, current_admin: dict = Depends(get_current_admin)):
     """Update user - admin only"""
     # Build update dict with only provided fields
-    update_dict = {k: v for k, v in user_data.model_dump().items() if v is not None}
+    update_dict = user_data.model_dump(exclude_none=True)
     
     if not update_dict:
         raise HTTPException(status_code=400, detail="No fields to update")
     
     # Hash password if provided
     if "password" in update_dict and update_dict["password"]:
-        from passlib.context import CryptContext
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        update_dict["password_hash"] = pwd_context.hash(update_dict.pop("password"))
+        update_dict["password_hash"] = await get_password_hash(update_dict.pop("password"))
     
     # Handle 2FA setup when admin enables it
     if update_dict.get("two_factor_enabled") and update_dict.get("two_factor_method") == "totp":
@@ -1961,21 +2240,22 @@ async def update_user(user_id: str, user_data: UserUpdate, current_admin: dict =
         # Mark as pending so user must verify before 2FA is active
         update_dict["two_factor_pending"] = True
     
-    # Get the user before update for audit
-    user_before = await db.users.find_one({"id": user_id}, {"_id": 0, "password_hash": 0})
-    
-    result = await db.users.find_one_and_update(
+    # Apply the update and get the user before update for audit in one round-trip
+    user_before = await db.users.find_one_and_update(
         {"id": user_id},
         {"$set": update_dict},
-        return_document=True,
+        return_document=ReturnDocument.BEFORE,
         projection={"_id": 0, "password_hash": 0}
     )
     
-    if not result:
+    if not user_before:
         raise HTTPException(status_code=404, detail="User not found")
     
-    if isinstance(result.get('created_at'), str):
-        result['created_at'] = datetime.fromisoformat(result['created_at'])
+    invalidate_user_brief(user_id)
+    
+    # The post-update document is the pre-image with the $set fields applied
+    result = {**user_before, **update_dict}
+    result.pop("password_hash", None)
     
     # Create audit log for user update
     await create_audit_log(
@@ -1988,7 +2268,7 @@ async def update_user(user_id: str, user_data: UserUpdate, current_admin: dict =
         changes={"before": user_before, "after": result}
     )
     
-    return UserResponse(**result)
+    return user_response_from_db(result)
 
 @api_router.delete("/users/{user_id}")
 async def delete_user(user_id: str, current_admin: dict = Depends(get_current_admin)):
@@ -1999,6 +2279,8 @@ async def delete_user(user_id: str, current_admin: dict = Depends(get_current_ad
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
     
+    invalidate_user_brief(user_id)
+    
     # Create audit log for user deletion
     await create_audit_log(
         user_id=current_admin["id"],
@@ -2124,16 +2406,11 @@ async def init_default_departments():
         }
     ]
     
-    for dept in default_departments:
-        existing = await db.departments.find_one({"id": dept["id"]})
-        if not existing:
-            await db.departments.insert_one(dept)
-        else:
-            # Update existing department with correct permissions
-            await db.departments.update_one(
-                {"id": dept["id"]},
-                {"$set": dept}
-            )
+    # Create missing departments and update existing ones with correct permissions in one write
+    await db.departments.bulk_write([
+        UpdateOne({"id": dept["id"]}, {"$set": dept}, upsert=True)
+        for dept in default_departments
+    ], ordered=False)
 
 async def migrate_users_to_departments():
     """Assign existing users to departments based on their role"""
@@ -2144,6 +2421,7 @@ async def migrate_users_to_departments():
     # Get all users without department_id
     users = await db.users.find({"department_id": None}).to_list(1000)
     
+    ops = []
     for user in users:
         new_dept_id = None
         
@@ -2162,29 +2440,73 @@ async def migrate_users_to_departments():
             new_dept_id = dept_map.get("NOC")
         
         if new_dept_id:
-            await db.users.update_one(
-                {"id": user["id"]},
-                {"$set": {"department_id": new_dept_id}}
-            )
-            print(f"Assigned user {user.get('username')} to department")
+            ops.append(UpdateOne({"id": user["id"]}, {"$set": {"department_id": new_dept_id}}))
+    
+    if ops:
+        await db.users.bulk_write(ops, ordered=False)
+        logger.info("Assigned %d users to departments", len(ops))
+
+async def migrate_created_at_to_dates(collection):
+    """Convert legacy ISO string created_at values in a collection to BSON dates"""
+    # Converted server-side; a string Mongo can't parse is left as it is rather than failing startup.
+    # No timezone argument: Mongo rejects one alongside an offset in the string, and naive strings already default to UTC
+    result = await collection.update_many(
+        {"created_at": {"$type": "string"}},
+        [{"$set": {"created_at": {"$dateFromString": {"dateString": "$created_at", "onError": "$created_at"}}}}],
+    )
+    if result.modified_count:
+        logger.info("Converted created_at to a date for %d %s", result.modified_count, collection.name)
+    unparsed = await collection.count_documents({"created_at": {"$type": "string"}})
+    if unparsed:
+        logger.warning("Left %d %s with a created_at string that isn't a valid date", unparsed, collection.name)
+
+async def migrate_reference_list_ids():
+    """Give legacy reference lists that predate the id field a generated id"""
+    docs = await db.reference_lists.find({"id": {"$exists": False}}, {"_id": 1}).to_list(None)
+    if docs:
+        await db.reference_lists.bulk_write([
+            UpdateOne({"_id": doc["_id"]}, {"$set": {"id": str(uuid.uuid4())}})
+            for doc in docs
+        ], ordered=False)
+        logger.info("Assigned ids to %d reference lists", len(docs))
+
+async def migrate_alert_comments():
+    """Copy inline alert comments into alert_comments once, before inline arrays start being capped"""
+    alerts = await db.alerts.find(
+        {"comments_migrated": {"$ne": True}, "id": {"$exists": True}}, {"_id": 0, "id": 1, "comments": 1}
+    ).to_list(None)
+    if not alerts:
+        return
+    # The upserts below look comments up by alert_id, so build that index first
+    await db.alert_comments.create_index([("alert_id", 1), ("created_at", -1)])
+    history = []
+    for alert in alerts:
+        for comment in alert.get("comments") or []:
+            # Upsert by comment id so a partly finished earlier run doesn't duplicate history
+            key = {"alert_id": alert["id"], "id": comment.get("id")} if comment.get("id") else {**comment, "alert_id": alert["id"]}
+            history.append(UpdateOne(key, {"$setOnInsert": {**comment, "alert_id": alert["id"]}}, upsert=True))
+    if history:
+        await db.alert_comments.bulk_write(history, ordered=False)
+    await db.alerts.update_many(
+        {"id": {"$in": [alert["id"] for alert in alerts]}}, {"$set": {"comments_migrated": True}}
+    )
+    logger.info("Copied %d comments from %d alerts into alert_comments", len(history), len(alerts))
 
 @api_router.get("/departments", response_model=List[Department])
 async def get_departments(current_user: dict = Depends(get_current_user)):
     """Get all departments - accessible by all authenticated users (for selection)"""
-    departments = await db.departments.find({}, {"_id": 0}).to_list(1000)
-    for dept in departments:
-        if isinstance(dept.get('created_at'), str):
-            dept['created_at'] = datetime.fromisoformat(dept['created_at'])
-    return [Department(**dept) for dept in departments]
+    departments = [dept async for dept in db.departments.find({}, {"_id": 0}).batch_size(LIST_BATCH_SIZE)]
+    return list_adapter(Department).validate_python(departments)
 
 @api_router.post("/departments", response_model=Department)
 async def create_department(dept_data: DepartmentCreate, current_admin: dict = Depends(get_current_admin)):
     """Create a new department - admin only"""
-    dept_obj = Department(**dept_data.model_dump())
+    payload = dept_data.model_dump()
+    dept_obj = Department(**payload)
     doc = dept_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     
     await db.departments.insert_one(doc)
+    invalidate_department_caches()
     
     # Create audit log for department creation
     await create_audit_log(
@@ -2194,7 +2516,7 @@ async def create_department(dept_data: DepartmentCreate, current_admin: dict = D
         entity_type="department",
         entity_id=dept_obj.id,
         entity_name=dept_obj.name,
-        changes=dept_data.model_dump()
+        changes=payload
     )
     
     return dept_obj
@@ -2202,23 +2524,21 @@ async def create_department(dept_data: DepartmentCreate, current_admin: dict = D
 @api_router.put("/departments/{dept_id}", response_model=Department)
 async def update_department(dept_id: str, dept_data: DepartmentUpdate, current_admin: dict = Depends(get_current_admin)):
     """Update a department - admin only"""
-    update_dict = {k: v for k, v in dept_data.model_dump().items() if v is not None}
-    
-    # Get department before update for audit
-    dept_before = await db.departments.find_one({"id": dept_id}, {"_id": 0})
+    update_dict = dept_data.model_dump(exclude_none=True)
     
-    result = await db.departments.find_one_and_update(
+    # Apply the update and get the department before update for audit in one round-trip
+    dept_before = await db.departments.find_one_and_update(
         {"id": dept_id},
         {"$set": update_dict},
-        return_document=True,
+        return_document=ReturnDocument.BEFORE,
         projection={"_id": 0}
     )
     
-    if not result:
+    if not dept_before:
         raise HTTPException(status_code=404, detail="Department not found")
     
-    if isinstance(result.get('created_at'), str):
-        result['created_at'] = datetime.fromisoformat(result['created_at'])
+    invalidate_department_caches()
+    result = {**dept_before, **update_dict}
     
     # Create audit log for department update
     await create_audit_log(
@@ -2227,7 +2547,7 @@ async def update_department(dept_id: str, dept_data: DepartmentUpdate, current_a
         action="update",
         entity_type="department",
         entity_id=dept_id,
-        entity_name=dept_before.get("name", dept_id) if dept_before else dept_id,
+        entity_name=dept_before.get("name", dept_id),
         changes={"before": dept_before, "after": result}
     )
     
@@ -2247,6 +2567,8 @@ async def delete_department(dept_id: str, current_admin: dict = Depends(get_curr
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Department not found")
     
+    invalidate_department_caches()
+    
     # Create audit log for department deletion
     await create_audit_log(
         user_id=current_admin["id"],
@@ -2270,8 +2592,6 @@ async def get_my_department(current_user: dict = Depends(get_current_user)):
     if not dept:
         return None
     
-    if isinstance(dept.get('created_at'), str):
-        dept['created_at'] = datetime.fromisoformat(dept['created_at'])
     return Department(**dept)
 
 # ==================== CLIENT ROUTES ====================
@@ -2282,9 +2602,9 @@ async def create_client(client_data: ClientCreate, current_user: dict = Depends(
     dept = await get_user_department(current_user)
     if not dept or not dept.get("can_create_enterprises"):
         raise HTTPException(status_code=403, detail="Admin or NOC access required")
-    client_obj = Client(**client_data.model_dump())
+    payload = client_data.model_dump()
+    client_obj = Client(**payload)
     doc = client_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     
     await db.clients.insert_one(doc)
     
@@ -2296,7 +2616,7 @@ async def create_client(client_data: ClientCreate, current_user: dict = Depends(
         entity_type="client",
         entity_id=client_obj.id,
         entity_name=client_obj.name,
-        changes=client_data.model_dump()
+        changes=payload
     )
     
     return client_obj
@@ -2304,29 +2624,22 @@ async def create_client(client_data: ClientCreate, current_user: dict = Depends(
 @api_router.get("/clients", response_model=List[Client])
 async def get_clients(current_user: dict = Depends(get_current_user)):
     """Get all clients - filtered by AM if user is AM"""
-    dept = await get_user_department(current_user)
-    role = get_user_role_from_department(dept)
+    role = get_current_user_role(current_user)
     
     query = {}
     if role == "am":
         query["assigned_am_id"] = current_user["id"]
     
-    clients = await db.clients.find(query, {"_id": 0}).to_list(1000)
-    for client in clients:
-        if isinstance(client['created_at'], str):
-            client['created_at'] = datetime.fromisoformat(client['created_at'])
-    return [Client(**client) for client in clients]
+    clients = [client async for client in db.clients.find(query, {"_id": 0}).batch_size(LIST_BATCH_SIZE)]
+    return list_adapter(Client).validate_python(clients)
 
 @api_router.get("/my-enterprises", response_model=List[Client])
 async def get_my_enterprises(current_user: dict = Depends(get_current_user)):
     """Get enterprises assigned to the current AM user"""
     query = {"assigned_am_id": current_user["id"]}
     
-    clients = await db.clients.find(query, {"_id": 0}).to_list(1000)
-    for client in clients:
-        if isinstance(client['created_at'], str):
-            client['created_at'] = datetime.fromisoformat(client['created_at'])
-    return [Client(**client) for client in clients]
+    clients = [client async for client in db.clients.find(query, {"_id": 0}).batch_size(LIST_BATCH_SIZE)]
+    return list_adapter(Client).validate_python(clients)
 
 @api_router.put("/clients/{client_id}", response_model=Client)
 async def update_client(client_id: str, client_data: ClientUpdate, current_user: dict = Depends(get_current_user)):
@@ -2334,23 +2647,20 @@ async def update_client(client_id: str, client_data: ClientUpdate, current_user:
     dept = await get_user_department(current_user)
     if not dept or not dept.get("can_edit_enterprises"):
         raise HTTPException(status_code=403, detail="Admin or NOC access required")
-    update_dict = {k: v for k, v in client_data.model_dump().items() if v is not None}
-    
-    # Get client before update for audit
-    client_before = await db.clients.find_one({"id": client_id}, {"_id": 0})
+    update_dict = client_data.model_dump(exclude_none=True)
     
-    result = await db.clients.find_one_and_update(
+    # Apply the update and get the client before update for audit in one round-trip
+    client_before = await db.clients.find_one_and_update(
         {"id": client_id},
         {"$set": update_dict},
-        return_document=True,
+        return_document=ReturnDocument.BEFORE,
         projection={"_id": 0}
     )
     
-    if not result:
+    if not client_before:
         raise HTTPException(status_code=404, detail="Client not found")
     
-    if isinstance(result['created_at'], str):
-        result['created_at'] = datetime.fromisoformat(result['created_at'])
+    result = {**client_before, **update_dict}
     
     # Create audit log for client update
     await create_audit_log(
@@ -2359,7 +2669,7 @@ async def update_client(client_id: str, client_data: ClientUpdate, current_user:
         action="update",
         entity_type="client",
         entity_id=client_id,
-        entity_name=client_before.get("name", client_id) if client_before else client_id,
+        entity_name=client_before.get("name", client_id),
         changes={"before": client_before, "after": result}
     )
     
@@ -2377,28 +2687,24 @@ class ClientContactUpdate(BaseModel):
 async def update_client_contact(client_id: str, contact_data: ClientContactUpdate, current_user: dict = Depends(get_current_user)):
     """Allow AMs to update contact fields for their assigned enterprises"""
     # Check role using department permissions
-    dept = await get_user_department(current_user)
-    role = get_user_role_from_department(dept)
+    role = get_current_user_role(current_user)
     
     if role != "am":
         raise HTTPException(status_code=403, detail="Only AMs can use this endpoint")
     
-    # Verify the client is assigned to this AM
-    client_before = await db.clients.find_one({"id": client_id, "assigned_am_id": current_user["id"]})
-    if not client_before:
-        raise HTTPException(status_code=404, detail="Client not found or not assigned to you")
-    
-    update_dict = {k: v for k, v in contact_data.model_dump().items() if v is not None}
+    update_dict = contact_data.model_dump(exclude_none=True)
     
-    result = await db.clients.find_one_and_update(
-        {"id": client_id},
+    # Update only if the client is assigned to this AM, getting the client before update for audit
+    client_before = await db.clients.find_one_and_update(
+        {"id": client_id, "assigned_am_id": current_user["id"]},
         {"$set": update_dict},
-        return_document=True,
+        return_document=ReturnDocument.BEFORE,
         projection={"_id": 0}
     )
+    if not client_before:
+        raise HTTPException(status_code=404, detail="Client not found or not assigned to you")
     
-    if isinstance(result['created_at'], str):
-        result['created_at'] = datetime.fromisoformat(result['created_at'])
+    result = {**client_before, **update_dict}
     
     # Create audit log for client contact update
     await create_audit_log(
@@ -2407,8 +2713,8 @@ async def update_client_contact(client_id: str, contact_data: ClientContactUpdat
         action="update",
         entity_type="client_contact",
         entity_id=client_id,
-        entity_name=client_before.get("name", client_id) if client_before else client_id,
-        changes={"before": {k: client_before.get(k) for k in contact_data.model_dump().keys() if client_before.get(k)}, "after": update_dict}
+        entity_name=client_before.get("name", client_id),
+        changes={"before": {k: client_before.get(k) for k in ClientContactUpdate.model_fields if client_before.get(k)}, "after": update_dict}
     )
     
     return Client(**result)
@@ -2460,6 +2766,9 @@ async def delete_client(client_id: str, current_admin: dict = Depends(get_curren
     
     return {"message": "Client deleted successfully"}
 
+IMPORT_BATCH_SIZE = 1000  # documents per insert_many when importing enterprises
+
+
 @api_router.post("/clients/import")
 async def import_clients(
     file: UploadFile = File(...),
@@ -2470,9 +2779,12 @@ async def import_clients(
     Required columns: name, enterprise_type
     Optional columns: tier, contact_person, contact_email, contact_phone, noc_emails, notes, customer_trunks, vendor_trunks, assigned_am
     """
+    # pandas is heavy and only needed here, so import it on first use
+    import io
+    import pandas as pd
+    
     # Check if user has permission to create clients
-    dept = await get_user_department(current_user)
-    role = get_user_role_from_department(dept)
+    role = get_current_user_role(current_user)
     if role not in ["admin", "noc"]:
         raise HTTPException(status_code=403, detail="You don't have permission to import enterprises")
     
@@ -2483,7 +2795,8 @@ async def import_clients(
     try:
         # Read and parse CSV
         contents = await file.read()
-        df = pd.read_csv(io.BytesIO(contents))
+        # Parse in a worker thread so large files don't block the event loop
+        df = await asyncio.to_thread(pd.read_csv, io.BytesIO(contents))
         
         # Validate required columns
         required_columns = ['name', 'enterprise_type']
@@ -2494,87 +2807,133 @@ async def import_clients(
                 detail=f"Missing required columns: {', '.join(missing_columns)}"
             )
         
-        imported_count = 0
         errors = []
         
-        for index, row in df.iterrows():
+        def optional_text(column):
+            """Stripped string values of an optional column, None where blank or absent"""
+            if column not in df.columns:
+                return [None] * len(df)
+            return [str(value).strip() if not pd.isna(value) else None for value in df[column].to_numpy()]
+        
+        def trunk_lists(column):
+            """Semicolon-separated trunks per row, with blanks and repeats dropped (first occurrence kept)"""
+            if column not in df.columns:
+                return [[] for _ in range(len(df))]
+            return [
+                list(dict.fromkeys(t for t in (t.strip() for t in str(value).split(';')) if t)) if not pd.isna(value) else []
+                for value in df[column].to_numpy()
+            ]
+        
+        # Validate required fields and enterprise_type for every row at once
+        row_numbers = (df.index + 2).to_numpy()
+        missing_required = (df['name'].isna() | df['enterprise_type'].isna()).to_numpy()
+        bad_type = ~missing_required & ~df['enterprise_type'].isin(['sms', 'voice']).to_numpy()
+        valid = ~missing_required & ~bad_type
+        row_errors = [(row, "Missing required fields (name, enterprise_type)") for row in row_numbers[missing_required]]
+        row_errors += [(row, "enterprise_type must be 'sms' or 'voice'") for row in row_numbers[bad_type]]
+        
+        # Validate tier if provided; an invalid tier only drops the tier assignment
+        valid_tiers = ['Tier 1', 'Tier 2', 'Tier 3', 'Tier 4']
+        tiers = optional_text('tier')
+        if 'tier' in df.columns:
+            bad_tier = valid & (df['tier'].notna() & ~df['tier'].isin(valid_tiers)).to_numpy()
+            tiers = [None if is_bad else tier for tier, is_bad in zip(tiers, bad_tier)]
+            row_errors += [
+                (row, f"tier must be one of {valid_tiers}, skipping tier assignment") for row in row_numbers[bad_tier]
+            ]
+        
+        # Parse assigned_am (by username), looking up all referenced AMs in one query
+        am_usernames = optional_text('assigned_am')
+        wanted = {name for name, is_valid in zip(am_usernames, valid) if is_valid and name}
+        am_ids = {}
+        if wanted:
+            am_users = await db.users.find(
+                {"username": {"$in": list(wanted)}, "role": "am"}, {"_id": 0, "id": 1, "username": 1}
+            ).to_list(None)
+            am_ids = {am_user["username"]: am_user["id"] for am_user in am_users}
+        
+        # Build client documents for the valid rows
+        now = datetime.now(timezone.utc)
+        columns = zip(
+            row_numbers, valid, df['name'].astype(str).str.strip(), df['enterprise_type'].astype(str).str.strip().str.lower(),
+            tiers, optional_text('contact_email'), optional_text('contact_person'), optional_text('contact_phone'),
+            optional_text('noc_emails'), optional_text('notes'), trunk_lists('customer_trunks'), trunk_lists('vendor_trunks'),
+            am_usernames,
+        )
+        client_docs = []
+        doc_rows = []
+        for (row, is_valid, name, enterprise_type, tier, contact_email, contact_person, contact_phone,
+             noc_emails, notes, customer_trunks, vendor_trunks, am_username) in columns:
+            if not is_valid:
+                continue
+            assigned_am_id = None
+            if am_username:
+                assigned_am_id = am_ids.get(am_username)
+                if assigned_am_id is None:
+                    row_errors.append((row, f"AM user '{am_username}' not found, enterprise will be unassigned"))
+            client_docs.append({
+                "id": str(uuid.uuid4()),
+                "name": name,
+                "enterprise_type": enterprise_type,
+                "tier": tier,
+                "contact_email": contact_email,
+                "contact_person": contact_person,
+                "contact_phone": contact_phone,
+                "noc_emails": noc_emails,
+                "notes": notes,
+                "customer_trunks": customer_trunks,
+                "vendor_trunks": vendor_trunks,
+                "assigned_am_id": assigned_am_id,
+                "created_at": now
+            })
+            doc_rows.append(row)
+        
+        # Report problems in row order
+        row_errors.sort(key=lambda item: item[0])
+        errors.extend(f"Row {row}: {message}" for row, message in row_errors)
+        
+        # Insert batches concurrently, one write command each, and audit only the rows that made it in
+        async def insert_batch(start: int) -> list:
             try:
-                # Validate required fields
-                if pd.isna(row['name']) or pd.isna(row['enterprise_type']):
-                    errors.append(f"Row {index + 2}: Missing required fields (name, enterprise_type)")
-                    continue
-                    
-                # Validate enterprise_type
-                if row['enterprise_type'] not in ['sms', 'voice']:
-                    errors.append(f"Row {index + 2}: enterprise_type must be 'sms' or 'voice'")
-                    continue
-                
-                # Validate tier if provided
-                if 'tier' in df.columns and not pd.isna(row.get('tier')):
-                    valid_tiers = ['Tier 1', 'Tier 2', 'Tier 3', 'Tier 4']
-                    if row['tier'] not in valid_tiers:
-                        errors.append(f"Row {index + 2}: tier must be one of {valid_tiers}, skipping tier assignment")
-                        tier_value = None
-                    else:
-                        tier_value = str(row['tier']).strip()
-                else:
-                    tier_value = None
-                
-                # Parse trunks (semicolon-separated)
-                customer_trunks = []
-                if 'customer_trunks' in df.columns and not pd.isna(row.get('customer_trunks')):
-                    customer_trunks = [t.strip() for t in str(row['customer_trunks']).split(';') if t.strip()]
-                
-                vendor_trunks = []
-                if 'vendor_trunks' in df.columns and not pd.isna(row.get('vendor_trunks')):
-                    vendor_trunks = [t.strip() for t in str(row['vendor_trunks']).split(';') if t.strip()]
-                
-                # Parse assigned_am (by username)
-                assigned_am_id = None
-                if 'assigned_am' in df.columns and not pd.isna(row.get('assigned_am')):
-                    am_username = str(row['assigned_am']).strip()
-                    if am_username:
-                        # Look up the AM user by username
-                        am_user = await db.users.find_one({"username": am_username, "role": "am"})
-                        if am_user:
-                            assigned_am_id = am_user.get("id")
-                        else:
-                            errors.append(f"Row {index + 2}: AM user '{am_username}' not found, enterprise will be unassigned")
-                
-                # Create client document
-                client_doc = {
-                    "id": str(uuid.uuid4()),
-                    "name": str(row['name']).strip(),
-                    "enterprise_type": str(row['enterprise_type']).strip().lower(),
-                    "tier": tier_value,
-                    "contact_email": str(row['contact_email']).strip() if not pd.isna(row.get('contact_email')) else None,
-                    "contact_person": str(row.get('contact_person', '')).strip() if not pd.isna(row.get('contact_person')) else None,
-                    "contact_phone": str(row.get('contact_phone', '')).strip() if not pd.isna(row.get('contact_phone')) else None,
-                    "noc_emails": str(row['noc_emails']).strip() if not pd.isna(row.get('noc_emails')) else None,
-                    "notes": str(row.get('notes', '')).strip() if not pd.isna(row.get('notes')) else None,
-                    "customer_trunks": customer_trunks,
-                    "vendor_trunks": vendor_trunks,
-                    "assigned_am_id": assigned_am_id,
-                    "created_at": datetime.now(timezone.utc)
-                }
-                
-                # Insert into database
-                await db.clients.insert_one(client_doc)
-                imported_count += 1
-                
-                # Create audit log for imported enterprise
-                await create_audit_log(
-                    user_id=current_user.get("id"),
-                    username=current_user.get("username", "user"),
-                    action="create",
-                    entity_type="client",
-                    entity_id=client_doc["id"],
-                    entity_name=client_doc["name"],
-                    changes={"imported": True, "enterprise_type": client_doc["enterprise_type"], "tier": client_doc.get("tier")}
-                )
-                
-            except Exception as e:
-                errors.append(f"Row {index + 2}: {str(e)}")
+                await db.clients.insert_many(client_docs[start:start + IMPORT_BATCH_SIZE], ordered=False)
+            except BulkWriteError as bwe:
+                return [(start + write_error["index"], write_error.get("errmsg")) for write_error in bwe.details.get("writeErrors", [])]
+            return []
+        
+        # A batch that fails outright (not a per-document write error) counts every row in it as failed
+        starts = range(0, len(client_docs), IMPORT_BATCH_SIZE)
+        results = await asyncio.gather(*(insert_batch(start) for start in starts), return_exceptions=True)
+        write_errors = []
+        for start, result in zip(starts, results):
+            if isinstance(result, Exception):
+                logger.error("Enterprise import batch at row %s failed: %s", doc_rows[start], result)
+                end = min(start + IMPORT_BATCH_SIZE, len(client_docs))
+                write_errors.extend((index, f"Insert failed: {result}") for index in range(start, end))
+            else:
+                write_errors.extend(result)
+        errors.extend(f"Row {doc_rows[index]}: {message}" for index, message in write_errors)
+        failed = {index for index, _ in write_errors}
+        
+        audit_docs = [
+            build_audit_log(
+                user_id=current_user.get("id"),
+                username=current_user.get("username", "user"),
+                action="create",
+                entity_type="client",
+                entity_id=client_doc["id"],
+                entity_name=client_doc["name"],
+                changes={"imported": True, "enterprise_type": client_doc["enterprise_type"], "tier": client_doc.get("tier")}
+            )
+            for i, client_doc in enumerate(client_docs) if i not in failed
+        ]
+        audit_results = await asyncio.gather(*(
+            db.audit_logs.insert_many(audit_docs[start:start + IMPORT_BATCH_SIZE], ordered=False)
+            for start in range(0, len(audit_docs), IMPORT_BATCH_SIZE)
+        ), return_exceptions=True)
+        for result in audit_results:
+            if isinstance(result, Exception):
+                logger.error("Failed to write enterprise import audit entries: %s", result)
+        imported_count = len(audit_docs)
         
         if errors and imported_count == 0:
             raise HTTPException(
@@ -2593,6 +2952,28 @@ async def import_clients(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to parse CSV: {str(e)}")
 
+async def collect_client_trunks(query: dict, fields: tuple) -> dict:
+    """Distinct trunks across all matching clients for each trunk field, in first-seen order, deduplicated by Mongo"""
+    pipeline = [
+        {"$match": query},
+        # Anything that isn't a list (legacy scalars, null, missing) contributes no trunks
+        {"$group": {"_id": None, **{
+            field: {"$push": {"$cond": [{"$isArray": f"${field}"}, f"${field}", []]}}
+            for field in fields
+        }}},
+        {"$project": {"_id": 0, **{
+            field: {"$reduce": {"input": f"${field}", "initialValue": [], "in": {"$reduce": {
+                "input": "$$this",
+                "initialValue": "$$value",
+                "in": {"$cond": [{"$in": ["$$this", "$$value"]}, "$$value", {"$concatArrays": ["$$value", ["$$this"]]}]},
+            }}}}
+            for field in fields
+        }}},
+    ]
+    result = await db.clients.aggregate(pipeline).to_list(1)
+    merged = result[0] if result else {}
+    return {field: merged.get(field, []) for field in fields}
+
 @api_router.get("/trunks/{enterprise_type}")
 async def get_trunks_by_type(enterprise_type: str, current_user: dict = Depends(get_current_user)):
     """Get all customer and vendor trunks for a specific enterprise type (sms or voice)"""
@@ -2603,30 +2984,11 @@ async def get_trunks_by_type(enterprise_type: str, current_user: dict = Depends(
         raise HTTPException(status_code=403, detail=f"You don't have access to {enterprise_type} tickets")
     
     query = {"enterprise_type": enterprise_type}
-    dept = await get_user_department(current_user)
-    role = get_user_role_from_department(dept)
+    role = get_current_user_role(current_user)
     if role == "am":
         query["assigned_am_id"] = current_user["id"]
     
-    clients = await db.clients.find(query, {"_id": 0, "customer_trunks": 1, "vendor_trunks": 1, "name": 1, "id": 1}).to_list(1000)
-    
-    customer_trunks = []
-    vendor_trunks = []
-    
-    for client in clients:
-        if client.get("customer_trunks"):
-            for trunk in client["customer_trunks"]:
-                if trunk not in customer_trunks:
-                    customer_trunks.append(trunk)
-        if client.get("vendor_trunks"):
-            for trunk in client["vendor_trunks"]:
-                if trunk not in vendor_trunks:
-                    vendor_trunks.append(trunk)
-    
-    return {
-        "customer_trunks": customer_trunks,
-        "vendor_trunks": vendor_trunks
-    }
+    return await collect_client_trunks(query, ("customer_trunks", "vendor_trunks"))
 
 # ==================== REFERENCE LIST ROUTES ====================
 
@@ -2663,17 +3025,10 @@ async def get_reference_trunks(section: str, current_user: dict = Depends(get_cu
     # Get all enterprises of this type (no AM restriction - all can see)
     query = {"enterprise_type": section}
     
-    clients = await db.clients.find(query, {"_id": 0, "vendor_trunks": 1}).to_list(1000)
-    
-    vendor_trunks = []
-    for client in clients:
-        if client.get("vendor_trunks"):
-            for trunk in client["vendor_trunks"]:
-                if trunk not in vendor_trunks:
-                    vendor_trunks.append(trunk)
+    trunks = await collect_client_trunks(query, ("vendor_trunks",))
     
     return {
-        "vendor_trunks": vendor_trunks,
+        "vendor_trunks": trunks["vendor_trunks"],
         "traffic_types": VOICE_TRAFFIC_TYPES if section == "voice" else TRAFFIC_TYPES
     }
 
@@ -2692,25 +3047,13 @@ async def get_reference_lists(section: str, current_user: dict = Depends(get_cur
         raise HTTPException(status_code=403, detail=f"You don't have access to {section} references")
     
     # Get all reference lists for this section
-    print(f"Fetching reference lists for section: {section}")
-    
-    # First, migrate any lists that don't have an id field
-    async for doc in db.reference_lists.find({"section": section, "id": {"$exists": False}}):
-        # Add id field using the _id or generate a new one
-        import uuid
-        new_id = str(uuid.uuid4())
-        await db.reference_lists.update_one(
-            {"_id": doc["_id"]},
-            {"$set": {"id": new_id}}
-        )
-        print(f"Migrated list {doc['_id']} with new id: {new_id}")
-    
-    # Now get all lists
-    lists = await db.reference_lists.find(
-        {"section": section},
-        {"_id": 0}
-    ).sort("created_at", -1).to_list(1000)
-    print(f"Found lists: {lists}")
+    lists = [
+        ref_list async for ref_list in db.reference_lists.find(
+            {"section": section},
+            {"_id": 0}
+        ).sort("created_at", -1).batch_size(LIST_BATCH_SIZE)
+    ]
+    logger.debug("Found %d reference lists for section %s", len(lists), section)
     
     return lists
 
@@ -2718,8 +3061,7 @@ async def get_reference_lists(section: str, current_user: dict = Depends(get_cur
 @api_router.post("/references", response_model=ReferenceList)
 async def create_reference_list(list_data: ReferenceListCreate, current_user: dict = Depends(get_current_user)):
     """Create a new reference list"""
-    print(f"Received request to create reference list: {list_data}")
-    print(f"User: {current_user}")
+    logger.debug("Creating reference list %r for user %s", list_data.name, current_user.get("id"))
     # Validate section
     if list_data.section not in ["sms", "voice"]:
         raise HTTPException(status_code=400, detail="Section must be 'sms' or 'voice'")
@@ -2742,12 +3084,11 @@ async def create_reference_list(list_data: ReferenceListCreate, current_user: di
     
     # Include the id in the insert
     list_dict = reference_list.model_dump()
-    print(f"Creating reference list with id: {list_dict.get('id')}")
     list_dict["id"] = reference_list.id
-    if "_id" in list_dict:
-        del list_dict["_id"]
     
     await db.reference_lists.insert_one(list_dict)
+    # insert_one adds the generated _id to list_dict; drop it so the dict can be returned as-is
+    list_dict.pop("_id", None)
     
     # Create audit log for reference list creation
     await create_audit_log(
@@ -2760,35 +3101,25 @@ async def create_reference_list(list_data: ReferenceListCreate, current_user: di
         changes=list_dict
     )
     
-    print(f"Inserted list: {list_dict}")
-    
-    # Return the created list from MongoDB to ensure id is properly returned
-    created = await db.reference_lists.find_one({"id": list_dict["id"]}, {"_id": 0})
+    logger.debug("Inserted reference list %s", list_dict["id"])
     
     # Broadcast to all connected clients
     await manager.broadcast_to_all({
         "type": "reference_created",
-        "data": created,
+        "data": list_dict,
         "user_id": current_user.get("id"),
         "username": current_user.get("username")
     })
     
-    return created
+    return list_dict
 
 
-@api_router.put("/references/{list_id}", response_model=ReferenceList)
-async def update_reference_list(list_id: str, list_data: ReferenceListUpdate, current_user: dict = Depends(get_current_user)):
-    """Update an existing reference list"""
-    print(f"Attempting to update list with id: {list_id}")
-    
-    # Find existing list - check both id and _id
-    from bson import ObjectId
-    try:
-        existing = await db.reference_lists.find_one({"id": list_id})
-        if not existing:
-            existing = await db.reference_lists.find_one({"_id": ObjectId(list_id)})
-    except:
-        existing = await db.reference_lists.find_one({"id": list_id})
+async def find_reference_list(list_id: str):
+    """Find a reference list by id, by Mongo _id, or by its legacy name-destination-section key"""
+    existing = await db.reference_lists.find_one({"id": list_id})
+    # Only try _id when the value actually looks like an ObjectId, instead of constructing one and catching the error
+    if not existing and ObjectId.is_valid(list_id):
+        existing = await db.reference_lists.find_one({"_id": ObjectId(list_id)})
     
     # If still not found, try to find by name+destination+section (fallback for legacy data)
     if not existing and '-' in list_id:
@@ -2802,16 +3133,25 @@ async def update_reference_list(list_id: str, list_data: ReferenceListUpdate, cu
                 "destination": destination,
                 "section": section
             })
-            if existing and "id" not in existing:
-                import uuid
-                new_id = str(uuid.uuid4())
-                await db.reference_lists.update_one(
-                    {"_id": existing["_id"]},
-                    {"$set": {"id": new_id}}
-                )
-                existing["id"] = new_id
     
-    print(f"Found list: {existing}")
+    if existing and "id" not in existing:
+        # Lists found by _id or the legacy key may predate the id field; add one so callers can write by id
+        new_id = str(uuid.uuid4())
+        await db.reference_lists.update_one(
+            {"_id": existing["_id"]},
+            {"$set": {"id": new_id}}
+        )
+        existing["id"] = new_id
+    
+    return existing
+
+
+@api_router.put("/references/{list_id}", response_model=ReferenceList)
+async def update_reference_list(list_id: str, list_data: ReferenceListUpdate, current_user: dict = Depends(get_current_user)):
+    """Update an existing reference list"""
+    logger.debug("Updating reference list %s", list_id)
+    
+    existing = await find_reference_list(list_id)
     
     if not existing:
         raise HTTPException(status_code=404, detail=f"Reference list not found: {list_id}")
@@ -2826,16 +3166,14 @@ async def update_reference_list(list_id: str, list_data: ReferenceListUpdate, cu
     update_data = list_data.model_dump(exclude_unset=True)
     update_data["updated_at"] = datetime.now(timezone.utc)
     
-    # Use the correct key for update
-    update_key = "id" if "id" in existing else "_id"
-    await db.reference_lists.update_one(
-        {update_key: existing.get(update_key)},
-        {"$set": update_data}
+    # Apply the update and get the updated list for the audit log in one round-trip
+    updated = await db.reference_lists.find_one_and_update(
+        {"id": existing["id"]},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
     
-    # Get updated list for audit log
-    updated = await db.reference_lists.find_one({update_key: existing.get(update_key)}, {"_id": 0})
-    
     # Create audit log for reference list update
     await create_audit_log(
         user_id=current_user.get("id"),
@@ -2862,43 +3200,9 @@ async def update_reference_list(list_id: str, list_data: ReferenceListUpdate, cu
 @api_router.delete("/references/{list_id}")
 async def delete_reference_list(list_id: str, current_user: dict = Depends(get_current_user)):
     """Delete a reference list"""
-    print(f"Attempting to delete list with id: {list_id}")
-    
-    # Find existing list - check both id and _id
-    from bson import ObjectId
-    try:
-        # Try to find by id field first
-        existing = await db.reference_lists.find_one({"id": list_id})
-        if not existing:
-            # Try to find by _id (MongoDB's ObjectId)
-            existing = await db.reference_lists.find_one({"_id": ObjectId(list_id)})
-    except:
-        # If list_id is not a valid ObjectId, just search by id field
-        existing = await db.reference_lists.find_one({"id": list_id})
-    
-    # If still not found, try to find by name+destination+section (fallback for legacy data)
-    if not existing and '-' in list_id:
-        parts = list_id.rsplit('-', 2)
-        if len(parts) >= 3:
-            section = parts[-1]
-            destination = parts[-2]
-            name = '-'.join(parts[:-2])
-            existing = await db.reference_lists.find_one({
-                "name": name,
-                "destination": destination,
-                "section": section
-            })
-            if existing and "id" not in existing:
-                # Add id to the existing record
-                import uuid
-                new_id = str(uuid.uuid4())
-                await db.reference_lists.update_one(
-                    {"_id": existing["_id"]},
-                    {"$set": {"id": new_id}}
-                )
-                existing["id"] = new_id
+    logger.debug("Deleting reference list %s", list_id)
     
-    print(f"Found list: {existing}")
+    existing = await find_reference_list(list_id)
     
     if not existing:
         raise HTTPException(status_code=404, detail=f"Reference list not found: {list_id}")
@@ -2909,9 +3213,8 @@ async def delete_reference_list(list_id: str, current_user: dict = Depends(get_c
     if ticket_type != "all" and ticket_type != existing.get("section"):
         raise HTTPException(status_code=403, detail=f"You don't have access to {existing.get('section')} references")
     
-    # Delete using the found document's id field or _id
-    delete_key = "id" if "id" in existing else "_id"
-    await db.reference_lists.delete_one({delete_key: existing.get(delete_key)})
+    # Every list has an id since migrate_reference_list_ids runs at startup
+    await db.reference_lists.delete_one({"id": existing["id"]})
     
     # Create audit log for reference list deletion
     await create_audit_log(
@@ -2991,7 +3294,7 @@ async def create_alert(alert_data: AlertCreate, current_user: dict = Depends(get
     if current_user.get("role") == "am":
         raise HTTPException(status_code=403, detail="Account Managers cannot create alerts")
     
-    print(f"Creating alert from ticket: {alert_data.ticket_number}")
+    logger.debug("Creating alert from ticket %s", alert_data.ticket_number)
     
     # Create the alert
     alert = Alert(
@@ -3013,7 +3316,9 @@ async def create_alert(alert_data: AlertCreate, current_user: dict = Depends(get
     )
     
     alert_dict = alert.model_dump()
-    await db.alerts.insert_one(alert_dict)
+    # New alerts have no inline comments to copy, so migrate_alert_comments can skip them.
+    # insert_one adds the Mongo _id to the dict it is given, so alert_dict stays safe to audit and broadcast.
+    await db.alerts.insert_one({**alert_dict, "comments_migrated": True})
     
     # Create audit log for alert creation
     await create_audit_log(
@@ -3027,14 +3332,16 @@ async def create_alert(alert_data: AlertCreate, current_user: dict = Depends(get
     )
     
     # Notify AMs and NOC about the new alert
-    await notify_users_about_alert(
+    queue_notification(
+        notify_users_about_alert,
         alert_id=alert_dict.get("id"),
         alert_ticket_number=alert_data.ticket_number,
         customer=alert_data.customer,
         customer_id=alert_data.customer_id,
         ticket_type=alert_data.ticket_type,
         notification_type="created",
-        created_by=current_user.get("id")
+        created_by=current_user.get("id"),
+        creator_user=current_user
     )
     
     # Broadcast to all connected clients
@@ -3049,8 +3356,16 @@ async def create_alert(alert_data: AlertCreate, current_user: dict = Depends(get
 
 
 @api_router.get("/alerts/{section}")
-async def get_alerts(section: str, current_user: dict = Depends(get_current_user)):
-    """Get all alerts for a specific section (sms or voice)"""
+async def get_alerts(
+    section: str,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    before: Optional[str] = Query(None, description="Cursor timestamp from the X-Next-Before header of the previous page"),
+    before_id: Optional[str] = Query(None, description="Cursor id from the X-Next-Before-Id header of the previous page"),
+    resolved: Optional[bool] = Query(None, description="Only resolved (true) or unresolved (false) alerts"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Get alerts for a specific section (sms or voice), newest first, one page at a time"""
     if section not in ["sms", "voice"]:
         raise HTTPException(status_code=400, detail="Section must be 'sms' or 'voice'")
     
@@ -3060,14 +3375,25 @@ async def get_alerts(section: str, current_user: dict = Depends(get_current_user
     if ticket_type != "all" and ticket_type != section:
         raise HTTPException(status_code=403, detail=f"You don't have access to {section} alerts")
     
-    alerts = await db.alerts.find(
-        {"ticket_type": section},
-        {"_id": 0}
-    ).sort("created_at", -1).to_list(1000)
+    query = {"ticket_type": section}
+    if resolved is not None:
+        # Alerts from before the resolved flag have no field and count as unresolved
+        query["resolved"] = True if resolved else {"$ne": True}
+    add_keyset_cursor(query, before, before_id)
+    
+    alerts = await db.alerts.find(query, {"_id": 0}).sort(KEYSET_SORT).limit(limit).to_list(limit)
+    set_next_cursor(response, alerts, limit)
     
     return alerts
 
 
+# Alert fields used by audit entries and notifications after a comment or resolve
+ALERT_SUMMARY_PROJECTION = {"_id": 0, "ticket_number": 1, "customer": 1, "customer_id": 1, "ticket_type": 1}
+
+# Alerts keep only their newest comments inline; the full history lives in alert_comments
+ALERT_INLINE_COMMENTS = 200
+
+
 @api_router.post("/alerts/{alert_id}/comments")
 async def add_alert_comment(alert_id: str, comment: AlertComment, current_user: dict = Depends(get_current_user)):
     """Add a comment to an alert"""
@@ -3075,11 +3401,6 @@ async def add_alert_comment(alert_id: str, comment: AlertComment, current_user:
     if current_user.get("role") == "am" and comment.alternative_vendor and comment.alternative_vendor.strip():
         raise HTTPException(status_code=403, detail="Account Managers cannot submit alternative vendor trunks")
     
-    # Find the alert
-    alert = await db.alerts.find_one({"id": alert_id})
-    if not alert:
-        raise HTTPException(status_code=404, detail="Alert not found")
-    
     # Create comment
     comment_obj = {
         "id": str(uuid.uuid4()),
@@ -3089,11 +3410,15 @@ async def add_alert_comment(alert_id: str, comment: AlertComment, current_user:
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     
-    # Add comment to alert
-    await db.alerts.update_one(
+    # Add comment to alert, reading back only the fields the audit log and notifications need
+    alert = await db.alerts.find_one_and_update(
         {"id": alert_id},
-        {"$push": {"comments": comment_obj}}
+        {"$push": {"comments": {"$each": [comment_obj], "$slice": -ALERT_INLINE_COMMENTS}}},
+        projection=ALERT_SUMMARY_PROJECTION
     )
+    if not alert:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    await db.alert_comments.insert_one({**comment_obj, "alert_id": alert_id})
     
     # Create audit log for alert comment
     await create_audit_log(
@@ -3112,19 +3437,49 @@ async def add_alert_comment(alert_id: str, comment: AlertComment, current_user:
         notification_type = "alt_vendor"
     
     # Notify AMs and NOC about the comment/alternative vendor
-    await notify_users_about_alert(
+    queue_notification(
+        notify_users_about_alert,
         alert_id=alert_id,
         alert_ticket_number=alert.get("ticket_number", ""),
         customer=alert.get("customer", ""),
         customer_id=alert.get("customer_id", ""),
         ticket_type=alert.get("ticket_type", "sms"),
         notification_type=notification_type,
-        created_by=current_user.get("id")
+        created_by=current_user.get("id"),
+        creator_user=current_user
     )
     
     return {"message": "Comment added successfully", "comment": comment_obj}
 
 
+@api_router.get("/alerts/{alert_id}/comments")
+async def get_alert_comments(
+    alert_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[str] = Query(None, description="Only comments created before this ISO timestamp, for the next page"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Page through an alert's full comment history, newest first"""
+    alert = await db.alerts.find_one({"id": alert_id}, {"_id": 0, "ticket_type": 1})
+    if not alert:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    
+    # Check department type access
+    ticket_type = get_user_ticket_type(await get_user_department(current_user))
+    if ticket_type != "all" and ticket_type != alert.get("ticket_type"):
+        raise HTTPException(status_code=403, detail="You don't have access to this alert")
+    
+    # Comment timestamps are stored as UTC ISO strings, so compare against the same format
+    query = {"alert_id": alert_id}
+    if before:
+        try:
+            query["created_at"] = {"$lt": to_utc_iso(datetime.fromisoformat(before))}
+        except ValueError:
+            raise HTTPException(status_code=400, detail="before must be an ISO timestamp")
+    
+    return await db.alert_comments.find(query, {"_id": 0, "alert_id": 0}).sort("created_at", -1).limit(limit).to_list(limit)
+
+
 @api_router.delete("/alerts/{alert_id}")
 async def delete_alert(alert_id: str, current_user: dict = Depends(get_current_user)):
     """Delete an alert"""
@@ -3132,11 +3487,10 @@ async def delete_alert(alert_id: str, current_user: dict = Depends(get_current_u
     if current_user.get("role") == "am":
         raise HTTPException(status_code=403, detail="Account Managers cannot delete alerts")
     
-    alert = await db.alerts.find_one({"id": alert_id})
+    alert = await db.alerts.find_one_and_delete({"id": alert_id})
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
-    
-    await db.alerts.delete_one({"id": alert_id})
+    await db.alert_comments.delete_many({"alert_id": alert_id})
     
     # Create audit log for alert deletion
     await create_audit_log(
@@ -3167,24 +3521,25 @@ async def resolve_alert(alert_id: str, current_user: dict = Depends(get_current_
     if current_user.get("role") == "am":
         raise HTTPException(status_code=403, detail="Account Managers cannot resolve alerts")
     
-    alert = await db.alerts.find_one({"id": alert_id})
-    if not alert:
-        raise HTTPException(status_code=404, detail="Alert not found")
-    
-    await db.alerts.update_one(
+    alert = await db.alerts.find_one_and_update(
         {"id": alert_id},
-        {"$set": {"resolved": True}}
+        {"$set": {"resolved": True}},
+        projection=ALERT_SUMMARY_PROJECTION
     )
+    if not alert:
+        raise HTTPException(status_code=404, detail="Alert not found")
     
     # Notify AMs and NOC about the resolved alert
-    await notify_users_about_alert(
+    queue_notification(
+        notify_users_about_alert,
         alert_id=alert_id,
         alert_ticket_number=alert.get("ticket_number", ""),
         customer=alert.get("customer", ""),
         customer_id=alert.get("customer_id", ""),
         ticket_type=alert.get("ticket_type", "sms"),
         notification_type="resolved",
-        created_by=current_user.get("id")
+        created_by=current_user.get("id"),
+        creator_user=current_user
     )
     
     # Broadcast to all connected clients
@@ -3281,6 +3636,10 @@ class AMRequest(BaseModel):
     test_result_images: List[str] = Field(default_factory=list)  # Multiple test result images
 
 
+# Only the fields the AMRequest response carries, so list reads skip anything else stored on a request
+AM_REQUEST_PROJECTION = {"_id": 0, **{name: 1 for name in AMRequest.model_fields}}
+
+
 class AMRequestCreate(BaseModel):
     """Model for creating an AM request"""
     request_type: str
@@ -3338,14 +3697,18 @@ class AMRequestCreate(BaseModel):
 
 @api_router.get("/requests", response_model=List[AMRequest])
 async def get_requests(
+    response: Response,
     department: Optional[str] = None,
     request_type: Optional[str] = None,
     status: Optional[str] = None,
     show_mine_only: Optional[bool] = False,
     sub_tab: Optional[str] = None,  # Filter by active or archive
+    limit: int = Query(50, ge=1, le=100),
+    before: Optional[str] = Query(None, description="Cursor timestamp from the X-Next-Before header of the previous page"),
+    before_id: Optional[str] = Query(None, description="Cursor id from the X-Next-Before-Id header of the previous page"),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get all requests - filtered by user's department and role"""
+    """Get requests, newest first, one page at a time - filtered by user's department and role"""
     user_role = current_user.get("role")
     user_id = current_user.get("id")
     
@@ -3400,18 +3763,13 @@ async def get_requests(
             {"claimed_by": {"$ne": None}}
         ]
     
-    requests = await db.am_requests.find(query).sort("created_at", -1).to_list(100)
+    # Requests store created_at as a UTC ISO string
+    add_keyset_cursor(query, before, before_id, stored_as_string=True)
     
-    # Convert datetime fields
-    for req in requests:
-        if req.get("created_at") and hasattr(req["created_at"], "isoformat"):
-            req["created_at"] = req["created_at"].isoformat()
-        if req.get("updated_at") and hasattr(req["updated_at"], "isoformat"):
-            req["updated_at"] = req["updated_at"].isoformat()
-        if req.get("responded_at") and hasattr(req["responded_at"], "isoformat"):
-            req["responded_at"] = req["responded_at"].isoformat()
-    
-    return requests
+    # The AMRequest response model serializes the datetime fields
+    am_requests = await db.am_requests.find(query, AM_REQUEST_PROJECTION).sort(KEYSET_SORT).limit(limit).to_list(limit)
+    set_next_cursor(response, am_requests, limit)
+    return am_requests
 
 
 @api_router.get("/requests/{request_id}", response_model=AMRequest)
@@ -3421,7 +3779,7 @@ async def get_request(request_id: str, current_user: dict = Depends(get_current_
     user_id = current_user.get("id")
     
     # Find the request
-    request_obj = await db.am_requests.find_one({"id": request_id})
+    request_obj = await db.am_requests.find_one({"id": request_id}, AM_REQUEST_PROJECTION)
     if not request_obj:
         raise HTTPException(status_code=404, detail="Request not found")
     
@@ -3429,14 +3787,6 @@ async def get_request(request_id: str, current_user: dict = Depends(get_current_
     if user_role == "am" and request_obj.get("created_by") != user_id:
         raise HTTPException(status_code=403, detail="You can only view your own requests")
     
-    # Convert datetime fields
-    if request_obj.get("created_at") and hasattr(request_obj["created_at"], "isoformat"):
-        request_obj["created_at"] = request_obj["created_at"].isoformat()
-    if request_obj.get("updated_at") and hasattr(request_obj["updated_at"], "isoformat"):
-        request_obj["updated_at"] = request_obj["updated_at"].isoformat()
-    if request_obj.get("responded_at") and hasattr(request_obj["responded_at"], "isoformat"):
-        request_obj["responded_at"] = request_obj["responded_at"].isoformat()
-    
     return request_obj
 
 
@@ -3530,6 +3880,73 @@ async def create_request(request_data: AMRequestCreate, current_user: dict = Dep
     return request_obj
 
 
+def _investigation_details(request_obj: dict) -> str:
+    # Investigation uses customer_trunk (singular) and investigation_destination
+    details = ""
+    customer_trunk = request_obj.get("customer_trunk", "")
+    if customer_trunk:
+        details += f"Enterprise Trunk: {customer_trunk}\n"
+    investigation_destination = request_obj.get("investigation_destination", "")
+    if investigation_destination:
+        details += f"Destination: {investigation_destination}\n"
+    issue_types = request_obj.get("issue_types", [])
+    issue_other = request_obj.get("issue_other", "")
+    if issue_types:
+        details += f"Issue Type: {', '.join(issue_types)}"
+    elif issue_other:
+        details += f"Issue Type: {issue_other}"
+    return details
+
+
+def _rating_routing_details(request_obj: dict) -> str:
+    details = ""
+    customer_trunks = request_obj.get("customer_trunks", [])
+    trunks = [ct.get("trunk", "") for ct in customer_trunks if ct.get("trunk")]
+    if trunks:
+        details += f"Enterprise Trunk(s): {', '.join(trunks)}\n"
+    destinations = {dest for dest in (ct.get("destination", "").strip() for ct in customer_trunks) if dest}
+    if destinations:
+        details += f"Destination(s): {', '.join(destinations)}"
+    return details
+
+
+def _testing_details(request_obj: dict) -> str:
+    details = ""
+    trunks = [vt.get("trunk", "") for vt in request_obj.get("vendor_trunks", []) if vt.get("trunk")]
+    if trunks:
+        details += f"Vendor Trunk(s): {', '.join(trunks)}\n"
+    destination = request_obj.get("destination", "").strip()
+    if destination:
+        details += f"Destination(s): {destination}"
+    return details
+
+
+def _translation_details(request_obj: dict) -> str:
+    details = ""
+    trunk_name = request_obj.get("trunk_name", "").strip()
+    if trunk_name:
+        details += f"Enterprise/Vendor Trunk: {trunk_name}\n"
+    translation_dest = request_obj.get("translation_destination", "").strip()
+    if translation_dest:
+        details += f"Destination(s): {translation_dest}"
+    return details
+
+
+# Request-specific detail lines for AM notifications, keyed by request_type
+REQUEST_NOTIFICATION_DETAILS = {
+    "investigation": _investigation_details,
+    "rating_routing": _rating_routing_details,
+    "testing": _testing_details,
+    "translation": _translation_details,
+}
+
+
+def request_notification_details(request_obj: dict) -> str:
+    """Detail lines appended to claim/complete/reject notifications; empty for other request types"""
+    formatter = REQUEST_NOTIFICATION_DETAILS.get(request_obj.get("request_type", ""))
+    return formatter(request_obj) if formatter else ""
+
+
 @api_router.put("/requests/{request_id}", response_model=AMRequest)
 async def update_request(request_id: str, request_data: dict, current_user: dict = Depends(get_current_user)):
     """Update a request - can be response from NOC or edit from AM"""
@@ -3575,12 +3992,13 @@ async def update_request(request_id: str, request_data: dict, current_user: dict
         await db.am_requests.update_one({"id": request_id}, {"$set": update_data})
     else:
         # NOC responding to request - can be claim (set claimed_by) or response
+        now_iso = datetime.now(timezone.utc).isoformat()
         update_data = {
             "status": request_data.get("status", request_obj.get("status")),
             "response": request_data.get("response"),
             "responded_by": current_user.get("id"),
-            "responded_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "responded_at": now_iso,
+            "updated_at": now_iso
         }
         
         # Handle test result image for testing requests
@@ -3601,8 +4019,8 @@ async def update_request(request_id: str, request_data: dict, current_user: dict
         
         await db.am_requests.update_one({"id": request_id}, {"$set": update_data})
     
-    # Get updated request for audit log
-    updated_request = await db.am_requests.find_one({"id": request_id})
+    # The request after the $set, for the audit log, without reading it back
+    updated_request = {**request_obj, **update_data}
     
     # Create audit log for request update
     await create_audit_log(
@@ -3632,59 +4050,12 @@ async def update_request(request_id: str, request_data: dict, current_user: dict
                 notification_message = f"Your {request_type_label} Request has been Claimed by {noc_name}:\n"
                 
                 # Add request-specific details
+                notification_message += request_notification_details(request_obj)
                 request_type = request_obj.get("request_type", "")
-                if request_type == "investigation":
-                    # For investigation requests, show Enterprise Trunk, Destination and Issue Type
-                    # Investigation uses customer_trunk (singular) and investigation_destination
-                    customer_trunk = request_obj.get("customer_trunk", "")
-                    investigation_destination = request_obj.get("investigation_destination", "")
-                    
-                    if customer_trunk:
-                        notification_message += f"Enterprise Trunk: {customer_trunk}\n"
-                    if investigation_destination:
-                        notification_message += f"Destination: {investigation_destination}\n"
-                    
-                    # Add issue types
-                    issue_types = request_obj.get("issue_types", [])
-                    issue_other = request_obj.get("issue_other", "")
-                    if issue_types:
-                        notification_message += f"Issue Type: {', '.join(issue_types)}"
-                    elif issue_other:
-                        notification_message += f"Issue Type: {issue_other}"
-                elif request_type == "rating_routing":
-                    customer_trunks = request_obj.get("customer_trunks", [])
-                    if customer_trunks:
-                        trunks = [ct.get("trunk", "") for ct in customer_trunks if ct.get("trunk")]
-                        if trunks:
-                            notification_message += f"Enterprise Trunk(s): {', '.join(trunks)}\n"
-                    destinations = set()
-                    for ct in customer_trunks:
-                        dest = ct.get("destination", "").strip()
-                        if dest:
-                            destinations.add(dest)
-                    if destinations:
-                        notification_message += f"Destination(s): {', '.join(destinations)}"
-                        
-                elif request_type == "testing":
-                    vendor_trunks = request_obj.get("vendor_trunks", [])
-                    if vendor_trunks:
-                        trunks = [vt.get("trunk", "") for vt in vendor_trunks if vt.get("trunk")]
-                        if trunks:
-                            notification_message += f"Vendor Trunk(s): {', '.join(trunks)}\n"
-                    destination = request_obj.get("destination", "").strip()
-                    if destination:
-                        notification_message += f"Destination(s): {destination}"
-                        
-                elif request_type == "translation":
-                    trunk_name = request_obj.get("trunk_name", "").strip()
-                    if trunk_name:
-                        notification_message += f"Enterprise/Vendor Trunk: {trunk_name}\n"
-                    translation_dest = request_obj.get("translation_destination", "").strip()
-                    if translation_dest:
-                        notification_message += f"Destination(s): {translation_dest}"
                 
+                now = datetime.now(timezone.utc)
                 notification_doc = {
-                    "id": f"request_{request_id}_claimed_{int(datetime.now(timezone.utc).timestamp())}",
+                    "id": f"request_{request_id}_claimed_{int(now.timestamp())}",
                     "type": "request_update",
                     "message": notification_message,
                     "request_id": request_id,
@@ -3693,7 +4064,7 @@ async def update_request(request_id: str, request_data: dict, current_user: dict
                     "status": "claimed",
                     "created_by": user_id,
                     "assigned_to": am_id,
-                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "created_at": now,
                     "read": False
                 }
                 await db.notifications.insert_one(notification_doc)
@@ -3725,68 +4096,15 @@ async def update_request(request_id: str, request_data: dict, current_user: dict
                 notification_message = f"Your {request_type_label} Request has been {status_text} by {noc_name}:\n"
                 
                 # Add request-specific details
-                if request_type == "investigation":
-                    # For investigation requests, show Enterprise Trunk, Destination and Issue Type
-                    # Investigation uses customer_trunk (singular) and investigation_destination
-                    customer_trunk = request_obj.get("customer_trunk", "")
-                    investigation_destination = request_obj.get("investigation_destination", "")
-                    
-                    if customer_trunk:
-                        notification_message += f"Enterprise Trunk: {customer_trunk}\n"
-                    if investigation_destination:
-                        notification_message += f"Destination: {investigation_destination}\n"
-                    
-                    # Add issue types
-                    issue_types = request_obj.get("issue_types", [])
-                    issue_other = request_obj.get("issue_other", "")
-                    if issue_types:
-                        notification_message += f"Issue Type: {', '.join(issue_types)}"
-                    elif issue_other:
-                        notification_message += f"Issue Type: {issue_other}"
-                elif request_type == "rating_routing":
-                    # Get enterprise trunks from customer_trunks
-                    customer_trunks = request_obj.get("customer_trunks", [])
-                    if customer_trunks:
-                        trunks = [ct.get("trunk", "") for ct in customer_trunks if ct.get("trunk")]
-                        if trunks:
-                            notification_message += f"Enterprise Trunk(s): {', '.join(trunks)}\n"
-                    # Get destinations
-                    destinations = set()
-                    for ct in customer_trunks:
-                        dest = ct.get("destination", "").strip()
-                        if dest:
-                            destinations.add(dest)
-                    if destinations:
-                        notification_message += f"Destination(s): {', '.join(destinations)}"
-                        
-                elif request_type == "testing":
-                    # Get vendor trunks
-                    vendor_trunks = request_obj.get("vendor_trunks", [])
-                    if vendor_trunks:
-                        trunks = [vt.get("trunk", "") for vt in vendor_trunks if vt.get("trunk")]
-                        if trunks:
-                            notification_message += f"Vendor Trunk(s): {', '.join(trunks)}\n"
-                    # Get destination
-                    destination = request_obj.get("destination", "").strip()
-                    if destination:
-                        notification_message += f"Destination(s): {destination}"
-                        
-                elif request_type == "translation":
-                    # Get trunk name
-                    trunk_name = request_obj.get("trunk_name", "").strip()
-                    if trunk_name:
-                        notification_message += f"Enterprise/Vendor Trunk: {trunk_name}\n"
-                    # Get destination
-                    translation_dest = request_obj.get("translation_destination", "").strip()
-                    if translation_dest:
-                        notification_message += f"Destination(s): {translation_dest}"
+                notification_message += request_notification_details(request_obj)
                 
                 if request_data.get("response"):
                     notification_message += f"\nNote: {request_data.get('response')}"
                 
                 # Create notification in database
+                now = datetime.now(timezone.utc)
                 notification_doc = {
-                    "id": f"request_{request_id}_{new_status}_{int(datetime.now(timezone.utc).timestamp())}",
+                    "id": f"request_{request_id}_{new_status}_{int(now.timestamp())}",
                     "type": "request_update",
                     "message": notification_message,
                     "request_id": request_id,
@@ -3796,7 +4114,7 @@ async def update_request(request_id: str, request_data: dict, current_user: dict
                     "response": request_data.get("response", ""),
                     "created_by": user_id,
                     "assigned_to": am_id,
-                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "created_at": now,
                     "read": False
                 }
                 await db.notifications.insert_one(notification_doc)
@@ -3922,11 +4240,11 @@ async def create_sms_ticket(ticket_data: SMSTicketCreate, current_user: dict = D
     
     # Notify AMs about the new ticket
     current_user_id = current_user.get("id")
-    await notify_ams_about_ticket(doc, "created", "sms", current_user_id)
+    queue_notification(notify_ams_about_ticket, doc, "created", "sms", current_user_id)
     
     # If a NOC is assigned, also notify about assignment
     if doc.get("assigned_to"):
-        await notify_ams_about_ticket(doc, "assigned", "sms", current_user_id)
+        queue_notification(notify_ams_about_ticket, doc, "assigned", "sms", current_user_id)
     
     return ticket_obj
 
@@ -3945,7 +4263,7 @@ async def get_sms_tickets(
     
     query = {}
     
-    role = get_user_role_from_department(dept)
+    role = get_current_user_role(current_user)
     
     if role == "am":
         if view_mode == "all":
@@ -4015,14 +4333,7 @@ async def get_sms_tickets(
     
     # Limit to 500 most recent tickets for performance
     tickets = await db.sms_tickets.find(query, {"_id": 0}).sort("date", -1).limit(500).to_list(500)
-    for ticket in tickets:
-        if isinstance(ticket.get('date'), str):
-            ticket['date'] = datetime.fromisoformat(ticket['date'])
-        if isinstance(ticket.get('updated_at'), str):
-            ticket['updated_at'] = datetime.fromisoformat(ticket['updated_at'])
-        # Normalize opened_via for backward compatibility
-        ticket['opened_via'] = normalize_opened_via(ticket.get('opened_via'))
-    return [SMSTicket(**ticket) for ticket in tickets]
+    return list_adapter(SMSTicket).validate_python(tickets)
 
 @api_router.get("/tickets/sms/{ticket_id}", response_model=SMSTicket)
 async def get_sms_ticket(ticket_id: str, current_user: dict = Depends(get_current_user)):
@@ -4037,12 +4348,6 @@ async def get_sms_ticket(ticket_id: str, current_user: dict = Depends(get_curren
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
-    if isinstance(ticket['date'], str):
-        ticket['date'] = datetime.fromisoformat(ticket['date'])
-    if isinstance(ticket['updated_at'], str):
-        ticket['updated_at'] = datetime.fromisoformat(ticket['updated_at'])
-    # Normalize opened_via for backward compatibility
-    ticket['opened_via'] = normalize_opened_via(ticket.get('opened_via'))
     return SMSTicket(**ticket)
 
 @api_router.put("/tickets/sms/{ticket_id}", response_model=SMSTicket)
@@ -4070,15 +4375,17 @@ async def update_sms_ticket(ticket_id: str, ticket_data: SMSTicketUpdate, curren
     new_assigned_to = update_dict.get("assigned_to", existing_ticket.get("assigned_to"))
     validate_ticket_status(new_status, new_assigned_to)
     
+    now = datetime.now(timezone.utc)
+    
     # Set assigned_at when ticket is assigned
     # Only set if: assigned_to is being set/changed AND status is "Assigned"
     if new_assigned_to and new_status == "Assigned":
         # Check if assigned_to is new or changed
         existing_assigned_to = existing_ticket.get("assigned_to")
         if not existing_assigned_to or existing_assigned_to != new_assigned_to:
-            update_dict["assigned_at"] = datetime.now(timezone.utc)
+            update_dict["assigned_at"] = now
     
-    update_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+    update_dict["updated_at"] = now.isoformat()
     
     # Check if we need to create a notification for ticket modification
     # Only notify if:
@@ -4102,8 +4409,7 @@ async def update_sms_ticket(ticket_id: str, ticket_data: SMSTicketUpdate, curren
             changes[key] = (existing_ticket[key], value)
     
     # Check if the modifier is a NOC user (for NOC modification notification)
-    dept = await get_user_department(current_user)
-    modifier_role = get_user_role_from_department(dept) if dept else None
+    modifier_role = get_current_user_role(current_user)
     is_noc_modifier = modifier_role == "noc"
     
     result = await db.sms_tickets.find_one_and_update(
@@ -4133,7 +4439,8 @@ async def update_sms_ticket(ticket_id: str, ticket_data: SMSTicketUpdate, curren
     if should_notify:
         if is_noc_modifier and changes:
             # Use detailed notification with changes for NOC modifications
-            await notify_noc_about_noc_modification(
+            queue_notification(
+                notify_noc_about_noc_modification,
                 existing_ticket,
                 current_user_id,
                 current_user.get("username", "Unknown"),
@@ -4142,7 +4449,8 @@ async def update_sms_ticket(ticket_id: str, ticket_data: SMSTicketUpdate, curren
             )
         else:
             # Use simple notification for other cases
-            await create_ticket_modification_notification(
+            queue_notification(
+                create_ticket_modification_notification,
                 ticket_id=ticket_id,
                 ticket_number=existing_ticket.get("ticket_number", ""),
                 ticket_type="sms",
@@ -4172,14 +4480,8 @@ async def update_sms_ticket(ticket_id: str, ticket_data: SMSTicketUpdate, curren
         # Send notification to AMs about the status change
         if notification_type:
             current_user_id = current_user.get("id")
-            await notify_ams_about_ticket(result, notification_type, "sms", current_user_id)
-    
-    if isinstance(result['date'], str):
-        result['date'] = datetime.fromisoformat(result['date'])
-    if isinstance(result['updated_at'], str):
-        result['updated_at'] = datetime.fromisoformat(result['updated_at'])
-    # Normalize opened_via for backward compatibility
-    result['opened_via'] = normalize_opened_via(result.get('opened_via'))
+            queue_notification(notify_ams_about_ticket, result, notification_type, "sms", current_user_id)
+    
     return SMSTicket(**result)
 
 @api_router.delete("/tickets/sms/{ticket_id}")
@@ -4254,11 +4556,11 @@ async def create_voice_ticket(ticket_data: VoiceTicketCreate, current_user: dict
     
     # Notify AMs about the new ticket
     current_user_id = current_user.get("id")
-    await notify_ams_about_ticket(doc, "created", "voice", current_user_id)
+    queue_notification(notify_ams_about_ticket, doc, "created", "voice", current_user_id)
     
     # If a NOC is assigned, also notify about assignment
     if doc.get("assigned_to"):
-        await notify_ams_about_ticket(doc, "assigned", "voice", current_user_id)
+        queue_notification(notify_ams_about_ticket, doc, "assigned", "voice", current_user_id)
     
     return ticket_obj
 
@@ -4335,14 +4637,7 @@ async def get_voice_tickets(
     
     # Limit to 500 most recent tickets for performance
     tickets = await db.voice_tickets.find(query, {"_id": 0}).sort("date", -1).limit(500).to_list(500)
-    for ticket in tickets:
-        if isinstance(ticket.get('date'), str):
-            ticket['date'] = datetime.fromisoformat(ticket['date'])
-        if isinstance(ticket.get('updated_at'), str):
-            ticket['updated_at'] = datetime.fromisoformat(ticket['updated_at'])
-        # Normalize opened_via for backward compatibility
-        ticket['opened_via'] = normalize_opened_via(ticket.get('opened_via'))
-    return [VoiceTicket(**ticket) for ticket in tickets]
+    return list_adapter(VoiceTicket).validate_python(tickets)
 
 @api_router.get("/tickets/voice/{ticket_id}", response_model=VoiceTicket)
 async def get_voice_ticket(ticket_id: str, current_user: dict = Depends(get_current_user)):
@@ -4350,19 +4645,13 @@ async def get_voice_ticket(ticket_id: str, current_user: dict = Depends(get_curr
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
-    if isinstance(ticket['date'], str):
-        ticket['date'] = datetime.fromisoformat(ticket['date'])
-    if isinstance(ticket['updated_at'], str):
-        ticket['updated_at'] = datetime.fromisoformat(ticket['updated_at'])
-    # Normalize opened_via for backward compatibility
-    ticket['opened_via'] = normalize_opened_via(ticket.get('opened_via'))
     return VoiceTicket(**ticket)
 
 @api_router.put("/tickets/voice/{ticket_id}", response_model=VoiceTicket)
 async def update_voice_ticket(ticket_id: str, ticket_data: VoiceTicketUpdate, current_user: dict = Depends(get_current_user)):
     # Get user department to check role
     dept = await get_user_department(current_user)
-    user_role = get_user_role_from_department(dept) if dept else "unknown"
+    user_role = get_current_user_role(current_user)
     
     # AMs cannot update tickets
     if user_role == "am":
@@ -4380,15 +4669,17 @@ async def update_voice_ticket(ticket_id: str, ticket_data: VoiceTicketUpdate, cu
     new_assigned_to = update_dict.get("assigned_to", existing_ticket.get("assigned_to"))
     validate_ticket_status(new_status, new_assigned_to)
     
+    now = datetime.now(timezone.utc)
+    
     # Set assigned_at when ticket is assigned
     # Only set if: assigned_to is being set/changed AND status is "Assigned"
     if new_assigned_to and new_status == "Assigned":
         # Check if assigned_to is new or changed
         existing_assigned_to = existing_ticket.get("assigned_to")
         if not existing_assigned_to or existing_assigned_to != new_assigned_to:
-            update_dict["assigned_at"] = datetime.now(timezone.utc)
+            update_dict["assigned_at"] = now
     
-    update_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+    update_dict["updated_at"] = now.isoformat()
     
     # Check if we need to create a notification for ticket modification
     # Only notify if:
@@ -4412,8 +4703,7 @@ async def update_voice_ticket(ticket_id: str, ticket_data: VoiceTicketUpdate, cu
             changes[key] = (existing_ticket[key], value)
     
     # Check if the modifier is a NOC user (for NOC modification notification)
-    dept = await get_user_department(current_user)
-    modifier_role = get_user_role_from_department(dept) if dept else None
+    modifier_role = get_current_user_role(current_user)
     is_noc_modifier = modifier_role == "noc"
     
     result = await db.voice_tickets.find_one_and_update(
@@ -4443,7 +4733,8 @@ async def update_voice_ticket(ticket_id: str, ticket_data: VoiceTicketUpdate, cu
     if should_notify:
         if is_noc_modifier and changes:
             # Use detailed notification with changes for NOC modifications
-            await notify_noc_about_noc_modification(
+            queue_notification(
+                notify_noc_about_noc_modification,
                 existing_ticket,
                 current_user_id,
                 current_user.get("username", "Unknown"),
@@ -4452,7 +4743,8 @@ async def update_voice_ticket(ticket_id: str, ticket_data: VoiceTicketUpdate, cu
             )
         else:
             # Use simple notification for other cases
-            await create_ticket_modification_notification(
+            queue_notification(
+                create_ticket_modification_notification,
                 ticket_id=ticket_id,
                 ticket_number=existing_ticket.get("ticket_number", ""),
                 ticket_type="voice",
@@ -4482,14 +4774,8 @@ async def update_voice_ticket(ticket_id: str, ticket_data: VoiceTicketUpdate, cu
         # Send notification to AMs about the status change
         if notification_type:
             current_user_id = current_user.get("id")
-            await notify_ams_about_ticket(result, notification_type, "voice", current_user_id)
-    
-    if isinstance(result['date'], str):
-        result['date'] = datetime.fromisoformat(result['date'])
-    if isinstance(result['updated_at'], str):
-        result['updated_at'] = datetime.fromisoformat(result['updated_at'])
-    # Normalize opened_via for backward compatibility
-    result['opened_via'] = normalize_opened_via(result.get('opened_via'))
+            queue_notification(notify_ams_about_ticket, result, notification_type, "voice", current_user_id)
+    
     return VoiceTicket(**result)
 
 @api_router.delete("/tickets/voice/{ticket_id}")
@@ -4537,19 +4823,20 @@ async def add_sms_ticket_action(
     user = await db.users.find_one({"id": current_user["id"]})
     username = user.get("username", "Unknown") if user else "Unknown"
     
+    now_iso = datetime.now(timezone.utc).isoformat()
     action_obj = {
         "id": str(uuid.uuid4()),
         "text": action_data.text,
         "created_by": current_user["id"],
         "created_by_username": username,
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": now_iso
     }
     
     result = await db.sms_tickets.find_one_and_update(
         {"id": ticket_id},
         {
             "$push": {"actions": action_obj},
-            "$set": {"updated_at": datetime.now(timezone.utc).isoformat()}
+            "$set": {"updated_at": now_iso}
         },
         projection={"_id": 0}
     )
@@ -4572,7 +4859,7 @@ async def add_sms_ticket_action(
     user_dept = await get_user_department(user)
     user_role = get_user_role_from_department(user_dept) if user_dept else None
     if user_role == "am":
-        await notify_noc_about_am_action(result, action_data.text, current_user["id"], "sms")
+        queue_notification(notify_noc_about_am_action, result, action_data.text, current_user["id"], "sms")
     
     return {"message": "Action added successfully", "action": action_obj}
 
@@ -4587,19 +4874,20 @@ async def add_voice_ticket_action(
     user = await db.users.find_one({"id": current_user["id"]})
     username = user.get("username", "Unknown") if user else "Unknown"
     
+    now_iso = datetime.now(timezone.utc).isoformat()
     action_obj = {
         "id": str(uuid.uuid4()),
         "text": action_data.text,
         "created_by": current_user["id"],
         "created_by_username": username,
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": now_iso
     }
     
     result = await db.voice_tickets.find_one_and_update(
         {"id": ticket_id},
         {
             "$push": {"actions": action_obj},
-            "$set": {"updated_at": datetime.now(timezone.utc).isoformat()}
+            "$set": {"updated_at": now_iso}
         },
         projection={"_id": 0}
     )
@@ -4622,7 +4910,7 @@ async def add_voice_ticket_action(
     user_dept = await get_user_department(user)
     user_role = get_user_role_from_department(user_dept) if user_dept else None
     if user_role == "am":
-        await notify_noc_about_am_action(result, action_data.text, current_user["id"], "voice")
+        queue_notification(notify_noc_about_am_action, result, action_data.text, current_user["id"], "voice")
     
     return {"message": "Action added successfully", "action": action_obj}
 
@@ -4655,14 +4943,15 @@ async def update_sms_ticket_action(
         raise HTTPException(status_code=403, detail="You can only edit your own actions")
     
     # Update the action
+    now_iso = datetime.now(timezone.utc).isoformat()
     result = await db.sms_tickets.find_one_and_update(
         {"id": ticket_id, "actions.id": action_id},
         {
             "$set": {
                 "actions.$.text": action_data.text,
                 "actions.$.edited": True,
-                "actions.$.edited_at": datetime.now(timezone.utc).isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat()
+                "actions.$.edited_at": now_iso,
+                "updated_at": now_iso
             }
         },
         projection={"_id": 0}
@@ -4737,14 +5026,15 @@ async def update_voice_ticket_action(
         raise HTTPException(status_code=403, detail="You can only edit your own actions")
     
     # Update the action
+    now_iso = datetime.now(timezone.utc).isoformat()
     result = await db.voice_tickets.find_one_and_update(
         {"id": ticket_id, "actions.id": action_id},
         {
             "$set": {
                 "actions.$.text": action_data.text,
                 "actions.$.edited": True,
-                "actions.$.edited_at": datetime.now(timezone.utc).isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat()
+                "actions.$.edited_at": now_iso,
+                "updated_at": now_iso
             }
         },
         projection={"_id": 0}
@@ -4795,8 +5085,6 @@ async def delete_voice_ticket_action(
 @api_router.get("/dashboard/online-users")
 async def get_online_users(current_user: dict = Depends(get_current_user)):
     """Get list of users who were active in the last 5 minutes"""
-    from datetime import timedelta
-    
     # Consider users active in the last 5 minutes as online
     five_minutes_ago = datetime.now(timezone.utc) - timedelta(minutes=5)
     
@@ -4814,8 +5102,6 @@ async def get_online_users(current_user: dict = Depends(get_current_user)):
 @api_router.get("/dashboard/user-online-time")
 async def get_user_online_time(current_user: dict = Depends(get_current_user)):
     """Get online time statistics for all users today"""
-    from datetime import timedelta
-    
     now = datetime.now(timezone.utc)
     # Get start of today (midnight UTC)
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -4831,9 +5117,7 @@ async def get_user_online_time(current_user: dict = Depends(get_current_user)):
         user_id = session.get("user_id")
         username = session.get("username", "Unknown")
         
-        login_time = session.get("login_time")
-        if isinstance(login_time, str):
-            login_time = datetime.fromisoformat(login_time)
+        login_time = as_utc_datetime(session.get("login_time"))
         
         # Determine the effective login time (either start of today or session login)
         effective_login = login_time if login_time and login_time >= today_start else today_start
@@ -4843,8 +5127,8 @@ async def get_user_online_time(current_user: dict = Depends(get_current_user)):
         if logout_time is None:
             # Session is still active - include time until now
             logout_time = now
-        elif isinstance(logout_time, str):
-            logout_time = datetime.fromisoformat(logout_time)
+        else:
+            logout_time = as_utc_datetime(logout_time)
         
         if effective_login and logout_time:
             duration = (logout_time - effective_login).total_seconds()
@@ -4871,8 +5155,7 @@ async def get_user_online_time(current_user: dict = Depends(get_current_user)):
         last_active = user.get("last_active")
         
         if last_active:
-            if isinstance(last_active, str):
-                last_active = datetime.fromisoformat(last_active)
+            last_active = as_utc_datetime(last_active)
             
             # If last_active is within the last hour, consider them online today
             one_hour_ago = now - timedelta(hours=1)
@@ -4918,8 +5201,6 @@ async def get_user_online_time(current_user: dict = Depends(get_current_user)):
 @api_router.get("/dashboard/unassigned-alerts")
 async def get_unassigned_alerts(current_user: dict = Depends(get_current_user)):
     """Get unassigned tickets that have exceeded their alert threshold based on priority"""
-    from datetime import timedelta
-    
     # Define alert intervals in minutes based on priority
     priority_intervals = {
         "Urgent": 5,
@@ -4941,9 +5222,7 @@ async def get_unassigned_alerts(current_user: dict = Depends(get_current_user)):
         interval = priority_intervals.get(priority, 15)  # Default to 15 minutes
         threshold_time = now - timedelta(minutes=interval)
         
-        ticket_date = ticket.get("date")
-        if isinstance(ticket_date, str):
-            ticket_date = datetime.fromisoformat(ticket_date)
+        ticket_date = as_utc_datetime(ticket.get("date"))
         
         if ticket_date and ticket_date <= threshold_time:
             alerts.append({
@@ -4967,9 +5246,7 @@ async def get_unassigned_alerts(current_user: dict = Depends(get_current_user)):
         interval = priority_intervals.get(priority, 15)  # Default to 15 minutes
         threshold_time = now - timedelta(minutes=interval)
         
-        ticket_date = ticket.get("date")
-        if isinstance(ticket_date, str):
-            ticket_date = datetime.fromisoformat(ticket_date)
+        ticket_date = as_utc_datetime(ticket.get("date"))
         
         if ticket_date and ticket_date <= threshold_time:
             alerts.append({
@@ -4994,7 +5271,7 @@ async def get_ticket_modification_notifications(current_user: dict = Depends(get
         
         # Get user role to determine which notifications to return
         user_dept = await get_user_department(current_user)
-        user_role = get_user_role_from_department(user_dept) if user_dept else "unknown"
+        user_role = get_current_user_role(current_user)
         user_ticket_type = get_user_ticket_type(user_dept) if user_dept else "all"
         
         # Build query based on user role
@@ -5024,16 +5301,11 @@ async def get_ticket_modification_notifications(current_user: dict = Depends(get
         
         # Convert datetime fields to ISO format strings for JSON serialization
         for notification in notifications:
-            if "created_at" in notification:
-                if hasattr(notification["created_at"], "isoformat"):
-                    notification["created_at"] = notification["created_at"].isoformat()
-                elif notification["created_at"] is not None:
-                    # Already a string or other type, leave as is
-                    pass
+            notification["created_at"] = to_utc_iso(notification.get("created_at"))
         
         return notifications
     except Exception as e:
-        print(f"Error fetching ticket modifications: {str(e)}")
+        logger.error("Error fetching ticket modifications: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching notifications: {str(e)}")
 
 
@@ -5042,13 +5314,12 @@ async def mark_notification_as_read(notification_id: str, current_user: dict = D
     """Mark a ticket modification notification as read"""
     current_user_id = current_user.get("id")
     
-    result = await db.ticket_notifications.find_one_and_update(
+    result = await db.ticket_notifications.update_one(
         {"id": notification_id, "assigned_to": current_user_id},
-        {"$set": {"read": True}},
-        return_document=True
+        {"$set": {"read": True}}
     )
     
-    if not result:
+    if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Notification not found")
     
     return {"message": "Notification marked as read"}
@@ -5062,8 +5333,6 @@ async def get_assigned_ticket_reminders(current_user: dict = Depends(get_current
     - Medium: 25 minutes
     - Low: 30 minutes
     """
-    from datetime import timedelta
-    
     current_user_id = current_user.get("id")
     
     # Define reminder intervals in minutes based on priority
@@ -5089,15 +5358,11 @@ async def get_assigned_ticket_reminders(current_user: dict = Depends(get_current
         threshold_time = now - timedelta(minutes=interval)
         
         # Use assigned_at if available, otherwise use date as fallback
-        assigned_at = ticket.get("assigned_at")
-        if isinstance(assigned_at, str):
-            assigned_at = datetime.fromisoformat(assigned_at.replace('Z', '+00:00'))
+        assigned_at = as_utc_datetime(ticket.get("assigned_at"))
         
         # If no assigned_at, fall back to ticket date only if it's recent (within last hour)
         if not assigned_at:
-            ticket_date = ticket.get("date")
-            if isinstance(ticket_date, str):
-                ticket_date = datetime.fromisoformat(ticket_date.replace('Z', '+00:00'))
+            ticket_date = as_utc_datetime(ticket.get("date"))
             # Only use date as fallback if it's within the last hour
             if ticket_date and ticket_date >= (now - timedelta(hours=1)):
                 assigned_at = ticket_date
@@ -5105,10 +5370,6 @@ async def get_assigned_ticket_reminders(current_user: dict = Depends(get_current
                 # Skip this ticket - no valid assigned_at and date is too old
                 continue
         
-        # Make sure assigned_at is timezone-aware for comparison
-        if assigned_at and assigned_at.tzinfo is None:
-            assigned_at = assigned_at.replace(tzinfo=timezone.utc)
-        
         # Only show reminder if ticket has been assigned longer than the threshold
         if assigned_at and assigned_at <= threshold_time:
             reminders.append({
@@ -5134,15 +5395,11 @@ async def get_assigned_ticket_reminders(current_user: dict = Depends(get_current
         threshold_time = now - timedelta(minutes=interval)
         
         # Use assigned_at if available, otherwise use date as fallback
-        assigned_at = ticket.get("assigned_at")
-        if isinstance(assigned_at, str):
-            assigned_at = datetime.fromisoformat(assigned_at.replace('Z', '+00:00'))
+        assigned_at = as_utc_datetime(ticket.get("assigned_at"))
         
         # If no assigned_at, fall back to ticket date only if it's recent (within last hour)
         if not assigned_at:
-            ticket_date = ticket.get("date")
-            if isinstance(ticket_date, str):
-                ticket_date = datetime.fromisoformat(ticket_date.replace('Z', '+00:00'))
+            ticket_date = as_utc_datetime(ticket.get("date"))
             # Only use date as fallback if it's within the last hour
             if ticket_date and ticket_date >= (now - timedelta(hours=1)):
                 assigned_at = ticket_date
@@ -5150,10 +5407,6 @@ async def get_assigned_ticket_reminders(current_user: dict = Depends(get_current
                 # Skip this ticket - no valid assigned_at and date is too old
                 continue
         
-        # Make sure assigned_at is timezone-aware for comparison
-        if assigned_at and assigned_at.tzinfo is None:
-            assigned_at = assigned_at.replace(tzinfo=timezone.utc)
-        
         # Only show reminder if ticket has been assigned longer than the threshold
         if assigned_at and assigned_at <= threshold_time:
             reminders.append({
@@ -5179,8 +5432,9 @@ async def get_dashboard_stats(
     query = {}
     
     if current_user["role"] == "am":
-        clients = await db.clients.find({"assigned_am_id": current_user["id"]}, {"_id": 0, "id": 1}).to_list(1000)
-        client_ids = [c["id"] for c in clients]
+        client_ids = [
+            c["id"] async for c in db.clients.find({"assigned_am_id": current_user["id"]}, {"_id": 0, "id": 1}).batch_size(LIST_BATCH_SIZE)
+        ]
         query["customer_id"] = {"$in": client_ids}
     
     # Add date range filter if provided
@@ -5270,9 +5524,9 @@ async def get_dashboard_stats(
 
 # ==================== AUDIT LOGS ====================
 
-async def create_audit_log(user_id: str, username: str, action: str, entity_type: str, entity_id: str, entity_name: str, changes: Optional[dict] = None):
-    """Create an audit log entry"""
-    audit_log = {
+def build_audit_log(user_id: str, username: str, action: str, entity_type: str, entity_id: str, entity_name: str, changes: Optional[dict] = None) -> dict:
+    """Build an audit log document"""
+    return {
         "id": str(uuid.uuid4()),
         "user_id": user_id,
         "username": username,
@@ -5283,7 +5537,61 @@ async def create_audit_log(user_id: str, username: str, action: str, entity_type
         "changes": changes,
         "timestamp": datetime.now(timezone.utc)
     }
-    await db.audit_logs.insert_one(audit_log)
+
+# Audit entries are queued and written in batches by a background worker so requests don't wait on the insert
+AUDIT_BATCH_SIZE = int(os.environ.get("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.environ.get("AUDIT_FLUSH_INTERVAL", "0.1"))  # seconds to let a batch accumulate
+audit_queue = asyncio.Queue()
+_audit_worker_task = None
+
+
+async def _audit_worker():
+    """Drain the audit queue into batched insert_many calls; a None entry flushes and stops"""
+    stopping = False
+    while not stopping:
+        entry = await audit_queue.get()
+        if entry is None:
+            audit_queue.task_done()
+            return
+        await asyncio.sleep(AUDIT_FLUSH_INTERVAL)
+        batch = [entry]
+        while len(batch) < AUDIT_BATCH_SIZE and not audit_queue.empty():
+            entry = audit_queue.get_nowait()
+            if entry is None:
+                stopping = True
+                audit_queue.task_done()
+                break
+            batch.append(entry)
+        try:
+            await db.audit_logs.insert_many(batch, ordered=False)
+        except Exception as e:
+            logger.error("Failed to write %d audit log entries: %s", len(batch), e)
+        finally:
+            for _ in batch:
+                audit_queue.task_done()
+
+
+def start_audit_worker():
+    global _audit_worker_task
+    if _audit_worker_task is None or _audit_worker_task.done():
+        _audit_worker_task = asyncio.create_task(_audit_worker())
+
+
+async def stop_audit_worker():
+    """Flush queued audit entries, then stop the worker"""
+    global _audit_worker_task
+    if _audit_worker_task is not None:
+        audit_queue.put_nowait(None)
+        try:
+            await asyncio.wait_for(_audit_worker_task, timeout=10)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+        _audit_worker_task = None
+
+
+async def create_audit_log(user_id: str, username: str, action: str, entity_type: str, entity_id: str, entity_name: str, changes: Optional[dict] = None):
+    """Queue an audit log entry for the audit worker"""
+    audit_queue.put_nowait(build_audit_log(user_id, username, action, entity_type, entity_id, entity_name, changes))
 
 class AuditLogResponse(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -5345,14 +5653,11 @@ async def get_audit_logs(
         return []
     
     # Convert all values to ensure no ObjectIds remain
-    from bson import ObjectId
-    import datetime
-    
     def convert_value(val):
         """Recursively convert ObjectId and datetime values to JSON-serializable formats"""
         if isinstance(val, ObjectId):
             return str(val)
-        elif isinstance(val, datetime.datetime):
+        elif isinstance(val, datetime):
             return val.isoformat()
         elif isinstance(val, dict):
             return {k: convert_value(v) for k, v in val.items()}
@@ -5371,7 +5676,7 @@ async def get_audit_logs(
         
         logs.append(log)
     
-    return [AuditLogResponse(**log) for log in logs]
+    return list_adapter(AuditLogResponse).validate_python(logs)
 
 @api_router.get("/audit-logs/count")
 async def get_audit_logs_count(
@@ -5405,6 +5710,10 @@ async def get_audit_logs_count(
 
 # ==================== WEBSOCKET CONNECTION MANAGER ====================
 
+WS_COALESCE_WINDOW = 0.005  # seconds to gather same-tick messages into one frame
+WS_SEND_TIMEOUT = 5.0  # seconds before a client that isn't reading is dropped
+
+
 class ConnectionManager:
     """Manages WebSocket connections for real-time chat"""
     def __init__(self):
@@ -5412,6 +5721,9 @@ class ConnectionManager:
         self.active_connections: dict[str, set[WebSocket]] = {}
         # Map websocket to user_id for quick lookup
         self.connection_users: dict[WebSocket, str] = {}
+        # Per-connection outbox and the task that drains it
+        self.outboxes: dict[WebSocket, asyncio.Queue] = {}
+        self.writers: dict[WebSocket, asyncio.Task] = {}
 
     async def connect(self, websocket: WebSocket, user_id: str):
         await websocket.accept()
@@ -5419,6 +5731,9 @@ class ConnectionManager:
             self.active_connections[user_id] = set()
         self.active_connections[user_id].add(websocket)
         self.connection_users[websocket] = user_id
+        outbox = asyncio.Queue()
+        self.outboxes[websocket] = outbox
+        self.writers[websocket] = asyncio.create_task(self._writer(websocket, outbox))
         # Update user's online status
         await db.users.update_one(
             {"id": user_id},
@@ -5431,33 +5746,49 @@ class ConnectionManager:
             self.active_connections[user_id].discard(websocket)
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
+        self.outboxes.pop(websocket, None)
+        writer = self.writers.pop(websocket, None)
+        if writer and writer is not asyncio.current_task():
+            writer.cancel()
+
+    async def _writer(self, websocket: WebSocket, outbox: asyncio.Queue):
+        """Send queued pre-serialized messages, coalescing everything queued within the window into one frame"""
+        while True:
+            batch = [await outbox.get()]
+            await asyncio.sleep(WS_COALESCE_WINDOW)
+            while not outbox.empty():
+                batch.append(outbox.get_nowait())
+            try:
+                if websocket.client_state != WebSocketState.CONNECTED:
+                    break
+                # A lone message keeps the plain object shape, bursts go out as a JSON array
+                frame = batch[0] if len(batch) == 1 else b"[" + b",".join(batch) + b"]"
+                await asyncio.wait_for(websocket.send_text(frame.decode()), WS_SEND_TIMEOUT)
+            except Exception:
+                break
+        self.disconnect(websocket)
+
+    def _enqueue(self, payload: bytes, user_ids):
+        for user_id in user_ids:
+            for connection in self.active_connections.get(user_id, ()):
+                outbox = self.outboxes.get(connection)
+                if outbox is not None:
+                    outbox.put_nowait(payload)
 
     async def send_personal_message(self, message: dict, user_id: str):
-        if user_id in self.active_connections:
-            disconnected = set()
-            for connection in self.active_connections[user_id]:
-                try:
-                    if connection.client_state == WebSocketState.CONNECTED:
-                        await connection.send_json(message)
-                    else:
-                        disconnected.add(connection)
-                except Exception:
-                    disconnected.add(connection)
-            # Clean up disconnected connections
-            for conn in disconnected:
-                self.disconnect(conn)
+        self._enqueue(orjson.dumps(message, default=str, option=orjson.OPT_NON_STR_KEYS), (user_id,))
 
     async def broadcast_to_conversation(self, message: dict, participant_ids: List[str]):
         """Send message to all participants in a conversation"""
-        for user_id in participant_ids:
-            await self.send_personal_message(message, user_id)
+        # Serialize once and share the bytes across every participant's connections
+        self._enqueue(orjson.dumps(message, default=str, option=orjson.OPT_NON_STR_KEYS), participant_ids)
 
     async def broadcast_to_all(self, message: dict):
         """Broadcast message to all connected users"""
-        # Get all user_ids with active connections
-        all_user_ids = list(self.active_connections.keys())
-        for user_id in all_user_ids:
-            await self.send_personal_message(message, user_id)
+        # Serialize once, then enqueue straight onto every connection's outbox; the writers do the actual sends
+        payload = orjson.dumps(message, default=str, option=orjson.OPT_NON_STR_KEYS)
+        for outbox in list(self.outboxes.values()):
+            outbox.put_nowait(payload)
 
 # Global connection manager
 manager = ConnectionManager()
@@ -5527,9 +5858,9 @@ async def websocket_chat(websocket: WebSocket, token: str):
                     {
                         "$set": {
                             "last_message": content[:100] if content else f"{msg_type}: {file_name or 'file'}",
-                            "last_message_time": datetime.now(timezone.utc),
+                            "last_message_time": msg_obj.created_at,
                             "last_message_sender_id": user_id,
-                            "updated_at": datetime.now(timezone.utc)
+                            "updated_at": msg_obj.created_at
                         }
                     }
                 )
@@ -5956,9 +6287,9 @@ async def create_message(
         {
             "$set": {
                 "last_message": data.content[:100] if data.content else f"{data.message_type}: {data.file_name or 'file'}",
-                "last_message_time": datetime.now(timezone.utc),
+                "last_message_time": msg_obj.created_at,
                 "last_message_sender_id": user_id,
-                "updated_at": datetime.now(timezone.utc)
+                "updated_at": msg_obj.created_at
             }
         }
     )
@@ -6049,7 +6380,6 @@ async def get_chat_file(filename: str):
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="File not found")
 
-    from fastapi.responses import FileResponse
     return FileResponse(file_path)
 
 
@@ -6391,16 +6721,56 @@ app.add_middleware(
 )
 
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+# Under docker-compose Mongo often starts after the app, so startup waits for it with backoff
+MONGO_STARTUP_TIMEOUT = float(os.environ.get("MONGO_STARTUP_TIMEOUT", "60"))  # seconds
+
+
+async def wait_for_mongo() -> bool:
+    """Ping MongoDB until it answers or MONGO_STARTUP_TIMEOUT runs out"""
+    deadline = time.monotonic() + MONGO_STARTUP_TIMEOUT
+    delay = 0.5
+    while True:
+        try:
+            await client.admin.command("ping")
+            return True
+        except PyMongoError as e:
+            if time.monotonic() + delay > deadline:
+                return False
+            logger.warning("MongoDB not reachable yet, retrying in %.1fs: %s", delay, e)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5.0)
+
+
 @app.on_event("startup")
 async def startup_init():
     """Initialize default departments and migrate users on startup"""
+    if not await wait_for_mongo():
+        # Fail startup rather than serve without the migrations below; the orchestrator restarts the app
+        raise RuntimeError(f"MongoDB unreachable after {MONGO_STARTUP_TIMEOUT:.0f}s, not starting without migrations")
+    
+    start_email_worker()
+    start_notification_worker()
+    start_audit_worker()
+    
+    # Touch hot collections so the first requests don't pay for opening the pool
+    await asyncio.gather(
+        db.users.find_one({}, {"_id": 1}),
+        db.departments.find_one({}, {"_id": 1}),
+        db.ticket_notifications.find_one({}, {"_id": 1}),
+    )
+    
     await init_default_departments()
     await migrate_users_to_departments()
+    for collection in (db.users, db.departments, db.clients):
+        await migrate_created_at_to_dates(collection)
+    await migrate_reference_list_ids()
+    await migrate_alert_comments()
+    await get_noc_dept_id()
     
     # Create chat collections if they don't exist
     try:
@@ -6435,10 +6805,58 @@ async def startup_init():
             await db.create_collection("noc_monthly_notes")
         await db.noc_monthly_notes.create_index([("year", 1), ("month", 1)])
         
+        # Users are looked up by id on every request and by username/email/phone on login
+        await db.users.create_index("username")
+        await db.users.create_index("email")
+        await db.users.create_index("phone")
+        await db.departments.create_index("name")
+        
+        # Users are fanned out by department for NOC notifications
+        await db.users.create_index("department_id")
+        await db.users.create_index([("department_id", 1), ("notify_on_am_action", 1)])
+        
+        # Notification feeds are read per recipient, newest first
+        await db.ticket_notifications.create_index([("assigned_to", 1), ("created_at", -1)])
+        await db.ticket_notifications.create_index([("assigned_to", 1), ("read", 1)])
+        await db.ticket_notifications.create_index("ticket_id")
+        await db.alert_notifications.create_index([("assigned_to", 1), ("created_at", -1)])
+        await db.alert_notifications.create_index(
+            [("assigned_to", 1), ("read", 1)],
+            partialFilterExpression={"read": False}
+        )
+        await db.notifications.create_index([("assigned_to", 1), ("type", 1), ("created_at", -1)])
+        await db.notifications.create_index([("assigned_to", 1), ("type", 1), ("read", 1)])
+        
+        # Sessions are closed by id and scanned by login day for the online-time report
+        await db.user_sessions.create_index("login_time")
+        
+        # Enterprises are listed per AM and per type, and reference lists per section, newest first
+        await db.clients.create_index("assigned_am_id")
+        await db.clients.create_index([("enterprise_type", 1), ("assigned_am_id", 1)])
+        await db.reference_lists.create_index([("section", 1), ("created_at", -1)])
+
+        # Alerts are listed per section and AM requests per department (or per AM), newest first
+        await db.alerts.create_index([("ticket_type", 1), ("created_at", -1), ("id", -1)])
+        await db.alert_comments.create_index([("alert_id", 1), ("created_at", -1)])
+        await db.am_requests.create_index([("department", 1), ("created_at", -1), ("id", -1)])
+        await db.am_requests.create_index([("created_by", 1), ("created_at", -1), ("id", -1)])
+        await db.am_requests.create_index([("created_at", -1), ("id", -1)])
+
+        # Unique ids last, so a legacy duplicate can't stop the indexes above from being built
+        await db.users.create_index("id", unique=True)
+        await db.departments.create_index("id", unique=True)
+        await db.user_sessions.create_index("id", unique=True)
+        await db.reference_lists.create_index("id", unique=True, sparse=True)
+        
         logger.info("Chat collections initialized successfully")
     except Exception as e:
         logger.error(f"Error initializing chat collections: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await stop_notification_worker()
+    await stop_audit_worker()
+    await stop_email_worker()
+    await close_smtp_client()
+    _bcrypt_pool.shutdown(wait=False)
     client.close()
@@ -0,0 +1,63 @@
+"""
+Shared fixtures for the backend unit tests.
+server.py reads its configuration at import time, so placeholder values are set here
+before any test module imports it. The Motor client connects lazily, so no database
+is needed for tests that don't touch one.
+"""
+import asyncio
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "ticketing_unit_tests")
+os.environ.setdefault("SECRET_KEY", "unit-test-secret")
+
+
+@pytest.fixture
+def run_in_db(monkeypatch):
+    """
+    Run an async test body against a throwaway database on MONGO_URL, patched in as server.db.
+    Skips when no MongoDB is reachable. A fresh client is made per run because a Motor
+    client is tied to the event loop it first ran on.
+    """
+    from motor.motor_asyncio import AsyncIOMotorClient
+    import server
+
+    def run(test_body):
+        async def main():
+            mongo = AsyncIOMotorClient(os.environ["MONGO_URL"], serverSelectionTimeoutMS=1000, tz_aware=True)
+            try:
+                await mongo.admin.command("ping")
+            except Exception:
+                mongo.close()
+                pytest.skip("MongoDB is not reachable at MONGO_URL")
+            name = f"ticketing_unit_{uuid.uuid4().hex[:12]}"
+            monkeypatch.setattr(server, "db", mongo[name])
+            try:
+                return await test_body(mongo[name])
+            finally:
+                await mongo.drop_database(name)
+                mongo.close()
+
+        return asyncio.run(main())
+
+    return run
+
+
+class FakeCollection:
+    """Records the documents passed to insert_many; set fail to make the next calls raise"""
+
+    def __init__(self):
+        self.batches = []
+        self.fail = None
+
+    async def insert_many(self, docs, ordered=True):
+        if self.fail is not None:
+            raise self.fail
+        self.batches.append(list(docs))
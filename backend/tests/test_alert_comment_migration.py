@@ -0,0 +1,34 @@
+"""
+Unit tests for migrate_alert_comments (needs a reachable MongoDB, skipped otherwise)
+"""
+import server
+
+
+def test_comments_are_copied_once(run_in_db):
+    async def body(db):
+        await db.alerts.insert_many([
+            {"id": "a1", "comments": [{"id": "c1", "text": "first"}, {"id": "c2", "text": "second"}]},
+            {"id": "a2", "comments": []},
+        ])
+        await server.migrate_alert_comments()
+        await server.migrate_alert_comments()
+        comments = await db.alert_comments.find({}, {"_id": 0}).sort("id", 1).to_list(None)
+        pending = await db.alerts.count_documents({"comments_migrated": {"$ne": True}})
+        return comments, pending
+
+    comments, pending = run_in_db(body)
+    assert comments == [
+        {"id": "c1", "text": "first", "alert_id": "a1"},
+        {"id": "c2", "text": "second", "alert_id": "a1"},
+    ]
+    assert pending == 0
+
+
+def test_flagged_alerts_are_not_rescanned(run_in_db):
+    async def body(db):
+        # Shaped like an alert written by create_alert
+        await db.alerts.insert_one({"id": "new", "comments": [{"id": "c9", "text": "inline"}], "comments_migrated": True})
+        await server.migrate_alert_comments()
+        return await db.alert_comments.count_documents({})
+
+    assert run_in_db(body) == 0
@@ -0,0 +1,124 @@
+"""
+Unit tests for the batched audit log worker
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import server
+from conftest import FakeCollection
+
+
+@pytest.fixture
+def audit_logs(monkeypatch):
+    """Point server.db.audit_logs at a recording fake and keep the flush interval short"""
+    collection = FakeCollection()
+    monkeypatch.setattr(server, "db", SimpleNamespace(audit_logs=collection))
+    monkeypatch.setattr(server, "AUDIT_FLUSH_INTERVAL", 0.01)
+    monkeypatch.setattr(server, "_audit_worker_task", None)
+    return collection
+
+
+def run(test_body, monkeypatch):
+    """Run test_body on a fresh loop with a fresh audit queue bound to it"""
+    async def main():
+        monkeypatch.setattr(server, "audit_queue", asyncio.Queue())
+        return await test_body()
+    return asyncio.run(main())
+
+
+def queue_entries(count):
+    for i in range(count):
+        server.audit_queue.put_nowait({"id": str(i)})
+
+
+def written_ids(collection):
+    return [doc["id"] for batch in collection.batches for doc in batch]
+
+
+def test_entries_queued_together_share_one_insert(audit_logs, monkeypatch):
+    async def body():
+        server.start_audit_worker()
+        queue_entries(5)
+        await asyncio.wait_for(server.audit_queue.join(), timeout=2)
+        await server.stop_audit_worker()
+
+    run(body, monkeypatch)
+    assert [len(batch) for batch in audit_logs.batches] == [5]
+
+
+def test_shutdown_flushes_queued_entries(audit_logs, monkeypatch):
+    async def body():
+        server.start_audit_worker()
+        queue_entries(3)
+        # Stop straight away: entries ahead of the sentinel must still be written
+        await server.stop_audit_worker()
+        return server._audit_worker_task
+
+    assert run(body, monkeypatch) is None
+    assert written_ids(audit_logs) == ["0", "1", "2"]
+
+
+def test_shutdown_with_empty_queue(audit_logs, monkeypatch):
+    async def body():
+        server.start_audit_worker()
+        await asyncio.sleep(0)
+        await server.stop_audit_worker()
+        return server.audit_queue.qsize()
+
+    assert run(body, monkeypatch) == 0
+    assert audit_logs.batches == []
+
+
+def test_failed_insert_is_logged_and_worker_continues(audit_logs, monkeypatch):
+    async def body():
+        server.start_audit_worker()
+        audit_logs.fail = RuntimeError("write failed")
+        queue_entries(2)
+        await asyncio.wait_for(server.audit_queue.join(), timeout=2)
+        audit_logs.fail = None
+        server.audit_queue.put_nowait({"id": "after"})
+        await server.stop_audit_worker()
+
+    run(body, monkeypatch)
+    assert written_ids(audit_logs) == ["after"]
+
+
+def test_create_audit_log_only_queues(audit_logs, monkeypatch):
+    async def body():
+        await server.create_audit_log("u1", "alice", "create", "client", "c1", "Acme")
+        return server.audit_queue.get_nowait()
+
+    entry = run(body, monkeypatch)
+    assert entry["entity_id"] == "c1"
+    assert entry["timestamp"].tzinfo is not None
+    assert audit_logs.batches == []
+
+
+def test_batches_are_capped_at_batch_size(audit_logs, monkeypatch):
+    monkeypatch.setattr(server, "AUDIT_BATCH_SIZE", 3)
+
+    async def body():
+        server.start_audit_worker()
+        queue_entries(7)
+        await server.stop_audit_worker()
+
+    run(body, monkeypatch)
+    assert [len(batch) for batch in audit_logs.batches] == [3, 3, 1]
+    assert written_ids(audit_logs) == [str(i) for i in range(7)]
+
+
+def test_entries_within_flush_interval_join_the_batch(audit_logs, monkeypatch):
+    monkeypatch.setattr(server, "AUDIT_FLUSH_INTERVAL", 0.2)
+
+    async def body():
+        server.start_audit_worker()
+        queue_entries(1)
+        # Arrives while the worker waits out the flush interval for the first entry
+        await asyncio.sleep(0.05)
+        server.audit_queue.put_nowait({"id": "late"})
+        await server.stop_audit_worker()
+
+    run(body, monkeypatch)
+    assert audit_logs.batches == [[{"id": "0"}, {"id": "late"}]]
@@ -0,0 +1,69 @@
+"""
+Unit tests for the in-process department and user lookup caches
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import server
+
+
+class FakeFindOne:
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = 0
+
+    async def find_one(self, query, projection=None):
+        self.calls += 1
+        doc = self.docs.get(query["id"])
+        return dict(doc) if doc else None
+
+
+@pytest.fixture
+def departments(monkeypatch):
+    collection = FakeFindOne({"d1": {"id": "d1", "name": "NOC", "can_edit_tickets": True}})
+    monkeypatch.setattr(server, "db", SimpleNamespace(departments=collection))
+    monkeypatch.setattr(server, "_dept_cache", {})
+    return collection
+
+
+def test_department_is_cached(departments):
+    async def body():
+        await server.get_department_cached("d1")
+        await server.get_department_cached("d1")
+
+    asyncio.run(body())
+    assert departments.calls == 1
+
+
+def test_mutating_a_returned_department_leaves_the_cache_alone(departments):
+    async def body():
+        dept = await server.get_department_cached("d1")
+        dept["can_edit_users"] = True
+        dept["name"] = "changed"
+        return await server.get_department_cached("d1")
+
+    dept = asyncio.run(body())
+    assert dept == {"id": "d1", "name": "NOC", "can_edit_tickets": True}
+    assert server.get_user_role_from_department(dept) == "noc"
+
+
+def test_missing_department_is_none(departments):
+    assert asyncio.run(server.get_department_cached("nope")) is None
+
+
+def test_expired_entries_are_pruned_on_insert(monkeypatch):
+    users = FakeFindOne({"u2": {"id": "u2", "username": "user2"}})
+    monkeypatch.setattr(server, "db", SimpleNamespace(users=users))
+    # Entries that expired long ago, as a long-running process would accumulate
+    monkeypatch.setattr(server, "_user_brief_cache", {"u0": (0.0, {"id": "u0"}), "u1": (0.0, {"id": "u1"})})
+
+    asyncio.run(server.get_user_brief("u2"))
+    assert list(server._user_brief_cache) == ["u2"]
+
+
+def test_prune_keeps_live_entries():
+    cache = {"old": (5.0, "a"), "live": (20.0, "b")}
+    server.prune_expired(cache, now=10.0)
+    assert cache == {"live": (20.0, "b")}
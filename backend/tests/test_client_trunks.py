@@ -0,0 +1,47 @@
+"""
+Unit tests for collect_client_trunks (needs a reachable MongoDB, skipped otherwise)
+"""
+import server
+
+
+def test_first_seen_order_and_dedup(run_in_db):
+    async def body(db):
+        await db.clients.insert_many([
+            {"enterprise_type": "sms", "customer_trunks": ["c2", "c1", "c2"], "vendor_trunks": ["v3"]},
+            {"enterprise_type": "sms", "customer_trunks": ["c1", "c3"], "vendor_trunks": ["v1", "v3"]},
+            {"enterprise_type": "voice", "customer_trunks": ["other"], "vendor_trunks": ["other"]},
+        ])
+        return await server.collect_client_trunks({"enterprise_type": "sms"}, ("customer_trunks", "vendor_trunks"))
+
+    assert run_in_db(body) == {"customer_trunks": ["c2", "c1", "c3"], "vendor_trunks": ["v3", "v1"]}
+
+
+def test_non_list_trunk_fields_are_ignored(run_in_db):
+    async def body(db):
+        await db.clients.insert_many([
+            {"enterprise_type": "sms", "vendor_trunks": "legacy-scalar"},
+            {"enterprise_type": "sms", "vendor_trunks": None},
+            {"enterprise_type": "sms"},
+            {"enterprise_type": "sms", "vendor_trunks": ["v1"]},
+        ])
+        return await server.collect_client_trunks({"enterprise_type": "sms"}, ("vendor_trunks",))
+
+    assert run_in_db(body) == {"vendor_trunks": ["v1"]}
+
+
+def test_mixed_value_types(run_in_db):
+    async def body(db):
+        await db.clients.insert_many([
+            {"enterprise_type": "sms", "vendor_trunks": ["v1", 7, None]},
+            {"enterprise_type": "sms", "vendor_trunks": [7, "v1", "v2"]},
+        ])
+        return await server.collect_client_trunks({"enterprise_type": "sms"}, ("vendor_trunks",))
+
+    assert run_in_db(body) == {"vendor_trunks": ["v1", 7, None, "v2"]}
+
+
+def test_no_matching_clients(run_in_db):
+    async def body(db):
+        return await server.collect_client_trunks({"enterprise_type": "sms"}, ("customer_trunks", "vendor_trunks"))
+
+    assert run_in_db(body) == {"customer_trunks": [], "vendor_trunks": []}
@@ -0,0 +1,41 @@
+"""
+Unit tests for migrate_created_at_to_dates (needs a reachable MongoDB, skipped otherwise)
+"""
+from datetime import datetime, timezone
+
+import server
+
+
+def test_strings_become_utc_dates_and_bad_rows_are_skipped(run_in_db):
+    async def body(db):
+        await db.alerts.insert_many([
+            {"id": "offset", "created_at": "2026-03-01T14:00:00.250000+02:00"},
+            {"id": "naive", "created_at": "2026-03-01T12:00:00"},
+            {"id": "bad", "created_at": "not a date"},
+            {"created_at": "2026-03-01T12:00:00+00:00"},
+            {"id": "date", "created_at": datetime(2026, 1, 1, tzinfo=timezone.utc)},
+        ])
+        await server.migrate_created_at_to_dates(db.alerts)
+        return {doc.get("id"): doc["created_at"] async for doc in db.alerts.find({}, {"_id": 0})}
+
+    created = run_in_db(body)
+    assert created["offset"] == datetime(2026, 3, 1, 12, 0, 0, 250000, tzinfo=timezone.utc)
+    assert created["naive"] == datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+    assert created["bad"] == "not a date"
+    # Rows without an id are converted too
+    assert created[None] == datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+    assert created["date"] == datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_rows_left_as_strings_are_counted(run_in_db, caplog):
+    async def body(db):
+        await db.clients.insert_many([
+            {"id": "zulu", "created_at": "2026-03-01T12:00:00Z"},
+            {"id": "bad", "created_at": "not a date"},
+        ])
+        await server.migrate_created_at_to_dates(db.clients)
+
+    with caplog.at_level("INFO", logger=server.logger.name):
+        run_in_db(body)
+    assert "Converted created_at to a date for 1 clients" in caplog.text
+    assert "Left 1 clients with a created_at string" in caplog.text
@@ -0,0 +1,35 @@
+"""
+Unit tests for reading stored timestamps as aware UTC datetimes
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+NOON = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("value", [
+    "2026-03-01T12:00:00",
+    "2026-03-01T12:00:00Z",
+    "2026-03-01T12:00:00+00:00",
+    "2026-03-01T14:00:00+02:00",
+    datetime(2026, 3, 1, 12),
+    NOON,
+])
+def test_legacy_and_stored_values_compare_with_aware_datetimes(value):
+    parsed = server.as_utc_datetime(value)
+    assert parsed.tzinfo is not None
+    assert parsed == NOON
+    # The comparison the online-time and unassigned-ticket handlers make against aware values from the DB
+    assert parsed <= NOON + timedelta(minutes=15)
+
+
+@pytest.mark.parametrize("value", [None, ""])
+def test_missing_values(value):
+    assert server.as_utc_datetime(value) is None
+
+
+def test_to_utc_iso_agrees():
+    assert server.to_utc_iso(server.as_utc_datetime("2026-03-01T14:00:00+02:00")) == "2026-03-01T12:00:00+00:00"
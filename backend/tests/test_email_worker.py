@@ -0,0 +1,53 @@
+"""
+Unit tests for the email worker shutdown
+"""
+import asyncio
+
+import server
+
+
+def run(test_body, monkeypatch):
+    """Run test_body on a fresh loop with a fresh email queue bound to it"""
+    async def main():
+        monkeypatch.setattr(server, "email_queue", asyncio.Queue())
+        monkeypatch.setattr(server, "_email_worker_task", None)
+        return await test_body()
+    return asyncio.run(main())
+
+
+def test_shutdown_sends_queued_emails(monkeypatch):
+    sent = []
+
+    async def send_now(to_email, subject, body):
+        await asyncio.sleep(0.01)
+        sent.append(to_email)
+
+    monkeypatch.setattr(server, "_send_email_now", send_now)
+
+    async def body():
+        server.start_email_worker()
+        for to_email in ["a@example.com", "b@example.com"]:
+            await server.email_queue.put((to_email, "Subject", "Body"))
+        # Stop straight away: the emails already queued must still go out
+        await server.stop_email_worker()
+        return server._email_worker_task
+
+    assert run(body, monkeypatch) is None
+    assert sent == ["a@example.com", "b@example.com"]
+
+
+def test_shutdown_gives_up_on_a_stuck_send(monkeypatch):
+    monkeypatch.setattr(server, "WORKER_DRAIN_TIMEOUT", 0.05)
+
+    async def send_now(to_email, subject, body):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(server, "_send_email_now", send_now)
+
+    async def body():
+        server.start_email_worker()
+        await server.email_queue.put(("a@example.com", "Subject", "Body"))
+        await server.stop_email_worker()
+        return server._email_worker_task
+
+    assert run(body, monkeypatch) is None
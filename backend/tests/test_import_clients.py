@@ -0,0 +1,226 @@
+"""
+Unit tests for the enterprise CSV import (validation, batched inserts and write error mapping)
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from pymongo.errors import BulkWriteError
+
+import server
+from conftest import FakeCollection
+
+ADMIN = {"id": "admin-1", "username": "admin", "role": "admin", "department": {"id": "dept-admin"}}
+HEADER = "name,enterprise_type,tier,assigned_am,customer_trunks\n"
+
+
+class FakeUpload:
+    def __init__(self, text, filename="enterprises.csv"):
+        self.filename = filename
+        self._data = text.encode()
+
+    async def read(self):
+        return self._data
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    async def to_list(self, length):
+        return list(self._docs)
+
+
+class FakeUsers:
+    def __init__(self, users):
+        self._users = users
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        wanted = set(query["username"]["$in"])
+        return FakeCursor([u for u in self._users if u["username"] in wanted and u["role"] == query["role"]])
+
+
+class FakeClients(FakeCollection):
+    """insert_many fails per batch as configured: {batch_number: exception}"""
+
+    def __init__(self, failures=None):
+        super().__init__()
+        self.failures = failures or {}
+        self.calls = 0
+
+    async def insert_many(self, docs, ordered=True):
+        assert ordered is False
+        batch_number = self.calls
+        self.calls += 1
+        # Let the other batches interleave, as concurrent writes would
+        await asyncio.sleep(0)
+        failure = self.failures.get(batch_number)
+        if isinstance(failure, BulkWriteError):
+            bad = {e["index"] for e in failure.details["writeErrors"]}
+            self.batches.append([doc for i, doc in enumerate(docs) if i not in bad])
+            raise failure
+        if failure is not None:
+            raise failure
+        self.batches.append(list(docs))
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = SimpleNamespace(
+        users=FakeUsers([{"id": "am-1", "username": "am_sms", "role": "am"}]),
+        clients=FakeClients(),
+        audit_logs=FakeCollection(),
+    )
+    monkeypatch.setattr(server, "db", db)
+    return db
+
+
+def run_import(text, user=ADMIN):
+    return asyncio.run(server.import_clients(file=FakeUpload(text), current_user=user))
+
+
+def inserted_names(db):
+    return [doc["name"] for batch in db.clients.batches for doc in batch]
+
+
+def duplicate_key_error(*indexes):
+    return BulkWriteError({
+        "writeErrors": [{"index": i, "code": 11000, "errmsg": f"E11000 duplicate key at {i}"} for i in indexes],
+        "nInserted": 0,
+    })
+
+
+class TestValidation:
+    """Rows are validated column-wise with the same rules and messages as before"""
+
+    def test_valid_rows_are_built(self, fake_db):
+        result = run_import(HEADER + " Acme ,sms,Tier 1,am_sms,t1; t2 ;t1;\nBeta,voice,,,\n")
+        assert result["imported_count"] == 2
+        assert result["errors"] is None
+        acme, beta = fake_db.clients.batches[0]
+        assert acme["name"] == "Acme"
+        assert acme["tier"] == "Tier 1"
+        assert acme["assigned_am_id"] == "am-1"
+        assert acme["customer_trunks"] == ["t1", "t2"]
+        assert acme["created_at"].tzinfo is not None
+        assert beta["tier"] is None
+        assert beta["assigned_am_id"] is None
+        assert beta["customer_trunks"] == []
+
+    def test_invalid_rows_are_reported_in_row_order(self, fake_db):
+        csv = HEADER + "Good,sms,,,\n,sms,,,\nBadType,fax,,,\nNoType,,,,\nAlsoGood,voice,,,\n"
+        result = run_import(csv)
+        assert result["imported_count"] == 2
+        assert inserted_names(fake_db) == ["Good", "AlsoGood"]
+        assert result["errors"] == [
+            "Row 3: Missing required fields (name, enterprise_type)",
+            "Row 4: enterprise_type must be 'sms' or 'voice'",
+            "Row 5: Missing required fields (name, enterprise_type)",
+        ]
+
+    def test_invalid_tier_only_drops_the_tier(self, fake_db):
+        result = run_import(HEADER + "Acme,sms,Gold,,\n")
+        assert result["imported_count"] == 1
+        assert fake_db.clients.batches[0][0]["tier"] is None
+        assert result["errors"] == [
+            "Row 2: tier must be one of ['Tier 1', 'Tier 2', 'Tier 3', 'Tier 4'], skipping tier assignment"
+        ]
+
+    def test_unknown_am_leaves_enterprise_unassigned(self, fake_db):
+        result = run_import(HEADER + "Acme,sms,,nobody,\nBeta,sms,,am_sms,\n")
+        assert result["errors"] == ["Row 2: AM user 'nobody' not found, enterprise will be unassigned"]
+        assert [doc["assigned_am_id"] for doc in fake_db.clients.batches[0]] == [None, "am-1"]
+        # Every referenced AM is looked up in a single query
+        assert len(fake_db.users.queries) == 1
+
+    def test_all_rows_invalid_fails_the_import(self, fake_db):
+        with pytest.raises(HTTPException) as exc:
+            run_import(HEADER + ",sms,,,\n")
+        assert exc.value.status_code == 400
+        assert "Row 2: Missing required fields" in exc.value.detail
+        assert fake_db.clients.calls == 0
+
+    def test_missing_required_column(self, fake_db):
+        with pytest.raises(HTTPException) as exc:
+            run_import("name,tier\nAcme,Tier 1\n")
+        assert exc.value.detail == "Missing required columns: enterprise_type"
+
+    def test_non_csv_rejected(self, fake_db):
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(server.import_clients(file=FakeUpload("", filename="x.xlsx"), current_user=ADMIN))
+        assert exc.value.status_code == 400
+
+    def test_am_cannot_import(self, fake_db):
+        am = {**ADMIN, "role": "am"}
+        with pytest.raises(HTTPException) as exc:
+            run_import(HEADER + "Acme,sms,,,\n", user=am)
+        assert exc.value.status_code == 403
+
+
+class TestBatchedWrites:
+    """Valid rows go out through insert_many and are audited in bulk"""
+
+    def test_rows_share_one_insert_and_are_audited(self, fake_db):
+        result = run_import(HEADER + "A,sms,,,\nB,voice,,,\nC,sms,,,\n")
+        assert result["imported_count"] == 3
+        assert fake_db.clients.calls == 1
+        assert inserted_names(fake_db) == ["A", "B", "C"]
+        audits = [doc for batch in fake_db.audit_logs.batches for doc in batch]
+        assert [doc["entity_name"] for doc in audits] == ["A", "B", "C"]
+        assert [doc["entity_id"] for doc in audits] == [doc["id"] for doc in fake_db.clients.batches[0]]
+        assert all(doc["user_id"] == "admin-1" and doc["action"] == "create" for doc in audits)
+
+    def test_audit_write_failure_does_not_fail_the_import(self, fake_db):
+        fake_db.audit_logs.fail = RuntimeError("audit down")
+        result = run_import(HEADER + "A,sms,,,\n")
+        assert result["imported_count"] == 1
+        assert result["errors"] is None
+
+
+class TestConcurrentBatches:
+    """Batches are written independently and write errors map back to CSV rows"""
+
+    # Row 3 is invalid, so A to E are CSV rows 2, 4, 5, 6 and 7
+    CSV = HEADER + "A,sms,,,\n,sms,,,\nB,sms,,,\nC,sms,,,\nD,sms,,,\nE,sms,,,\n"
+
+    @pytest.fixture(autouse=True)
+    def small_batches(self, monkeypatch):
+        monkeypatch.setattr(server, "IMPORT_BATCH_SIZE", 2)
+
+    def test_rows_are_split_into_batches(self, fake_db):
+        result = run_import(self.CSV)
+        assert result["imported_count"] == 5
+        assert [len(batch) for batch in fake_db.clients.batches] == [2, 2, 1]
+
+    def test_bulk_write_error_maps_to_csv_rows(self, fake_db):
+        # Batch 1 holds C (row 5) and D (row 6); index 1 of that batch is D
+        fake_db.clients.failures = {1: duplicate_key_error(1)}
+        result = run_import(self.CSV)
+        assert result["imported_count"] == 4
+        assert inserted_names(fake_db) == ["A", "B", "C", "E"]
+        assert result["errors"] == [
+            "Row 3: Missing required fields (name, enterprise_type)",
+            "Row 6: E11000 duplicate key at 1",
+        ]
+        audited = [doc["entity_name"] for batch in fake_db.audit_logs.batches for doc in batch]
+        assert audited == ["A", "B", "C", "E"]
+
+    def test_failed_batch_does_not_affect_the_others(self, fake_db):
+        fake_db.clients.failures = {0: RuntimeError("connection reset")}
+        result = run_import(self.CSV)
+        assert result["imported_count"] == 3
+        assert inserted_names(fake_db) == ["C", "D", "E"]
+        assert result["errors"][1:] == [
+            "Row 2: Insert failed: connection reset",
+            "Row 4: Insert failed: connection reset",
+        ]
+
+    def test_every_batch_failing_fails_the_import(self, fake_db):
+        fake_db.clients.failures = {0: duplicate_key_error(0, 1), 1: duplicate_key_error(0, 1), 2: duplicate_key_error(0)}
+        with pytest.raises(HTTPException) as exc:
+            run_import(self.CSV)
+        assert exc.value.status_code == 400
+        assert fake_db.audit_logs.batches == []
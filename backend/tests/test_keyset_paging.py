@@ -0,0 +1,109 @@
+"""
+Unit tests for the (created_at, id) keyset cursor used by the alert and request lists
+"""
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException, Response
+
+import server
+
+T0 = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class TestCursorQuery:
+    def test_no_cursor_leaves_query_alone(self):
+        query = {"ticket_type": "sms"}
+        server.add_keyset_cursor(query, None, None)
+        assert query == {"ticket_type": "sms"}
+
+    def test_cursor_breaks_ties_on_id(self):
+        query = {"ticket_type": "sms"}
+        server.add_keyset_cursor(query, T0.isoformat(), "b")
+        assert query == {"ticket_type": "sms", "$and": [{"$or": [
+            {"created_at": {"$lt": T0}},
+            {"created_at": T0, "id": {"$lt": "b"}},
+        ]}]}
+
+    def test_timestamp_only_cursor(self):
+        query = {}
+        server.add_keyset_cursor(query, T0.isoformat(), None)
+        assert query == {"$and": [{"created_at": {"$lt": T0}}]}
+
+    def test_string_timestamps_compare_as_utc_iso(self):
+        query = {}
+        server.add_keyset_cursor(query, "2026-03-01T14:00:00+02:00", "b", stored_as_string=True)
+        assert query["$and"][0]["$or"][1] == {"created_at": "2026-03-01T12:00:00+00:00", "id": {"$lt": "b"}}
+
+    def test_naive_cursor_is_utc(self):
+        query = {}
+        server.add_keyset_cursor(query, "2026-03-01T12:00:00", None)
+        assert query["$and"][0]["created_at"]["$lt"] == T0
+
+    def test_existing_or_filter_is_kept(self):
+        query = {"$or": [{"status": "pending"}, {"claimed_by": None}]}
+        server.add_keyset_cursor(query, T0.isoformat(), "b")
+        assert query["$or"] == [{"status": "pending"}, {"claimed_by": None}]
+        assert len(query["$and"]) == 1
+
+    def test_bad_timestamp_is_a_400(self):
+        with pytest.raises(HTTPException) as exc:
+            server.add_keyset_cursor({}, "yesterday", None)
+        assert exc.value.status_code == 400
+
+
+class TestNextCursor:
+    def test_full_page_sets_cursor_headers(self):
+        response = Response()
+        items = [{"id": "c", "created_at": T0}, {"id": "b", "created_at": T0}]
+        server.set_next_cursor(response, items, limit=2)
+        assert response.headers["X-Next-Before"] == "2026-03-01T12:00:00+00:00"
+        assert response.headers["X-Next-Before-Id"] == "b"
+
+    def test_short_page_is_the_last(self):
+        response = Response()
+        server.set_next_cursor(response, [{"id": "c", "created_at": T0}], limit=2)
+        assert "X-Next-Before" not in response.headers
+
+    def test_string_created_at(self):
+        response = Response()
+        server.set_next_cursor(response, [{"id": "a", "created_at": "2026-03-01T12:00:00"}], limit=1)
+        assert response.headers["X-Next-Before"] == "2026-03-01T12:00:00+00:00"
+
+
+def test_pages_cover_items_sharing_a_timestamp(run_in_db):
+    """Walking pages of two through five alerts, three of them at the same instant, returns each once"""
+    async def body(db):
+        await db.alerts.insert_many([
+            {"id": alert_id, "ticket_type": "sms", "created_at": created_at}
+            for alert_id, created_at in [("a", T0), ("b", T0), ("c", T0), ("d", T0.replace(hour=11)), ("e", T0.replace(hour=13))]
+        ])
+        seen, before, before_id = [], None, None
+        while True:
+            query = {"ticket_type": "sms"}
+            server.add_keyset_cursor(query, before, before_id)
+            page = await db.alerts.find(query, {"_id": 0}).sort(server.KEYSET_SORT).limit(2).to_list(2)
+            seen += [alert["id"] for alert in page]
+            response = Response()
+            server.set_next_cursor(response, page, 2)
+            if "X-Next-Before" not in response.headers:
+                return seen
+            before, before_id = response.headers["X-Next-Before"], response.headers["X-Next-Before-Id"]
+
+    assert run_in_db(body) == ["e", "c", "b", "a", "d"]
+
+
+def test_unresolved_filter_counts_alerts_without_the_flag(run_in_db):
+    """resolved=false matches alerts created before the resolved field existed"""
+    async def body(db):
+        await db.alerts.insert_many([
+            {"id": "a", "ticket_type": "sms", "created_at": T0, "resolved": True},
+            {"id": "b", "ticket_type": "sms", "created_at": T0, "resolved": False},
+            {"id": "c", "ticket_type": "sms", "created_at": T0},
+        ])
+        user = {"department": {"department_type": "all"}}
+        unresolved = await server.get_alerts("sms", Response(), limit=10, before=None, before_id=None, resolved=False, current_user=user)
+        resolved = await server.get_alerts("sms", Response(), limit=10, before=None, before_id=None, resolved=True, current_user=user)
+        return [alert["id"] for alert in unresolved], [alert["id"] for alert in resolved]
+
+    assert run_in_db(body) == (["c", "b"], ["a"])
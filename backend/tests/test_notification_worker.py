@@ -0,0 +1,69 @@
+"""
+Unit tests for the notification worker shutdown
+"""
+import asyncio
+
+import server
+
+
+def run(test_body, monkeypatch):
+    """Run test_body on a fresh loop with a fresh notification queue bound to it"""
+    async def main():
+        monkeypatch.setattr(server, "notification_queue", asyncio.Queue())
+        monkeypatch.setattr(server, "_notification_worker_task", None)
+        return await test_body()
+    return asyncio.run(main())
+
+
+def test_shutdown_runs_queued_jobs(monkeypatch):
+    done = []
+
+    async def job(name):
+        await asyncio.sleep(0.01)
+        done.append(name)
+
+    async def body():
+        server.start_notification_worker()
+        for name in ["a", "b", "c"]:
+            server.queue_notification(job, name)
+        # Stop straight away: the jobs already queued must still run
+        await server.stop_notification_worker()
+        return server._notification_worker_task
+
+    assert run(body, monkeypatch) is None
+    assert done == ["a", "b", "c"]
+
+
+def test_failed_job_does_not_block_shutdown(monkeypatch):
+    done = []
+
+    async def failing():
+        raise RuntimeError("send failed")
+
+    async def job():
+        done.append("after")
+
+    async def body():
+        server.start_notification_worker()
+        server.queue_notification(failing)
+        server.queue_notification(job)
+        await server.stop_notification_worker()
+
+    run(body, monkeypatch)
+    assert done == ["after"]
+
+
+def test_shutdown_gives_up_on_a_stuck_job(monkeypatch):
+    monkeypatch.setattr(server, "WORKER_DRAIN_TIMEOUT", 0.05)
+
+    async def stuck():
+        await asyncio.Event().wait()
+
+    async def body():
+        server.start_notification_worker()
+        server.queue_notification(stuck)
+        await server.stop_notification_worker()
+        return server._notification_worker_task
+
+    assert run(body, monkeypatch) is None
+
@@ -0,0 +1,35 @@
+"""
+Unit tests for looking up reference lists by their different keys
+"""
+import server
+
+
+def test_list_found_by_object_id_gets_an_id(run_in_db):
+    """A list without an id field, found by its Mongo _id, is given one that later writes can use"""
+    async def body(db):
+        result = await db.reference_lists.insert_one({"name": "Premium", "destination": "UK", "section": "sms"})
+        found = await server.find_reference_list(str(result.inserted_id))
+        stored = await db.reference_lists.find_one({"_id": result.inserted_id})
+        return found["id"], stored["id"]
+
+    found_id, stored_id = run_in_db(body)
+    assert found_id == stored_id
+
+
+def test_list_found_by_legacy_key_gets_an_id(run_in_db):
+    async def body(db):
+        await db.reference_lists.insert_one({"name": "Premium-Routes", "destination": "UK", "section": "sms"})
+        found = await server.find_reference_list("Premium-Routes-UK-sms")
+        stored = await db.reference_lists.find_one({"name": "Premium-Routes"})
+        return found["id"], stored["id"]
+
+    found_id, stored_id = run_in_db(body)
+    assert found_id == stored_id
+
+
+def test_list_with_an_id_is_left_alone(run_in_db):
+    async def body(db):
+        await db.reference_lists.insert_one({"id": "list-1", "name": "Premium", "destination": "UK", "section": "sms"})
+        return (await server.find_reference_list("list-1"))["id"]
+
+    assert run_in_db(body) == "list-1"
@@ -0,0 +1,49 @@
+"""
+Unit tests for waiting on MongoDB at startup
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+import server
+
+
+class FakeAdmin:
+    def __init__(self, failures):
+        self.failures = failures
+        self.pings = 0
+
+    async def command(self, name):
+        self.pings += 1
+        if self.pings <= self.failures:
+            raise ServerSelectionTimeoutError("no servers")
+        return {"ok": 1}
+
+
+def test_retries_until_mongo_answers(monkeypatch):
+    admin = FakeAdmin(failures=1)
+    monkeypatch.setattr(server, "client", SimpleNamespace(admin=admin))
+    assert asyncio.run(server.wait_for_mongo()) is True
+    assert admin.pings == 2
+
+
+def test_gives_up_after_the_timeout(monkeypatch):
+    admin = FakeAdmin(failures=1000)
+    monkeypatch.setattr(server, "client", SimpleNamespace(admin=admin))
+    monkeypatch.setattr(server, "MONGO_STARTUP_TIMEOUT", 0.1)
+    assert asyncio.run(server.wait_for_mongo()) is False
+    assert admin.pings == 1
+
+
+def test_startup_fails_without_mongo(monkeypatch):
+    async def unreachable():
+        return False
+
+    monkeypatch.setattr(server, "wait_for_mongo", unreachable)
+    monkeypatch.setattr(server, "_email_worker_task", None)
+    with pytest.raises(RuntimeError):
+        asyncio.run(server.startup_init())
+    # Nothing was started that shutdown would have to clean up
+    assert server._email_worker_task is None
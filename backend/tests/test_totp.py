@@ -0,0 +1,130 @@
+"""
+Unit tests for verify_totp, checked against the RFC 6238 SHA-1 test vectors
+"""
+import base64
+
+import pyotp
+import pytest
+
+import server
+
+# RFC 6238 Appendix B: the SHA-1 seed is the ASCII string "12345678901234567890".
+# The RFC lists 8-digit codes; a 6-digit code is the same value mod 10**6.
+RFC_SECRET = base64.b32encode(b"12345678901234567890").decode()
+RFC_VECTORS = [
+    (59, "94287082"),
+    (1111111109, "07081804"),
+    (1111111111, "14050471"),
+    (1234567890, "89005924"),
+    (2000000000, "69279037"),
+    (20000000000, "65353130"),
+]
+
+
+@pytest.fixture
+def frozen_time(monkeypatch):
+    """Pin server.time.time() to a given timestamp"""
+    def freeze(timestamp):
+        monkeypatch.setattr(server.time, "time", lambda: timestamp)
+    return freeze
+
+
+class TestRfcVectors:
+    """verify_totp accepts exactly the RFC 6238 codes"""
+
+    @pytest.mark.parametrize("timestamp,code", RFC_VECTORS)
+    def test_rfc_vector_accepted(self, frozen_time, timestamp, code):
+        frozen_time(timestamp)
+        assert server.verify_totp(RFC_SECRET, code[-6:], window=0)
+
+    @pytest.mark.parametrize("timestamp,code", RFC_VECTORS)
+    def test_matches_pyotp(self, timestamp, code):
+        assert pyotp.TOTP(RFC_SECRET).at(timestamp) == code[-6:]
+
+    def test_int_code(self, frozen_time):
+        frozen_time(59)
+        assert server.verify_totp(RFC_SECRET, 287082, window=0)
+        # 005924 as an int loses its leading zeros, so it can never match
+        frozen_time(1234567890)
+        assert server.verify_totp(RFC_SECRET, 5924, window=0) is False
+
+    def test_surrounding_whitespace_accepted(self, frozen_time):
+        frozen_time(59)
+        assert server.verify_totp(RFC_SECRET, " 287082 ", window=0)
+
+
+class TestWindow:
+    """Codes one step either side are accepted with window=1, two steps are not"""
+
+    # 1111111109 and 1111111111 sit in adjacent 30s steps
+    def test_previous_step_accepted(self, frozen_time):
+        frozen_time(1111111111)
+        assert server.verify_totp(RFC_SECRET, "081804", window=1)
+
+    def test_next_step_accepted(self, frozen_time):
+        frozen_time(1111111109)
+        assert server.verify_totp(RFC_SECRET, "050471", window=1)
+
+    def test_adjacent_step_rejected_without_window(self, frozen_time):
+        frozen_time(1111111111)
+        assert not server.verify_totp(RFC_SECRET, "081804", window=0)
+
+    @pytest.mark.parametrize("offset", [-2, 2])
+    def test_outside_window_rejected(self, frozen_time, offset):
+        frozen_time(1234567890 + offset * server.TOTP_INTERVAL)
+        assert not server.verify_totp(RFC_SECRET, "005924", window=1)
+
+    @pytest.mark.parametrize("offset", [-1, 1])
+    def test_window_edges_accepted(self, frozen_time, offset):
+        frozen_time(1234567890 + offset * server.TOTP_INTERVAL)
+        assert server.verify_totp(RFC_SECRET, "005924", window=1)
+
+    def test_step_boundary(self, frozen_time):
+        # 59 is the last second of step 1; step 3 starts at 90, two steps away
+        frozen_time(89)
+        assert server.verify_totp(RFC_SECRET, "287082", window=1)
+        frozen_time(90)
+        assert not server.verify_totp(RFC_SECRET, "287082", window=1)
+
+
+class TestMalformedInput:
+    """Bad codes and secrets are rejected instead of raising"""
+
+    @pytest.mark.parametrize("code", ["28708a", "2870 2", "+28708", "-28708", "٢٨٧٠٨٢", "２８７０８２", "", None])
+    def test_non_digit_code_rejected(self, frozen_time, code):
+        frozen_time(59)
+        assert server.verify_totp(RFC_SECRET, code) is False
+
+    @pytest.mark.parametrize("code", ["28708", "2870820", "94287082", "0"])
+    def test_wrong_length_code_rejected(self, frozen_time, code):
+        frozen_time(59)
+        assert server.verify_totp(RFC_SECRET, code) is False
+
+    @pytest.mark.parametrize("secret", ["not base32!", "A", "ABC"])
+    def test_invalid_secret_rejected(self, frozen_time, secret):
+        frozen_time(59)
+        assert server.verify_totp(secret, "287082") is False
+
+
+class TestSecretPadding:
+    """Secrets whose length isn't a multiple of 8 are padded before decoding"""
+
+    @pytest.mark.parametrize("length", [16, 26, 32, 20])
+    def test_unpadded_secret_matches_pyotp(self, frozen_time, length):
+        secret = pyotp.random_base32(length=32)[:length]
+        timestamp = 1700000000
+        frozen_time(timestamp)
+        expected = pyotp.TOTP(secret).at(timestamp)
+        assert server.verify_totp(secret, expected, window=0)
+
+    def test_lowercase_secret_accepted(self, frozen_time):
+        frozen_time(59)
+        assert server.verify_totp(RFC_SECRET.lower(), "287082", window=0)
+
+    def test_stripped_padding_restored(self, frozen_time):
+        # A 12-byte seed encodes to 20 characters plus four "=" that apps usually drop
+        padded = base64.b32encode(b"123456789012").decode()
+        assert padded.endswith("====")
+        timestamp = 1111111111
+        frozen_time(timestamp)
+        assert server.verify_totp(padded.rstrip("="), pyotp.TOTP(padded).at(timestamp), window=0)
@@ -0,0 +1,140 @@
+"""
+Unit tests for the per-connection WebSocket outbox and its coalescing writer
+"""
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from starlette.websockets import WebSocketState
+
+import server
+
+
+class FakeUsers:
+    async def update_one(self, query, update):
+        pass
+
+
+class FakeWebSocket:
+    def __init__(self, fail_send=False):
+        self.client_state = WebSocketState.CONNECTING
+        self.frames = []
+        self.fail_send = fail_send
+
+    async def accept(self):
+        self.client_state = WebSocketState.CONNECTED
+
+    async def send_text(self, text):
+        if self.fail_send:
+            raise RuntimeError("connection reset")
+        self.frames.append(json.loads(text))
+
+
+@pytest.fixture(autouse=True)
+def fake_db(monkeypatch):
+    monkeypatch.setattr(server, "db", SimpleNamespace(users=FakeUsers()))
+    monkeypatch.setattr(server, "WS_COALESCE_WINDOW", 0.01)
+
+
+def run(test_body):
+    return asyncio.run(test_body(server.ConnectionManager()))
+
+
+async def settle():
+    """Give the writers time to wait out the coalescing window and send"""
+    await asyncio.sleep(0.05)
+
+
+def test_single_message_keeps_object_shape():
+    async def body(manager):
+        ws = FakeWebSocket()
+        await manager.connect(ws, "u1")
+        await manager.send_personal_message({"type": "ping"}, "u1")
+        await settle()
+        return ws.frames
+
+    assert run(body) == [{"type": "ping"}]
+
+
+def test_same_tick_messages_share_one_array_frame():
+    async def body(manager):
+        ws = FakeWebSocket()
+        await manager.connect(ws, "u1")
+        for i in range(3):
+            await manager.send_personal_message({"n": i}, "u1")
+        await settle()
+        return ws.frames
+
+    assert run(body) == [[{"n": 0}, {"n": 1}, {"n": 2}]]
+
+
+def test_messages_after_the_window_get_their_own_frame():
+    async def body(manager):
+        ws = FakeWebSocket()
+        await manager.connect(ws, "u1")
+        await manager.send_personal_message({"n": 0}, "u1")
+        await settle()
+        await manager.send_personal_message({"n": 1}, "u1")
+        await settle()
+        return ws.frames
+
+    assert run(body) == [{"n": 0}, {"n": 1}]
+
+
+def test_each_connection_gets_its_own_frames():
+    async def body(manager):
+        first, second, other = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        await manager.connect(first, "u1")
+        await manager.connect(second, "u1")
+        await manager.connect(other, "u2")
+        await manager.broadcast_to_conversation({"type": "new_message"}, ["u1"])
+        await manager.broadcast_to_all({"type": "announcement"})
+        await settle()
+        return first.frames, second.frames, other.frames
+
+    first, second, other = run(body)
+    assert first == second == [[{"type": "new_message"}, {"type": "announcement"}]]
+    assert other == [{"type": "announcement"}]
+
+
+def test_payloads_with_non_json_types():
+    async def body(manager):
+        ws = FakeWebSocket()
+        await manager.connect(ws, "u1")
+        await manager.send_personal_message({"at": datetime(2026, 1, 2, tzinfo=timezone.utc), 1: "int key"}, "u1")
+        await settle()
+        return ws.frames
+
+    assert run(body) == [{"at": "2026-01-02T00:00:00+00:00", "1": "int key"}]
+
+
+def test_failed_send_disconnects_the_connection():
+    async def body(manager):
+        ws = FakeWebSocket(fail_send=True)
+        await manager.connect(ws, "u1")
+        await manager.send_personal_message({"type": "ping"}, "u1")
+        await settle()
+        return manager
+
+    manager = run(body)
+    assert manager.active_connections == {}
+    assert manager.outboxes == {}
+    assert manager.writers == {}
+
+
+def test_disconnect_stops_the_writer():
+    async def body(manager):
+        ws = FakeWebSocket()
+        await manager.connect(ws, "u1")
+        writer = manager.writers[ws]
+        manager.disconnect(ws)
+        await settle()
+        await manager.send_personal_message({"type": "ping"}, "u1")
+        await settle()
+        return writer, ws.frames
+
+    writer, frames = run(body)
+    assert writer.cancelled()
+    assert frames == []
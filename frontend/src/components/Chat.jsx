@@ -47,7 +47,8 @@ export default function Chat({ user, openChats, setOpenChats, activeChat, setAct
     ws.onmessage = (event) => {
       try {
         const data = JSON.parse(event.data);
-        handleWebSocketMessage(data);
+        // The server coalesces bursts of messages into a single array frame
+        (Array.isArray(data) ? data : [data]).forEach(handleWebSocketMessage);
       } catch (error) {
         console.error('Error parsing WebSocket message:', error);
       }
@@ -40,6 +40,9 @@ import {
 import { Tooltip, TooltipTrigger, TooltipContent, TooltipProvider } from "@/components/ui/tooltip";
 import { Badge } from "@/components/ui/badge";
 
+// Sidebar badges read one filtered page; the list endpoints cap limit at 100 for requests
+const SIDEBAR_BADGE_LIMIT = 100;
+
 export default function DashboardLayout({ user, setUser }) {
   const [sidebarOpen, setSidebarOpen] = useState(true);
   const [alerts, setAlerts] = useState([]);
@@ -588,14 +591,17 @@ export default function DashboardLayout({ user, setUser }) {
     try {
       const token = localStorage.getItem("token");
       // Fetch SMS alerts
+      // Only unresolved alerts count towards the badge; one capped page is enough for it
       const smsRes = await axios.get(`${API}/alerts/sms`, {
-        headers: { Authorization: `Bearer ${token}` }
+        headers: { Authorization: `Bearer ${token}` },
+        params: { resolved: false, limit: SIDEBAR_BADGE_LIMIT }
       });
       setSidebarSmsAlerts(smsRes.data || []);
       
       // Fetch Voice alerts
       const voiceRes = await axios.get(`${API}/alerts/voice`, {
-        headers: { Authorization: `Bearer ${token}` }
+        headers: { Authorization: `Bearer ${token}` },
+        params: { resolved: false, limit: SIDEBAR_BADGE_LIMIT }
       });
       setSidebarVoiceAlerts(voiceRes.data || []);
     } catch (error) {
@@ -612,9 +618,10 @@ export default function DashboardLayout({ user, setUser }) {
     }
     try {
       const token = localStorage.getItem("token");
-      // Fetch all requests (we'll filter for pending ones)
+      // Fetch pending requests (we'll drop the claimed ones), one capped page
       const res = await axios.get(`${API}/requests`, {
-        headers: { Authorization: `Bearer ${token}` }
+        headers: { Authorization: `Bearer ${token}` },
+        params: { status: "pending", limit: SIDEBAR_BADGE_LIMIT }
       });
       // Filter for pending requests (status=pending AND not claimed)
       const pending = (res.data || []).filter(r => r.status === "pending" && !r.claimed_by);
@@ -26,13 +26,17 @@ export function useDataUpdates(onDataUpdate) {
 
     ws.onmessage = (event) => {
       try {
-        const message = JSON.parse(event.data);
-        console.log('[DataUpdates] Received:', message.type);
-        
-        // Call the callback with the message
-        if (onDataUpdate) {
-          onDataUpdate(message);
-        }
+        const data = JSON.parse(event.data);
+        // The server coalesces bursts of messages into a single array frame
+        const messages = Array.isArray(data) ? data : [data];
+        messages.forEach((message) => {
+          console.log('[DataUpdates] Received:', message.type);
+          
+          // Call the callback with the message
+          if (onDataUpdate) {
+            onDataUpdate(message);
+          }
+        });
       } catch (error) {
         console.error('[DataUpdates] Error parsing message:', error);
       }
@@ -0,0 +1,27 @@
+import axios from "axios";
+
+// Paged list endpoints return one page at a time, newest first on (created_at, id). When more items may follow,
+// the response carries the next page's cursor in the X-Next-Before / X-Next-Before-Id headers.
+export async function fetchPage(url, config = {}, cursor = null) {
+  const res = await axios.get(url, { ...config, params: { ...config.params, ...cursor } });
+  const before = res.headers["x-next-before"];
+  return {
+    items: res.data || [],
+    next: before ? { before, before_id: res.headers["x-next-before-id"] } : null
+  };
+}
+
+// Whether an item sorts after the cursor, i.e. belongs to a later page
+function isAfterCursor(item, cursor) {
+  const itemTime = new Date(item.created_at).getTime();
+  const cursorTime = new Date(cursor.before).getTime();
+  return itemTime < cursorTime || (itemTime === cursorTime && String(item.id) < String(cursor.before_id));
+}
+
+// Refreshing the first page keeps any older pages the user already loaded with "Load more"
+export function mergeFirstPage(loaded, page) {
+  if (!page.next) {
+    return page.items;
+  }
+  return [...page.items, ...loaded.filter(item => isAfterCursor(item, page.next))];
+}
@@ -2,6 +2,7 @@ import { useState, useEffect, useRef } from "react";
 import { useSearchParams, useNavigate } from "react-router-dom";
 import { useToast } from "@/hooks/use-toast";
 import axios from "axios";
+import { fetchPage, mergeFirstPage } from "@/lib/paging";
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
@@ -94,6 +95,11 @@ export default function ReferencesPage() {
   const [voiceLists, setVoiceLists] = useState([]);
   const [smsAlerts, setSmsAlerts] = useState([]);
   const [voiceAlerts, setVoiceAlerts] = useState([]);
+  // Cursor for each section's next page of alerts (null when everything is loaded)
+  const [alertCursors, setAlertCursors] = useState({ sms: null, voice: null });
+  const [loadingMoreAlerts, setLoadingMoreAlerts] = useState(null);
+  const loadedMoreAlertsRef = useRef({ sms: false, voice: false });
+  const setAlertsFor = (section, update) => (section === "sms" ? setSmsAlerts : setVoiceAlerts)(update);
   
   // Compute unresolved alert counts (exclude resolved alerts from badge count)
   const unresolvedSmsAlerts = smsAlerts.filter(a => !a.resolved);
@@ -285,6 +291,44 @@ export default function ReferencesPage() {
     }
   };
 
+  // Fetch the newest page of a section's alerts, keeping older pages already loaded with "Load more"
+  const refreshAlerts = async (section, token) => {
+    const page = await fetchPage(`${API}/alerts/${section}`, {
+      headers: { Authorization: `Bearer ${token}` }
+    });
+    if (loadedMoreAlertsRef.current[section] && page.next) {
+      setAlertsFor(section, prev => mergeFirstPage(prev, page));
+    } else {
+      loadedMoreAlertsRef.current[section] = false;
+      setAlertsFor(section, page.items);
+      setAlertCursors(prev => ({ ...prev, [section]: page.next }));
+    }
+  };
+
+  const loadMoreAlerts = async (section) => {
+    const cursor = alertCursors[section];
+    if (!cursor || loadingMoreAlerts) {
+      return;
+    }
+    setLoadingMoreAlerts(section);
+    try {
+      const token = localStorage.getItem("token");
+      const page = await fetchPage(`${API}/alerts/${section}`, {
+        headers: { Authorization: `Bearer ${token}` }
+      }, cursor);
+      setAlertsFor(section, prev => {
+        const loadedIds = new Set(prev.map(a => a.id));
+        return [...prev, ...page.items.filter(a => !loadedIds.has(a.id))];
+      });
+      setAlertCursors(prev => ({ ...prev, [section]: page.next }));
+      loadedMoreAlertsRef.current[section] = true;
+    } catch (error) {
+      console.error("Failed to load more alerts:", error);
+    } finally {
+      setLoadingMoreAlerts(null);
+    }
+  };
+
   const fetchData = async () => {
     try {
       const token = localStorage.getItem("token");
@@ -311,10 +355,7 @@ export default function ReferencesPage() {
       // Fetch SMS Alerts - only if user has access to SMS
       if (deptType === "all" || deptType === "sms") {
         try {
-          const smsAlertsRes = await axios.get(`${API}/alerts/sms`, {
-            headers: { Authorization: `Bearer ${token}` }
-          });
-          setSmsAlerts(smsAlertsRes.data || []);
+          await refreshAlerts("sms", token);
         } catch (e) {
           console.log("SMS alerts fetch error (may be access denied):", e.message);
           setSmsAlerts([]);
@@ -341,10 +382,7 @@ export default function ReferencesPage() {
       // Fetch Voice Alerts - only if user has access to Voice
       if (deptType === "all" || deptType === "voice") {
         try {
-          const voiceAlertsRes = await axios.get(`${API}/alerts/voice`, {
-            headers: { Authorization: `Bearer ${token}` }
-          });
-          setVoiceAlerts(voiceAlertsRes.data || []);
+          await refreshAlerts("voice", token);
         } catch (e) {
           console.log("Voice alerts fetch error:", e.response?.data || e.message);
           setVoiceAlerts([]);
@@ -830,6 +868,16 @@ export default function ReferencesPage() {
             </CardHeader>
           </Card>
         ))}
+        {alertCursors[section] && (
+          <Button
+            variant="outline"
+            onClick={() => loadMoreAlerts(section)}
+            disabled={loadingMoreAlerts === section}
+            className="border-zinc-700 text-zinc-300 hover:bg-zinc-800"
+          >
+            {loadingMoreAlerts === section ? "Loading..." : "Load more"}
+          </Button>
+        )}
         
         {/* Alert Details Sidebar */}
         {selectedAlert && (
@@ -18,6 +18,7 @@ import { Switch } from "@/components/ui/switch";
 import MultiSelect from "@/components/custom/MultiSelect";
 import MultiFilter from "@/components/custom/MultiFilter";
 import axios from "axios";
+import { fetchPage, mergeFirstPage } from "@/lib/paging";
 
 const API = `${process.env.REACT_APP_API_URL || "http://localhost:8000"}/api`;
 
@@ -111,6 +112,11 @@ export default function RequestsPage() {
   const [activeTab, setActiveTab] = useState("sms");
   const [requestSubTab, setRequestSubTab] = useState("active"); // "active" or "archive" for sub-tabs
   const [requests, setRequests] = useState([]);
+  // Cursor for the next page of requests (null when everything is loaded) and the filters it belongs to
+  const [requestsCursor, setRequestsCursor] = useState(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
+  const requestParamsRef = useRef(null);
+  const loadedMoreRequestsRef = useRef(false);
   
   // Get user info early to use in computations
   const user = JSON.parse(localStorage.getItem("user") || "{}");
@@ -477,16 +483,21 @@ export default function RequestsPage() {
         params.append("show_mine_only", showMineOnlyValue);
       }
       
-      const response = await fetch(`${API}/requests?${params}`, {
-        headers: { Authorization: `Bearer ${token}` }
+      // Only the newest page is fetched; older pages are loaded on demand with "Load more"
+      const query = Object.fromEntries(params);
+      const page = await fetchPage(`${API}/requests`, {
+        headers: { Authorization: `Bearer ${token}` },
+        params: query
       });
-      
-      if (response.ok) {
-        const data = await response.json();
-        // Only update requests if we got valid data (not empty due to error)
-        if (data && Array.isArray(data)) {
-          setRequests(data);
-        }
+      const sameFilters = JSON.stringify(query) === JSON.stringify(requestParamsRef.current);
+      requestParamsRef.current = query;
+      if (sameFilters && loadedMoreRequestsRef.current && page.next) {
+        // Same filters: update the newest page but keep the older pages already loaded, and their cursor
+        setRequests(prev => mergeFirstPage(prev, page));
+      } else {
+        loadedMoreRequestsRef.current = false;
+        setRequests(page.items);
+        setRequestsCursor(page.next);
       }
     } catch (error) {
       console.error("Failed to fetch requests:", error);
@@ -497,6 +508,31 @@ export default function RequestsPage() {
     }
   };
 
+  // Append the next page of requests for the current filters
+  const loadMoreRequests = async () => {
+    if (!requestsCursor || isLoadingMore) {
+      return;
+    }
+    setIsLoadingMore(true);
+    try {
+      const token = localStorage.getItem("token");
+      const page = await fetchPage(`${API}/requests`, {
+        headers: { Authorization: `Bearer ${token}` },
+        params: requestParamsRef.current
+      }, requestsCursor);
+      setRequests(prev => {
+        const loadedIds = new Set(prev.map(r => r.id));
+        return [...prev, ...page.items.filter(r => !loadedIds.has(r.id))];
+      });
+      setRequestsCursor(page.next);
+      loadedMoreRequestsRef.current = true;
+    } catch (error) {
+      console.error("Failed to load more requests:", error);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   // Auto-refresh data every 10 seconds, but not while already loading
   // Use a ref to track loading state to avoid recreating the interval on every isLoading change
   const isLoadingRef = useRef(false);
@@ -1978,6 +2014,16 @@ export default function RequestsPage() {
             );
           })
         )}
+        {!isLoading && requestsCursor && (
+          <Button
+            variant="outline"
+            onClick={loadMoreRequests}
+            disabled={isLoadingMore}
+            className="border-zinc-700 text-zinc-300 hover:bg-zinc-800"
+          >
+            {isLoadingMore ? "Loading..." : "Load more"}
+          </Button>
+        )}
       </div>
 
       {/* New Request Dialog */}